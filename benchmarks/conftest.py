@@ -0,0 +1,82 @@
+"""
+File: conftest.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: Options and synthetic expense data shared by the micro-benchmarks.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+from datetime import date
+import code  # noqa: F401 puts code/ on sys.path, as for the tests
+import records  # the module the bot's own modules import, so isinstance checks hold
+
+CATEGORIES = ["Food", "Groceries", "Utilities", "Transport", "Shopping", "Miscellaneous"]
+
+# records kept by every synthetic user in the store-wide benchmarks
+RECORDS_PER_USER = 1000
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--history-sizes",
+        default="1000,10000,100000",
+        help="comma separated numbers of expense records to benchmark with, e.g. 1000,1000000",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "history_size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("history_sizes").split(",")]
+        metafunc.parametrize("history_size", sizes, scope="module")
+
+
+_histories = {}
+
+
+def synthetic_history(size, seed=0):
+    """
+    synthetic_history(size, seed): Returns size expense records spread over the three years up to
+    today, oldest first, the same list for the same arguments.
+    """
+    if (size, seed) not in _histories:
+        rng = random.Random(seed)
+        last = date.today().toordinal()
+        days = sorted(rng.randint(last - 3 * 365, last) for _ in range(size))
+        _histories[(size, seed)] = [
+            records.Expense(day, rng.choice(CATEGORIES), rng.randint(100, 20000)) for day in days
+        ]
+    return _histories[(size, seed)]
+
+
+def synthetic_store(size):
+    """
+    synthetic_store(size): Returns a user list holding size records in total, RECORDS_PER_USER
+    for every user, with an overall and a category budget set for each of them.
+    """
+    users = {}
+    for index in range(max(1, size // RECORDS_PER_USER)):
+        users[str(1000 + index)] = {
+            "data": list(synthetic_history(min(size, RECORDS_PER_USER), seed=index)),
+            "budget": {"overall": "2000", "category": {category: "300" for category in CATEGORIES}},
+        }
+    return users
@@ -0,0 +1,377 @@
+"""
+File: fake_telegram.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: Local stand-in for the Telegram Bot API used to load-test the bot offline.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# === Documentation of fake_telegram.py ===
+#
+# FakeTelegramServer answers the Bot API methods the bot uses (getUpdates, sendMessage, sendPhoto,
+# sendDocument, editMessageText, answerCallbackQuery and a few no-op ones) on a local port. Point
+# the bot at it with api_url=<server.url> in user.properties. Simulated users push their messages
+# and button presses with send_text and press_button, and wait for the bot's answers with wait_for.
+# After setWebhook the updates are POSTed to the webhook with its secret token, like Telegram does.
+
+import http.client
+import itertools
+import json
+import threading
+import time
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "DollarBot", "username": "dollar_bot"}
+
+# methods that only have to succeed
+NO_OP_METHODS = {
+    "answerCallbackQuery", "sendChatAction", "deleteMessage", "setMyCommands",
+    "editMessageReplyMarkup",
+}
+
+# methods whose answer is a new message in the chat
+SEND_METHODS = {"sendMessage", "sendPhoto", "sendDocument"}
+
+
+def parse_body(content_type, body):
+    """
+    parse_body(content_type, body): Returns the form fields of a request body, which the Bot API
+    accepts url-encoded, as JSON or as multipart/form-data. Uploaded files are replaced by their size.
+    """
+    if not body:
+        return {}
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=policy.HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True) or b""
+            fields[name] = len(payload) if part.get_filename() else payload.decode("utf-8")
+        return fields
+    return dict(parse_qsl(body.decode("utf-8")))
+
+
+def inline_keyboard(params):
+    """
+    inline_keyboard(params): Returns the inline keyboard sent with a message, if any. Like Telegram,
+    the stand-in only echoes inline keyboards back in the message it returns.
+    """
+    markup = params.get("reply_markup")
+    if isinstance(markup, str):
+        markup = json.loads(markup)
+    if markup and "inline_keyboard" in markup:
+        return markup
+    return None
+
+
+class FakeTelegramServer:
+    """
+    An in-process HTTP server that plays the Telegram Bot API for one or more bots. latency
+    seconds are added to every method call but getUpdates, to model the network round trip. Updates are
+    queued by simulated users and handed out by getUpdates or, once the bot has called setWebhook,
+    POSTed to the webhook one at a time in order; everything the bot sends is kept per chat in the
+    order it arrived.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0):
+        self.latency = latency
+        self._lock = threading.Condition()
+        self._updates = []
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._outbox = {}
+        self._closed = False
+        self.calls = {}
+        self.polled = threading.Event()
+        self.connected = threading.Event()
+        self._webhook = None
+        self._poster = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        url: The base URL to configure as api_url.
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """
+        start(): Serves requests on a background thread and returns the server.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        stop(): Wakes every pending getUpdates and shuts the server down.
+        """
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- simulated users ---
+
+    def _push(self, update):
+        with self._lock:
+            update["update_id"] = next(self._update_ids)
+            self._updates.append(update)
+            self._lock.notify_all()
+        return update
+
+    def send_text(self, chat_id, text):
+        """
+        send_text(chat_id, text): Queues a text message from the user of chat_id.
+        """
+        user = {"id": chat_id, "is_bot": False, "first_name": "User{}".format(chat_id)}
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": user["first_name"]},
+            "from": user,
+            "text": text,
+        }
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return self._push({"message": message})
+
+    def press_button(self, chat_id, message, data):
+        """
+        press_button(chat_id, message, data): Queues the press of the inline button carrying data
+        on message, a message the bot sent to chat_id.
+        """
+        message = {key: value for key, value in message.items() if key not in ("method", "received")}
+        query = {
+            "id": str(next(self._message_ids)),
+            "from": {"id": chat_id, "is_bot": False, "first_name": "User{}".format(chat_id)},
+            "chat_instance": str(chat_id),
+            "message": message,
+            "data": data,
+        }
+        return self._push({"callback_query": query})
+
+    def outbox(self, chat_id):
+        """
+        outbox(chat_id): Returns a copy of everything the bot has sent to chat_id so far.
+        """
+        with self._lock:
+            return list(self._outbox.get(chat_id, ()))
+
+    def wait_for(self, chat_id, start, predicate, timeout=30):
+        """
+        wait_for(chat_id, start, predicate, timeout): Waits until the bot has sent chat_id a message,
+        at position start or later, for which predicate(message) is true. Returns the message and its
+        position, or (None, start) on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                sent = self._outbox.get(chat_id, ())
+                for position in range(start, len(sent)):
+                    if predicate(sent[position]):
+                        return sent[position], position
+                start = max(start, len(sent))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    return None, start
+                self._lock.wait(remaining)
+
+    # --- Bot API ---
+
+    def _get_updates(self, params):
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        deadline = time.monotonic() + float(params.get("timeout") or 0)
+        self.polled.set()
+        self.connected.set()
+        with self._lock:
+            self._updates = [update for update in self._updates if update["update_id"] >= offset]
+            while not self._updates and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._lock.wait(remaining)
+            return self._updates[:limit]
+
+    def _send(self, method, params):
+        chat_id = int(params["chat_id"])
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+        }
+        if method == "sendMessage":
+            message["text"] = params.get("text", "")
+        elif method == "sendPhoto":
+            message["photo"] = [{"file_id": "photo{}".format(message["message_id"]),
+                                 "file_unique_id": str(message["message_id"]), "width": 1, "height": 1}]
+        else:
+            message["document"] = {"file_id": "document{}".format(message["message_id"]),
+                                   "file_unique_id": str(message["message_id"])}
+        if "caption" in params:
+            message["caption"] = params["caption"]
+        inline = inline_keyboard(params)
+        if inline:
+            message["reply_markup"] = inline
+        self._deliver(chat_id, method, message)
+        return message
+
+    def _edit(self, params):
+        chat_id = int(params["chat_id"])
+        message = {
+            "message_id": int(params["message_id"]),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+        inline = inline_keyboard(params)
+        if inline:
+            message["reply_markup"] = inline
+        self._deliver(chat_id, "editMessageText", message)
+        return message
+
+    def _set_webhook(self, params):
+        with self._lock:
+            self._webhook = (params["url"], params.get("secret_token")) if params.get("url") else None
+            if self._webhook and self._poster is None:
+                self._poster = threading.Thread(target=self._post_updates, daemon=True)
+                self._poster.start()
+            self._lock.notify_all()
+        if self._webhook:
+            self.connected.set()
+        return True
+
+    def _post_updates(self):
+        # plays Telegram's side of a webhook: POST each update and retry it until it is acknowledged
+        connection, target = None, None
+        while True:
+            with self._lock:
+                while not self._closed and not (self._webhook and self._updates):
+                    self._lock.wait()
+                if self._closed:
+                    return
+                (url, secret_token), update = self._webhook, self._updates[0]
+            parts = urlsplit(url)
+            headers = {"Content-Type": "application/json"}
+            if secret_token:
+                headers["X-Telegram-Bot-Api-Secret-Token"] = secret_token
+            try:
+                if connection is None or target != parts.netloc:
+                    connection, target = http.client.HTTPConnection(parts.netloc, timeout=10), parts.netloc
+                connection.request("POST", parts.path or "/", json.dumps(update), headers)
+                response = connection.getresponse()
+                response.read()
+                acknowledged = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection, acknowledged = None, False
+            with self._lock:
+                if acknowledged and self._updates and self._updates[0] is update:
+                    self._updates.pop(0)
+                    self.calls["webhook"] = self.calls.get("webhook", 0) + 1
+                elif not acknowledged:
+                    self._lock.wait(0.1)
+
+    def _deliver(self, chat_id, method, message):
+        with self._lock:
+            self._outbox.setdefault(chat_id, []).append(dict(message, method=method, received=time.perf_counter()))
+            self._lock.notify_all()
+
+    def call(self, method, params):
+        """
+        call(method, params): Runs one Bot API method and returns its result, or raises KeyError
+        for a method the stand-in does not implement.
+        """
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency and method != "getUpdates":
+            # the round trip to api.telegram.org, which is what a blocking send waits for
+            time.sleep(self.latency)
+        if method == "getUpdates":
+            return self._get_updates(params)
+        if method in SEND_METHODS:
+            return self._send(method, params)
+        if method == "editMessageText":
+            return self._edit(params)
+        if method == "getMe":
+            return BOT_USER
+        if method == "setWebhook":
+            return self._set_webhook(params)
+        if method == "deleteWebhook":
+            return self._set_webhook({})
+        if method in NO_OP_METHODS:
+            return True
+        raise KeyError(method)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes; without this the client's delayed ACK
+            # adds ~40ms to every call and swamps what is being measured
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlsplit(self.path)
+                method = url.path.rstrip("/").rsplit("/", 1)[-1]
+                params = dict(parse_qsl(url.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                params.update(parse_body(self.headers.get("Content-Type", ""), self.rfile.read(length)))
+                try:
+                    status, reply = 200, {"ok": True, "result": server.call(method, params)}
+                except KeyError:
+                    status, reply = 404, {"ok": False, "error_code": 404, "description": "Not Found: method not found"}
+                except (ValueError, TypeError) as e:
+                    status, reply = 400, {"ok": False, "error_code": 400, "description": "Bad Request: " + str(e)}
+                body = json.dumps(reply).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the bot went away, e.g. it was stopped during a long poll
+                    self.close_connection = True
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
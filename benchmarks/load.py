@@ -0,0 +1,372 @@
+"""
+File: load.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: Offline load generator that drives the bot through scripted conversations.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# === Documentation of load.py ===
+#
+# Run from the root of the repository:
+#
+#     python benchmarks/load.py --users 20 --iterations 5 --flows add,display,analytics
+#
+# Starts the FakeTelegramServer of fake_telegram.py, starts code/code.py in a scratch directory
+# with api_url pointing at it, and lets every simulated user run the scripted flows one after the
+# other. Each step is timed from the user's message to the bot's matching answer. The report holds
+# latency percentiles per step and per flow, throughput and the number of Bot API calls by method.
+
+import argparse
+import json
+import math
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+from fake_telegram import FakeTelegramServer
+
+CODE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "code"))
+
+FIRST_CHAT_ID = 100000
+
+
+class StepFailed(Exception):
+    """
+    Raised when the bot does not give the expected answer to a step in time.
+    """
+
+
+def text_starts(prefix):
+    """
+    text_starts(prefix): Matches a text message starting with prefix.
+    """
+    return lambda message: message.get("text", "").startswith(prefix)
+
+
+def has_inline_keyboard(message):
+    """
+    has_inline_keyboard(message): Matches a message carrying inline buttons, such as the calendar.
+    """
+    return "inline_keyboard" in message.get("reply_markup", {})
+
+
+def photo_or_text(prefix):
+    """
+    photo_or_text(prefix): Matches a chart, or the text the bot sends instead of it.
+    """
+    return lambda message: message["method"] == "sendPhoto" or text_starts(prefix)(message)
+
+
+class SimulatedUser:
+    """
+    One Telegram user talking to the bot through the fake server. Steps are timed from the moment
+    the user's update is queued to the moment the expected answer reaches the server.
+    """
+
+    def __init__(self, server, chat_id, timeout):
+        self.server = server
+        self.chat_id = chat_id
+        self.timeout = timeout
+        self.position = 0
+        self.steps = []
+        self.flows = []
+        self.errors = []
+
+    def step(self, name, action, expected):
+        """
+        step(name, action, expected): Runs action, waits for the answer matching expected and
+        records the latency under name. Returns the answer.
+        """
+        started = time.perf_counter()
+        action()
+        message, position = self.server.wait_for(self.chat_id, self.position, expected, self.timeout)
+        if message is None:
+            self.position = position
+            raise StepFailed("{}: no answer within {}s for chat {}".format(name, self.timeout, self.chat_id))
+        self.position = position + 1
+        self.steps.append((name, message["received"] - started))
+        return message
+
+    def send(self, text):
+        self.server.send_text(self.chat_id, text)
+
+    def press(self, message, data):
+        self.server.press_button(self.chat_id, message, data)
+
+    def run_flow(self, name, flow, iteration):
+        """
+        run_flow(name, flow, iteration): Runs one scripted flow and records its total latency, or
+        the reason it failed.
+        """
+        started = time.perf_counter()
+        try:
+            flow(self, iteration)
+        except StepFailed as e:
+            self.errors.append(str(e))
+            self.position = len(self.server.outbox(self.chat_id))
+            return
+        self.flows.append((name, time.perf_counter() - started))
+
+
+def add_flow(user, iteration):
+    """
+    add_flow(user, iteration): /add, pick today in the calendar, pick Food and type an amount.
+    """
+    today = date.today()
+    calendar = user.step("add/command", lambda: user.send("/add"), has_inline_keyboard)
+    day = "cbcal_0_s_d_{}_{}_{}".format(today.year, today.month, today.day)
+    user.step("add/date", lambda: user.press(calendar, day), text_starts("Select Category"))
+    user.step("add/category", lambda: user.send("Food"), text_starts("How much"))
+    amount = "{}.{:02d}".format(iteration % 50 + 1, (user.chat_id + iteration) % 100)
+    user.step("add/amount", lambda: user.send(amount), text_starts("The following expenditure"))
+
+
+def display_flow(user, iteration):
+    """
+    display_flow(user, iteration): /display for the current month, which ends with a chart.
+    """
+    user.step("display/command", lambda: user.send("/display"), text_starts("Please select a category"))
+    user.step("display/month", lambda: user.send("Month"), photo_or_text("You have no spendings"))
+
+
+def analytics_flow(user, iteration):
+    """
+    analytics_flow(user, iteration): /analytics with the time series of the spending history.
+    """
+    user.step("analytics/command", lambda: user.send("/analytics"), text_starts("Select the type of analysis"))
+    user.step("analytics/history", lambda: user.send("Time series graph of spend history"),
+              photo_or_text("No history available"))
+
+
+def history_flow(user, iteration):
+    """
+    history_flow(user, iteration): /history, then the Older button when there is more than one page.
+    """
+    first = user.step("history/command", lambda: user.send("/history"), text_starts("<pre>"))
+    buttons = first.get("reply_markup", {}).get("inline_keyboard", [[]])[0]
+    older = [button["callback_data"] for button in buttons if button["text"].startswith("Older")]
+    if older:
+        user.step("history/older", lambda: user.press(first, older[0]), text_starts("<pre>"))
+
+
+def edit_flow(user, iteration):
+    """
+    edit_flow(user, iteration): /edit, pick the newest expense in the picker and change its amount.
+    """
+    picker = user.step("edit/command", lambda: user.send("/edit"), has_inline_keyboard)
+    newest = picker["reply_markup"]["inline_keyboard"][0][0]["callback_data"]
+    user.step("edit/pick", lambda: user.press(picker, newest), text_starts("What do you want to update"))
+    user.step("edit/field", lambda: user.send("Amount"), text_starts("Please type the new cost"))
+    user.step("edit/amount", lambda: user.send("{}.50".format(iteration + 1)), text_starts("Do you want to update another"))
+    # answer the Y/N question, which the bot does not acknowledge, so the next command is not taken for it
+    user.send("N")
+
+
+FLOWS = {"add": add_flow, "display": display_flow, "analytics": analytics_flow, "history": history_flow, "edit": edit_flow}
+
+
+def latency_summary(samples):
+    """
+    latency_summary(samples): Returns the count, mean and nearest-rank percentiles of a list of
+    latencies in seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+
+    def percentile(q):
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50": percentile(0.50),
+        "p90": percentile(0.90),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+def free_port():
+    """
+    free_port(): Returns a local TCP port that is free at the time of the call.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_bot(server, workdir, args):
+    """
+    start_bot(server, workdir, args): Starts code.py in workdir against the fake server and waits
+    until it polls for updates, or registers its webhook when args.webhook is set.
+    """
+    with open(os.path.join(workdir, "user.properties"), "w") as properties:
+        properties.write("api_token=123456:LOAD\n")
+        properties.write("api_url={}\n".format(server.url))
+        properties.write("render_workers={}\n".format(args.render_workers))
+        properties.write("dispatch_workers={}\n".format(args.dispatch_workers))
+        properties.write("send_rate={}\nchat_send_rate={}\n".format(args.send_rate, args.chat_send_rate))
+        if args.webhook:
+            port = free_port()
+            properties.write("webhook_url=http://127.0.0.1:{}/webhook\n".format(port))
+            properties.write("webhook_listen=127.0.0.1\nwebhook_port={}\n".format(port))
+    log = open(os.path.join(workdir, "bot.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(CODE_DIR, "code.py")], cwd=workdir,
+        stdout=log, stderr=subprocess.STDOUT, env=dict(os.environ, MPLBACKEND="Agg"),
+    )
+    log.close()
+    if not server.connected.wait(60) or process.poll() is not None:
+        stop_bot(process)
+        raise RuntimeError("the bot did not start:\n" + bot_log(workdir))
+    return process
+
+
+def stop_bot(process):
+    """
+    stop_bot(process): Asks the bot to exit and kills it if it does not within 30 seconds.
+    """
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def bot_log(workdir, lines=40):
+    with open(os.path.join(workdir, "bot.log")) as log:
+        return "".join(log.readlines()[-lines:])
+
+
+def run(args):
+    """
+    run(args): Runs the whole load test and returns the report.
+    """
+    flows = [name.strip() for name in args.flows.split(",") if name.strip()]
+    for name in flows:
+        if name not in FLOWS:
+            raise SystemExit("unknown flow {!r}, choose from {}".format(name, ", ".join(FLOWS)))
+
+    server = FakeTelegramServer(latency=args.api_latency / 1000).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            process = start_bot(server, workdir, args)
+            try:
+                users = [SimulatedUser(server, FIRST_CHAT_ID + i, args.timeout) for i in range(args.users)]
+
+                def drive(user):
+                    for iteration in range(args.iterations):
+                        for name in flows:
+                            user.run_flow(name, FLOWS[name], iteration)
+
+                calls_before = sum(server.calls.values())
+                started = time.perf_counter()
+                threads = [threading.Thread(target=drive, args=(user,)) for user in users]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                duration = time.perf_counter() - started
+                calls = sum(server.calls.values()) - calls_before
+            finally:
+                stop_bot(process)
+                if args.verbose:
+                    print(bot_log(workdir, 200), file=sys.stderr)
+    finally:
+        server.stop()
+
+    steps, completed, errors = {}, {}, []
+    for user in users:
+        for name, latency in user.steps:
+            steps.setdefault(name, []).append(latency)
+        for name, latency in user.flows:
+            completed.setdefault(name, []).append(latency)
+        errors.extend(user.errors)
+    step_count = sum(len(samples) for samples in steps.values())
+    flow_count = sum(len(samples) for samples in completed.values())
+
+    return {
+        "users": args.users,
+        "iterations": args.iterations,
+        "flows": flows,
+        "render_workers": args.render_workers,
+        "dispatch_workers": args.dispatch_workers,
+        "webhook": args.webhook,
+        "send_rate": args.send_rate,
+        "chat_send_rate": args.chat_send_rate,
+        "api_latency_ms": args.api_latency,
+        "duration_seconds": round(duration, 3),
+        "completed_flows": flow_count,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "throughput": {
+            "flows_per_second": round(flow_count / duration, 2),
+            "steps_per_second": round(step_count / duration, 2),
+            "api_calls_per_second": round(calls / duration, 2),
+        },
+        "latency_ms": {
+            "flows": {name: latency_summary(samples) for name, samples in completed.items()},
+            "steps": {name: latency_summary(samples) for name, samples in steps.items()},
+        },
+        "api_calls": dict(sorted(server.calls.items())),
+    }
+
+
+def main(argv=None):
+    """
+    main(argv): Parses the command line, runs the load test and prints or writes the JSON report.
+    """
+    parser = argparse.ArgumentParser(description="Drive the bot with simulated users against a fake Telegram server.")
+    parser.add_argument("--users", type=int, default=10, help="simulated users running at the same time")
+    parser.add_argument("--iterations", type=int, default=3, help="times every user runs the flows")
+    parser.add_argument("--flows", default="add,display,analytics", help="comma separated: " + ", ".join(FLOWS))
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for each answer")
+    parser.add_argument("--render-workers", type=int, default=2)
+    parser.add_argument("--dispatch-workers", type=int, default=32)
+    parser.add_argument("--api-latency", type=float, default=0, help="milliseconds added to every Bot API call")
+    # the fake server does not enforce Telegram's send limits, so by default the bot does not either
+    parser.add_argument("--send-rate", type=float, default=0, help="messages per second the bot may send, 0 for no limit")
+    parser.add_argument("--chat-send-rate", type=float, default=0, help="messages per second to one chat, 0 for no limit")
+    parser.add_argument("--webhook", action="store_true", help="deliver updates to a webhook instead of long polling")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="print the end of the bot's log")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
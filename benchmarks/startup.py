@@ -0,0 +1,255 @@
+"""
+File: startup.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: Benchmark of how long code.py takes to start and answer its first command.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# === Documentation of startup.py ===
+#
+# Run from the root of the repository:
+#
+#     python benchmarks/startup.py [--runs N] [--mode lazy|eager|both] [--output report.json]
+#
+# Every run starts a fresh interpreter (with -X importtime) in a scratch directory holding a fake
+# user.properties. telebot.TeleBot is replaced by a stub that records outgoing messages instead of
+# calling Telegram, code/code.py is loaded without polling and a /help update is fed to the bot.
+# The "eager" mode imports every feature module first, the way code.py did before commands were
+# loaded on first use. The report is printed (or written to --output) as JSON.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+CODE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "code"))
+
+FEATURE_MODULES = [
+    "add", "add_recurring", "analytics", "budget", "delete", "display", "edit", "estimate",
+    "history", "monthly", "pdf", "predict", "sendEmail", "updateCategory", "verify", "weekly",
+]
+
+PROPERTIES = "api_token=123456:TEST\nrender_workers=0\n"
+
+BENCH_CHAT_ID = 4242
+
+
+def help_update(update_id=1):
+    """
+    help_update(update_id): Returns the JSON of a Telegram update carrying a /help message.
+    """
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": BENCH_CHAT_ID, "type": "private", "first_name": "Bench"},
+            "from": {"id": BENCH_CHAT_ID, "is_bot": False, "first_name": "Bench"},
+            "text": "/help",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 5}],
+        },
+    }
+
+
+def install_stub_bot():
+    """
+    install_stub_bot(): Replaces telebot.TeleBot with a subclass that records every message sent
+    instead of calling Telegram. It must run before code.py (and dispatcher.py) are imported.
+    Returns the list the sent messages are appended to and the event set on the first one.
+    """
+    import telebot
+
+    sent = []
+    first_reply = threading.Event()
+
+    class StubTeleBot(telebot.TeleBot):
+        created_at = None
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            StubTeleBot.created_at = time.perf_counter()
+
+        def _record(self, method, chat_id, payload):
+            sent.append((time.perf_counter(), method, chat_id, payload))
+            first_reply.set()
+
+        def send_message(self, chat_id, text, *args, **kwargs):
+            self._record("sendMessage", chat_id, text)
+
+        def send_photo(self, chat_id, photo, *args, **kwargs):
+            self._record("sendPhoto", chat_id, None)
+
+        def send_document(self, chat_id, document, *args, **kwargs):
+            self._record("sendDocument", chat_id, None)
+
+        def reply_to(self, message, text, *args, **kwargs):
+            self._record("sendMessage", message.chat.id, text)
+
+    telebot.TeleBot = StubTeleBot
+    return StubTeleBot, sent, first_reply
+
+
+def child(eager):
+    """
+    child(eager): Runs inside the benchmarked interpreter. Loads code.py with the stub bot, sends
+    /help and prints the timings of every phase as JSON.
+    """
+    import runpy
+
+    started = time.perf_counter()
+    sys.path.insert(0, CODE_DIR)
+    stub, sent, first_reply = install_stub_bot()
+    if eager:
+        for name in FEATURE_MODULES:
+            try:
+                __import__(name)
+            except ImportError:
+                pass
+    bot_globals = runpy.run_path(os.path.join(CODE_DIR, "code.py"), run_name="bot")
+    loaded = time.perf_counter()
+    bot = bot_globals["bot"]
+
+    import telebot
+    update = telebot.types.Update.de_json(help_update())
+    asked = time.perf_counter()
+    bot.process_new_updates([update])
+    if not first_reply.wait(30):
+        raise RuntimeError("/help was not answered within 30 seconds")
+    answered = sent[0][0]
+
+    bot.stop_bot()
+    bot_globals["render"].close()
+    bot_globals["helper"].closeStorage()
+    print(json.dumps({
+        "load_seconds": stub.created_at - started,
+        "registration_seconds": loaded - stub.created_at,
+        "handlers": len(bot.message_handlers),
+        "first_response_seconds": answered - asked,
+        "ready_seconds": answered - started,
+        "reply": sent[0][3],
+    }))
+
+
+def parse_importtime(stderr):
+    """
+    parse_importtime(stderr): Parses the output of python -X importtime and returns a dict of
+    module name -> (self microseconds, cumulative microseconds, nesting depth).
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def run_once(eager):
+    """
+    run_once(eager): Starts one benchmarked interpreter and returns its timings together with the
+    import time of every module it imported and the wall-clock time of the whole process.
+    """
+    env = dict(os.environ, MPLBACKEND="Agg")
+    env.pop("PYTHONPATH", None)
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "user.properties"), "w") as properties:
+            properties.write(PROPERTIES)
+        command = [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"]
+        if eager:
+            command.append("--eager")
+        started = time.perf_counter()
+        process = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+        wall = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError("benchmark run failed:\n" + process.stderr[-2000:])
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["process_seconds"] = wall
+    result["imports"] = parse_importtime(process.stderr)
+    return result
+
+
+def summarize(results):
+    """
+    summarize(results): Reduces the results of several runs to the median of every timing, and
+    lists the import time of the bot's own modules and of every top-level import.
+    """
+    summary = {"handlers": results[-1]["handlers"], "reply": results[-1]["reply"]}
+    for key in ("load_seconds", "registration_seconds", "first_response_seconds",
+                "ready_seconds", "process_seconds"):
+        summary[key] = statistics.median(result[key] for result in results)
+
+    local = {name[:-3] for name in os.listdir(CODE_DIR) if name.endswith(".py")}
+    imports = {}
+    for name in results[-1]["imports"]:
+        depth = results[-1]["imports"][name][2]
+        if name not in local and depth > 0:
+            continue
+        samples = [result["imports"][name] for result in results if name in result["imports"]]
+        imports[name] = {
+            "self_us": int(statistics.median(sample[0] for sample in samples)),
+            "cumulative_us": int(statistics.median(sample[1] for sample in samples)),
+        }
+    summary["imports"] = dict(sorted(imports.items(), key=lambda item: -item[1]["cumulative_us"]))
+    return summary
+
+
+def main(argv=None):
+    """
+    main(argv): Parses the command line, runs the benchmark and prints or writes the JSON report.
+    """
+    parser = argparse.ArgumentParser(description="Measure how long code.py takes to start.")
+    parser.add_argument("--runs", type=int, default=5, help="interpreters started per mode")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="lazy")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.eager)
+        return
+
+    modes = ["lazy", "eager"] if args.mode == "both" else [args.mode]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "modes": {mode: summarize([run_once(mode == "eager") for _ in range(args.runs)]) for mode in modes},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+File: test_aggregation.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: Micro-benchmarks of the aggregation and storage helpers on synthetic histories.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Run with pytest-benchmark installed, from the root of the repository:
+#
+#     python -m pytest benchmarks --history-sizes 1000,10000,100000 --benchmark-autosave
+#
+# and compare with the previous run with --benchmark-compare. See docs/benchmarks.md.
+
+import pytest
+from datetime import date
+
+pytest.importorskip("pytest_benchmark")
+
+from code import display, estimate, helper, predict  # noqa: E402
+from conftest import CATEGORIES, synthetic_history, synthetic_store  # noqa: E402
+
+CHAT_ID = "1000"
+
+
+@pytest.fixture
+def user_storage(tmp_path, history_size, request):
+    """
+    Points helper at a store holding a single user with history_size records. The parameter names
+    the backend, with "+cache" for the in-memory CachedStorage the bot runs with.
+    """
+    backend, _, cache = request.param.partition("+")
+    helper.configureStorage(backend, str(tmp_path / "store"), cached=cache == "cache")
+    helper.write_json({CHAT_ID: {
+        "data": list(synthetic_history(history_size)),
+        "budget": {"overall": "2000", "category": {category: "300" for category in CATEGORIES}},
+    }})
+    yield helper.getStorage()
+    helper.closeStorage()
+
+
+@pytest.mark.parametrize("user_storage", ["json", "sqlite", "json+cache"], indirect=True)
+def test_calculate_remaining_overall_budget(benchmark, user_storage):
+    remaining = benchmark(helper.calculateRemainingOverallBudget, CHAT_ID)
+    assert remaining <= 2000
+
+
+@pytest.mark.parametrize("user_storage", ["json", "sqlite", "json+cache"], indirect=True)
+def test_query_current_month(benchmark, user_storage):
+    today = date.today()
+
+    def query_month():
+        return list(helper.queryUserHistory(CHAT_ID, start=today.replace(day=1), end=today))
+
+    expenses = benchmark(query_month)
+    assert all(record.day >= today.replace(day=1).toordinal() for record in expenses)
+
+
+def test_get_category_wise_spendings(benchmark, history_size):
+    history = synthetic_history(history_size)
+    result = benchmark(helper.getCategoryWiseSpendings, CATEGORIES, history)
+    assert sum(len(expenses) for expenses in result.values()) == history_size
+
+
+def test_group_by_category(benchmark, history_size):
+    history = synthetic_history(history_size)
+    result = benchmark(helper.groupByCategory, history)
+    assert sum(len(expenses) for expenses in result.values()) == history_size
+
+
+def test_calculate_spendings(benchmark, history_size):
+    history = synthetic_history(history_size)
+    total_text, total_dict = benchmark(display.calculate_spendings, history)
+    assert set(total_dict) <= set(CATEGORIES)
+
+
+def test_calculate_estimate(benchmark, history_size):
+    history = synthetic_history(history_size)
+    total_text = benchmark(estimate.calculate_estimate, history, 30)
+    assert total_text
+
+
+def test_predict_category_spending(benchmark, history_size):
+    food = [record for record in synthetic_history(history_size) if record.category == "Food"]
+    prediction = benchmark(predict.predict_category_spending, food)
+    assert isinstance(prediction, float)
+
+
+@pytest.fixture
+def store_storage(tmp_path, history_size, request):
+    """
+    Points helper at a store holding history_size records spread over many users.
+    """
+    helper.configureStorage(request.param, str(tmp_path / "store"))
+    user_list = synthetic_store(history_size)
+    helper.write_json(user_list)
+    yield user_list
+    helper.closeStorage()
+
+
+@pytest.mark.parametrize("store_storage", ["json", "sqlite"], indirect=True)
+def test_read_json(benchmark, store_storage):
+    user_list = benchmark(helper.read_json)
+    assert len(user_list) == len(store_storage)
+
+
+@pytest.mark.parametrize("store_storage", ["json", "sqlite"], indirect=True)
+def test_write_json(benchmark, store_storage):
+    benchmark(helper.write_json, store_storage)
@@ -25,8 +25,10 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import alerts
 import helper
 import logging
+import records
 from telebot import types
 from telegram_bot_calendar import DetailedTelegramCalendar, LSTEP
 from datetime import datetime
@@ -43,10 +45,9 @@ def run(message, bot):
     It takes 2 arguments for processing - message which is the message from the user,
     and bot which is the telegram bot object from the main code.py function.
     """
-    helper.read_json()
     helper.read_category_json()
     chat_id = message.chat.id
-    message = bot.send_message(chat_id, "Select date")
+    bot.send_message(chat_id, "Select date")
     calendar, step = DetailedTelegramCalendar().build()
     bot.send_message(chat_id, f"Select {LSTEP[step]}", reply_markup=calendar)
 
@@ -67,7 +68,7 @@ def run(message, bot):
             if (result > data):
                 bot.send_message(chat_id,"Cannot select future dates, Please try /add command again with correct dates")
             else:
-                category_selection(message,bot,result)
+                category_selection(c.message, bot, result)
 
 def category_selection(msg,bot,date):
     """
@@ -155,11 +156,7 @@ def post_amount_input(message, bot, selected_category, date):
             str(selected_category),
             str(amount_value),
         )
-        helper.write_json(
-            add_user_record(
-                chat_id, "{},{},{}".format(date_str, category_str, amount_str)
-            )
-        )
+        add_user_record(chat_id, records.Expense.create(date, category_str, amount_str))
         bot.send_message(
             chat_id,
             "The following expenditure has been recorded: You have spent ${} for {} on {}".format(
@@ -175,11 +172,9 @@ def add_user_record(chat_id, record_to_be_added):
     """
     add_user_record(chat_id, record_to_be_added): Takes 2 arguments -
     chat_id or the chat_id of the user's chat, and record_to_be_added which
-    is the expense record to be added to the store. It then stores this expense record in the store.
+    is the expense record to be added to the store. It then stores this expense record in the store
+    and returns the updated data of the user. The user's budgets are then checked for alerts.
     """
-    user_list = helper.read_json()
-    if str(chat_id) not in user_list:
-        user_list[str(chat_id)] = helper.createNewUserRecord()
-
-    user_list[str(chat_id)]["data"].append(record_to_be_added)
-    return user_list
+    user_data = helper.appendUserRecord(chat_id, record_to_be_added)
+    alerts.check(chat_id, added=[record_to_be_added])
+    return user_data
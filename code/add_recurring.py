@@ -25,8 +25,10 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import alerts
 import helper
 import logging
+import records
 from telebot import types
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -44,7 +46,6 @@ def run(message, bot):
     - bot (telegram.Bot): The Telegram bot object.
     """
 
-    helper.read_json()
     chat_id = message.chat.id
     option.pop(chat_id, None)  # remove temp choice
     markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
@@ -138,9 +139,9 @@ def post_duration_input(message, bot, selected_category, amount_value):
             raise Exception("Duration has to be a non-zero integer.")
                 
         for i in range(int(duration_value)):
-            date_of_entry = (datetime.today().date() + relativedelta(months=+i)).strftime(helper.getDateFormat())
-            date_str, category_str, amount_str = str(date_of_entry), str(selected_category), str(amount_value)
-            helper.write_json(add_user_record(chat_id, "{},{},{}".format(date_str, category_str, amount_str)))
+            date_of_entry = datetime.today().date() + relativedelta(months=+i)
+            category_str, amount_str = str(selected_category), str(amount_value)
+            add_user_record(chat_id, records.Expense.create(date_of_entry, category_str, amount_str))
         
         bot.send_message(chat_id, 'The following expenditure has been recorded: You have spent ${} for {} for the next {} months'.format(amount_str, category_str, duration_value))
     
@@ -155,15 +156,14 @@ def add_user_record(chat_id, record_to_be_added):
 
     Parameters:
     - chat_id (int): The user's chat ID.
-    - record_to_be_added (str): The expense record to be added in CSV format.
+    - record_to_be_added (records.Expense): The expense record to be added.
 
     Returns:
-    dict: Updated user data dictionary.
-    """
+    dict: Updated data of the user.
 
-    user_list = helper.read_json()
-    if str(chat_id) not in user_list:
-        user_list[str(chat_id)] = helper.createNewUserRecord()
+    The user's budgets are checked for alerts once the record is stored.
+    """
 
-    user_list[str(chat_id)]['data'].append(record_to_be_added)
-    return user_list
+    user_data = helper.appendUserRecord(chat_id, record_to_be_added)
+    alerts.check(chat_id, added=[record_to_be_added])
+    return user_data
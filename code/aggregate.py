@@ -0,0 +1,204 @@
+"""
+File: aggregate.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+import records
+import timeline
+from datetime import date
+from operator import itemgetter
+
+# ordinal of 1970-01-01, the epoch of numpy's datetime64
+EPOCH = date(1970, 1, 1).toordinal()
+
+# === Documentation of aggregate.py ===
+
+def _ordinal(day):
+    return day if isinstance(day, int) else day.toordinal()
+
+
+class ExpenseTable:
+    """
+    A user's expenses held as three NumPy columns: day (date ordinal), category code and cents.
+    The history is converted once, after which filters and group-by sums, counts and date
+    ranges run as array operations instead of a Python loop over the records. Category codes
+    index self.categories, which lists the categories in order of first appearance.
+    """
+
+    def __init__(self, days, codes, cents, categories):
+        self.days = days
+        self.codes = codes
+        self.cents = cents
+        self.categories = categories
+
+    @classmethod
+    def from_history(cls, history):
+        """
+        from_history(history): Builds the table from a list of expenses (or of stored records in
+        any format records.parse accepts), or from an iterator such as the result of a store
+        query. A table is returned unchanged.
+        """
+        if isinstance(history, cls):
+            return history
+        expenses = history if isinstance(history, list) else list(history or ())
+        if set(map(type, expenses)) != {records.Expense}:
+            expenses = records.parse_all(expenses)
+        if not expenses:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(empty, empty, empty, [])
+        # one column at a time: zip(*expenses) would create an iterator per expense
+        names = list(map(itemgetter(1), expenses))
+        # dict.fromkeys keeps the categories in order of first appearance
+        categories = list(dict.fromkeys(names))
+        index = {name: code for code, name in enumerate(categories)}
+        count = len(expenses)
+        return cls(
+            np.fromiter(map(itemgetter(0), expenses), dtype=np.int64, count=count),
+            np.fromiter(map(index.__getitem__, names), dtype=np.int64, count=count),
+            np.fromiter(map(itemgetter(2), expenses), dtype=np.int64, count=count),
+            categories,
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def select(self, mask):
+        """
+        select(mask): Returns the table of the rows where the boolean array mask is true.
+        """
+        return ExpenseTable(self.days[mask], self.codes[mask], self.cents[mask], self.categories)
+
+    def on_day(self, day):
+        """
+        on_day(day): The expenses of one day, given as a date or an ordinal.
+        """
+        return self.select(self.days == _ordinal(day))
+
+    def between(self, first, last):
+        """
+        between(first, last): The expenses from day first to day last, both included.
+        """
+        return self.select((self.days >= _ordinal(first)) & (self.days <= _ordinal(last)))
+
+    def in_month(self, year, month):
+        """
+        in_month(year, month): The expenses of one calendar month.
+        """
+        return self.between(*timeline.month_range(year, month))
+
+    def for_category(self, category):
+        """
+        for_category(category): The expenses of one category.
+        """
+        if category not in self.categories:
+            return self.select(np.zeros(len(self), dtype=bool))
+        return self.select(self.codes == self.categories.index(category))
+
+    def total(self):
+        """
+        total(): The sum of all expenses in cents.
+        """
+        return int(self.cents.sum())
+
+    def first_day(self):
+        return int(self.days.min()) if len(self) else None
+
+    def last_day(self):
+        return int(self.days.max()) if len(self) else None
+
+    def day_span(self):
+        """
+        day_span(): The number of days from the first to the last expense, both included.
+        """
+        return self.last_day() - self.first_day() + 1 if len(self) else 0
+
+    def distinct_days(self):
+        """
+        distinct_days(): The number of different days with at least one expense.
+        """
+        if not len(self):
+            return 0
+        return int(np.count_nonzero(np.bincount(self.days - self.days.min())))
+
+    def _group(self, keys):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.cents, minlength=len(unique))
+        counts = np.bincount(inverse, minlength=len(unique))
+        return unique, np.rint(sums).astype(np.int64), counts
+
+    def sum_by_category(self):
+        """
+        sum_by_category(): Returns {category: cents} for the categories present, in order of
+        first appearance in the history.
+        """
+        sums = np.bincount(self.codes, weights=self.cents, minlength=len(self.categories))
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return {
+            self.categories[code]: int(round(sums[code]))
+            for code in range(len(self.categories)) if counts[code]
+        }
+
+    def count_by_category(self):
+        """
+        count_by_category(): Returns {category: number of expenses} for the categories present.
+        """
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return {self.categories[code]: int(counts[code]) for code in range(len(self.categories)) if counts[code]}
+
+    def sum_by_day(self):
+        """
+        sum_by_day(): Returns {day ordinal: cents}, oldest day first.
+        """
+        days, sums, _ = self._group(self.days)
+        return dict(zip(days.tolist(), sums.tolist()))
+
+    def sum_by_week(self):
+        """
+        sum_by_week(): Returns {ordinal of the Monday starting the week: cents}, oldest week first.
+        """
+        # date.fromordinal(1) is a Monday, so (day - 1) % 7 is the weekday
+        weeks, sums, _ = self._group(self.days - (self.days - 1) % 7)
+        return dict(zip(weeks.tolist(), sums.tolist()))
+
+    def _by_month(self):
+        # numpy counts months from January 1970
+        months = (self.days - EPOCH).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        keys, sums, counts = self._group(months)
+        return [(1970 + key // 12, key % 12 + 1) for key in keys.tolist()], sums.tolist(), counts.tolist()
+
+    def sum_by_month(self):
+        """
+        sum_by_month(): Returns {(year, month): cents}, oldest month first.
+        """
+        months, sums, _ = self._by_month()
+        return dict(zip(months, sums))
+
+    def count_by_month(self):
+        """
+        count_by_month(): Returns {(year, month): number of expenses}, oldest month first.
+        """
+        months, _, counts = self._by_month()
+        return dict(zip(months, counts))
@@ -0,0 +1,219 @@
+"""
+File: alerts.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import helper
+import logging
+import notify
+import records
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+# percentages of a monthly budget at which the user is alerted, each at most once a month
+THRESHOLDS = (80, 100)
+
+# category of the alerts about the overall budget
+OVERALL = None
+
+_engine = None
+
+# === Documentation of alerts.py ===
+
+class BudgetAlert(namedtuple("BudgetAlert", ["chat_id", "category", "threshold", "spent", "budget"])):
+    """
+    An alert that the user of chat_id has spent threshold percent or more of a budget this month.
+    category is OVERALL for the overall budget; spent and budget are in cents.
+    """
+
+    __slots__ = ()
+
+    @property
+    def message(self):
+        """
+        message: The text sent to the user, the usual budget exceeded notification once the
+        budget is overspent.
+        """
+        name = "Overall" if self.category is OVERALL else self.category
+        if self.spent > self.budget and self.threshold >= 100:
+            return notify.budget_message(name, "{:.2f}".format((self.spent - self.budget) / 100))
+        return "<b>You have used {}% of your {} budget</b>\n${:.2f} of ${:.2f} spent this month.".format(
+            self.threshold, name, self.spent / 100, self.budget / 100
+        )
+
+
+def monthly_budgets(chat_id):
+    """
+    monthly_budgets(chat_id): Returns the budgets the user has set, in cents, keyed by category
+    and by OVERALL for the overall budget. Budgets of 0 are not set.
+    """
+    budgets = {}
+    overall = helper.getOverallBudget(chat_id)
+    if overall is not None and records.to_cents(overall) > 0:
+        budgets[OVERALL] = records.to_cents(overall)
+    for category, amount in (helper.getCategoryBudget(chat_id) or {}).items():
+        if records.to_cents(amount) > 0:
+            budgets[category] = records.to_cents(amount)
+    return budgets
+
+
+def send_alerts(alerts):
+    """
+    send_alerts(alerts): Sends a batch of alerts through the shared notifier of notify.py.
+    """
+    notify.get_notifier().send_many([(alert.chat_id, alert.message) for alert in alerts])
+
+
+class AlertEngine:
+    """
+    Checks the budgets of a user whenever expenses of the current month are added or changed.
+    Only the totals the change touched are looked at, read from the user's running totals
+    (totals.SpendingTotals), so a check costs the same however long the history is. An alert
+    fires when the change makes the spending cross a threshold, and each threshold fires at
+    most once a month per category and for the overall budget. The alerts are handed to
+    dispatch on a background thread, so the handler that recorded the expense does not wait
+    for them to be sent.
+    """
+
+    def __init__(self, thresholds=THRESHOLDS, dispatch=send_alerts):
+        self.thresholds = sorted(thresholds)
+        self._dispatch = dispatch
+        self._fired = {}
+        self._period = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alerts")
+
+    def evaluate(self, chat_id, removed=(), added=(), today=None):
+        """
+        evaluate(chat_id, removed, added, today): Returns the alerts due now that the expenses in
+        removed were replaced by those in added. The user's totals must already include the
+        change. Only expenses of the month of today count.
+        """
+        today = today or date.today()
+        period = (today.year, today.month)
+        changes = {}
+        for sign, expenses in ((-1, removed), (1, added)):
+            for expense in records.parse_all(expenses):
+                if expense.month == period:
+                    for scope in (expense.category, OVERALL):
+                        changes[scope] = changes.get(scope, 0) + sign * expense.cents
+        # only spending that went up can cross a threshold
+        changes = {scope: change for scope, change in changes.items() if change > 0}
+        if not changes:
+            return []
+        budgets = monthly_budgets(chat_id)
+        if not any(scope in budgets for scope in changes):
+            return []
+        totals = helper.getUserTotals(chat_id)
+        alerts = []
+        with self._lock:
+            if self._period != period:
+                self._fired = {}
+                self._period = period
+            for scope, change in changes.items():
+                budget = budgets.get(scope)
+                if budget is None:
+                    continue
+                if scope is OVERALL:
+                    spent = totals.month_total(*period)
+                else:
+                    spent = totals.category_total(*period, scope)
+                fired = self._fired.get((chat_id, scope), 0)
+                crossed = [
+                    threshold for threshold in self.thresholds
+                    if threshold > fired and (spent - change) * 100 < budget * threshold <= spent * 100
+                ]
+                if crossed:
+                    # crossing several thresholds at once only sends the highest one
+                    self._fired[(chat_id, scope)] = crossed[-1]
+                    alerts.append(BudgetAlert(chat_id, scope, crossed[-1], spent, budget))
+        return alerts
+
+    def check(self, chat_id, removed=(), added=()):
+        """
+        check(chat_id, removed, added): Evaluates the change and dispatches the alerts it
+        triggered in the background. Returns the alerts; errors are logged, never raised.
+        """
+        try:
+            alerts = self.evaluate(chat_id, removed, added)
+            if alerts:
+                self._executor.submit(self._send, alerts)
+            return alerts
+        except Exception as e:
+            logging.exception(str(e))
+            return []
+
+    def _send(self, alerts):
+        try:
+            self._dispatch(alerts)
+        except Exception as e:
+            logging.exception(str(e))
+
+    def close(self):
+        """
+        close(): Waits for the alerts being sent and stops the background thread.
+        """
+        self._executor.shutdown(wait=True)
+
+
+def configure(thresholds=THRESHOLDS, dispatch=send_alerts):
+    """
+    configure(thresholds, dispatch): Turns the budget alerts on with the given thresholds and
+    returns the engine.
+    """
+    global _engine
+    close()
+    _engine = AlertEngine(thresholds, dispatch)
+    return _engine
+
+
+def get_engine():
+    """
+    get_engine(): Returns the configured engine, or None when budget alerts are off.
+    """
+    return _engine
+
+
+def check(chat_id, removed=(), added=()):
+    """
+    check(chat_id, removed, added): Checks the user's budgets after the expenses in removed were
+    replaced by those in added, when budget alerts are on. Returns the alerts sent.
+    """
+    engine = _engine
+    if engine is None:
+        return []
+    return engine.check(chat_id, removed, added)
+
+
+def close():
+    """
+    close(): Sends the pending alerts and turns the budget alerts off.
+    """
+    global _engine
+    if _engine is not None:
+        _engine.close()
+        _engine = None
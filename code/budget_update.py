@@ -25,6 +25,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import copy
 import helper
 import logging
 import budget_view
@@ -104,10 +105,8 @@ def post_overall_amount_input(message, bot):
         amount_value = helper.validate_entered_amount(message.text)
         if amount_value == 0:
             raise Exception("Invalid amount.")
-        user_list = helper.read_json()
-        if str(chat_id) not in user_list:
-            user_list[str(chat_id)] = helper.createNewUserRecord()
-        user_list[str(chat_id)]["budget"]["overall"] = amount_value
+        budget = get_user_budget(chat_id)
+        budget["overall"] = amount_value
         total_budget = 0
         if helper.isCategoryBudgetAvailable(chat_id):
             for c in helper.getCategoryBudget(chat_id).values():
@@ -116,18 +115,27 @@ def post_overall_amount_input(message, bot):
                 raise Exception("Overall budget cannot be less than " + str(total_budget))
         uncategorized_budget = helper.get_uncategorized_amount(chat_id, amount_value)
         if float(uncategorized_budget) > 0:
-            if user_list[str(chat_id)]["budget"]["category"] is None:
-                user_list[str(chat_id)]["budget"]["category"] = {}
-            user_list[str(chat_id)]["budget"]["category"]["uncategorized"] = uncategorized_budget
-        helper.write_json(user_list)
+            if budget["category"] is None:
+                budget["category"] = {}
+            budget["category"]["uncategorized"] = uncategorized_budget
+        user_data = helper.updateUserBudget(chat_id, budget)
         bot.send_message(chat_id, "Budget Updated!")
         budget_view.display_overall_budget(message, bot)
-        print(user_list)
-        return user_list
+        return user_data
     except Exception as e:
         helper.throw_exception(e, message, bot, logging)
 
 
+def get_user_budget(chat_id):
+    """
+    get_user_budget(chat_id): Returns a copy of the budget of the user, or the budget of a new user
+    record if the user has not recorded anything yet. The copy is only stored by updateUserBudget.
+    """
+    user_data = helper.getUserData(chat_id)
+    if user_data is None:
+        user_data = helper.createNewUserRecord()
+    return copy.deepcopy(user_data["budget"])
+
 def update_category_budget(message, bot):
     """
     update_category_budget(message, bot): It takes 2 arguments for processing -
@@ -224,35 +232,32 @@ def post_category_amount_input(message, bot, category):
         amount_value = helper.validate_entered_amount(message.text)
         if amount_value == 0:
             raise Exception("Invalid amount.")
-        user_list = helper.read_json()
-        if str(chat_id) not in user_list:
-            user_list[str(chat_id)] = helper.createNewUserRecord()
-        if user_list[str(chat_id)]["budget"]["category"] is None:
-            user_list[str(chat_id)]["budget"]["category"] = {}
-        user_list[str(chat_id)]["budget"]["category"][category] = amount_value
+        budget = get_user_budget(chat_id)
+        if budget["category"] is None:
+            budget["category"] = {}
+        currentBudget = None
+        if helper.isCategoryBudgetByCategoryAvailable(chat_id, category):
+            currentBudget = helper.getCategoryBudgetByCategory(chat_id, category)
+        budget["category"][category] = amount_value
         message = bot.send_message(
             chat_id, "Budget for " + category + " is now: $" + amount_value
         )
-        if helper.isCategoryBudgetByCategoryAvailable(chat_id, category):
-            currentBudget = helper.getCategoryBudgetByCategory(chat_id, category)
+        if currentBudget is not None:
             amount_value = str(float(amount_value) - float(currentBudget))
-        if(user_list[str(chat_id)]["budget"]["overall"]) and user_list[str(chat_id)]["budget"]["overall"] != '0':
-            if 'uncategorized' in user_list[str(chat_id)]["budget"]["category"].keys():
-                if round(float(user_list[str(chat_id)]["budget"]["category"]["uncategorized"]) - float(amount_value),2) > 0:
-                    user_list[str(chat_id)]["budget"]["category"]["uncategorized"] = str(round(float(user_list[str(chat_id)]["budget"]["category"]["uncategorized"]) - float(amount_value),2))
+        if budget["overall"] and budget["overall"] != '0':
+            if 'uncategorized' in budget["category"].keys():
+                if round(float(budget["category"]["uncategorized"]) - float(amount_value),2) > 0:
+                    budget["category"]["uncategorized"] = str(round(float(budget["category"]["uncategorized"]) - float(amount_value),2))
                 else:
-                    user_list[str(chat_id)]["budget"]["category"]["uncategorized"] = str(0)
-            helper.write_json(user_list)
+                    budget["category"]["uncategorized"] = str(0)
             total_budget = 0
-            for c in helper.getCategoryBudget(chat_id).values():
+            for c in budget["category"].values():
                 total_budget += float(c)
-            print(total_budget)
-            user_list[str(chat_id)]["budget"]["overall"] = str(total_budget)
+            budget["overall"] = str(total_budget)
         else:
-            user_list[str(chat_id)]["budget"]["overall"] = amount_value
-        helper.write_json(user_list)
+            budget["overall"] = amount_value
+        helper.updateUserBudget(chat_id, budget)
         budget_view.display_overall_budget(message, bot)
-        print(user_list)
         post_category_add(message, bot)
 
     except Exception as e:
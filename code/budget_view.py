@@ -27,8 +27,8 @@ SOFTWARE.
 
 import graphing
 import helper
+import render
 import logging
-import os
 
 # === Documentation of budget_view.py ===
 
@@ -78,9 +78,9 @@ def display_category_budget(message, bot):
     if helper.isCategoryBudgetAvailable(chat_id):
         data = helper.getCategoryBudget(chat_id)
         print(data,"data")
-        if graphing.viewBudget(data):
-            bot.send_photo(chat_id, photo=open("budget.png", "rb"))
-            os.remove("budget.png")
+        chart = render.chart(graphing.viewBudget, data, chat_id=chat_id)
+        if chart is not None:
+            bot.send_photo(chat_id, photo=chart)
         else:
             bot.send_message(chat_id, "You are yet to set your budget for different categories.")
     else:
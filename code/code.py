@@ -28,37 +28,78 @@ SOFTWARE.
 
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import importlib
 import logging
+import secrets
+import signal
+import sys
 import telebot
 import time
+import alerts
+import config
 import helper
-import edit
-import history
-import pdf
-import display
-import estimate
-import delete
-import add
-import budget
-import analytics
-import predict
-import updateCategory
-import weekly
-import monthly
-import sendEmail
-import add_recurring
+import dispatcher
+import notifier
+import notify
+import outbox
+import render
+import webhook
 from datetime import datetime
-from jproperties import Properties
-
-
-configs = Properties()
-
-with open("user.properties", "rb") as read_prop:
-    configs.load(read_prop)
-
-api_token = str(configs.get("api_token").data)
-
-bot = telebot.TeleBot(api_token)
+from urllib.parse import urlsplit
+
+
+api_token = str(config.get("api_token"))
+
+# a local Bot API server (or the stand-in in benchmarks/fake_telegram.py) can replace api.telegram.org
+api_url = config.get("api_url")
+if api_url:
+    telebot.apihelper.API_URL = api_url.rstrip("/") + "/bot{0}/{1}"
+    telebot.apihelper.FILE_URL = api_url.rstrip("/") + "/file/bot{0}/{1}"
+    notifier.API_URL = telebot.apihelper.API_URL
+
+# start the chart workers first, so they are forked before any other thread is running
+render.configure(
+    workers=int(config.get("render_workers", "2")),
+    max_pending=int(config.get("render_queue_size", "8")),
+    timeout=float(config.get("render_timeout", "30")),
+    cache_entries=int(config.get("chart_cache_entries", "256")),
+    cache_bytes=int(float(config.get("chart_cache_mb", "32")) * 1024 * 1024),
+)
+
+helper.configureStorage(
+    config.get("storage_backend", "json"),
+    config.get("storage_path"),
+    cached=True,
+    flush_interval=float(config.get("storage_flush_interval", "5")),
+    fsync=config.get("storage_fsync", "false").lower() == "true",
+)
+
+# updates are handled by a pool of workers, in order within each chat; 0 keeps TeleBot's own threading.
+# Handlers spend most of their time waiting for Bot API round trips (charts and PDFs are drawn in the
+# render processes), so the pool is sized for many conversations in flight rather than for the cores.
+dispatch_workers = int(config.get("dispatch_workers", "32"))
+if dispatch_workers > 0:
+    bot = dispatcher.DispatchingTeleBot(api_token, workers=dispatch_workers)
+else:
+    bot = telebot.TeleBot(api_token)
+
+# every message the bot sends waits in the outbox for Telegram's global and per-chat send limits,
+# interactive replies ahead of bulk notifications, and is sent again after a 429 Too Many Requests
+send_workers = int(config.get("send_workers", "16"))
+outbox.configure(
+    rate=float(config.get("send_rate", "30")),
+    burst=int(config.get("send_burst", "30")),
+    chat_rate=float(config.get("chat_send_rate", "1")),
+    chat_burst=int(config.get("chat_send_burst", "5")),
+    workers=send_workers,
+)
+telebot.apihelper.CUSTOM_REQUEST_SENDER = outbox.request_sender(pool_size=send_workers + max(dispatch_workers, 1) + 1)
+
+# users are alerted when an expense takes their monthly spending past these percentages of a budget;
+# an empty budget_alert_thresholds turns the alerts off
+alert_thresholds = [int(t) for t in config.get("budget_alert_thresholds", "80,100").split(",") if t.strip()]
+if alert_thresholds:
+    alerts.configure(alert_thresholds)
 
 telebot.logger.setLevel(logging.INFO)
 
@@ -91,7 +132,6 @@ def listener(user_requests):
     )
 
     try:
-        helper.read_json()
         chat_id = user_requests[0].chat.id
 
         if user_requests[0].text[0] != "/":
@@ -104,7 +144,6 @@ bot.set_update_listener(listener)
 @bot.message_handler(commands=["help"])
 def show_help(m):
 
-    helper.read_json()
     chat_id = m.chat.id
 
     message = "Here are the commands you can use: \n"
@@ -117,7 +156,6 @@ def show_help(m):
 @bot.message_handler(commands=["faq"])
 def faq(m):
 
-    helper.read_json()
     chat_id = m.chat.id
 
     faq_message = (
@@ -142,7 +180,6 @@ def start_and_menu_command(m):
     bot offers and the corresponding commands to be run from the Telegram UI to use these features.
     Commands used to run this: commands=['start', 'menu']
     """
-    helper.read_json()
     chat_id = m.chat.id
 
     text_intro = (
@@ -159,155 +196,120 @@ def start_and_menu_command(m):
     bot.send_message(chat_id, text_intro)
     return True
 
-# defines how the /add command has to be handled/processed
-@bot.message_handler(commands=["add"])
-def command_add(message):
-    """
-    command_add(message) Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls add.py to run to execute
-    the add functionality. Commands used to run this: commands=['add']
-    """
-    add.run(message, bot)
-
-# defines how the /weekly command has to be handled/processed
-@bot.message_handler(commands=["weekly"])
-def command_weekly(message):
-    """
-    command_weekly(message) Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls weekly.py to run to execute
-    the weekly analysis functionality. Commands used to run this: commands=['weekly']
-    """
-    weekly.run(message, bot)
-
-# defines how the /monthly command has to be handled/processed
-@bot.message_handler(commands=["monthly"])
-def command_monthly(message):
-    """
-    command_monthly(message) Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls monthly.py to run to execute
-    the monthly analysis functionality. Commands used to run this: commands=['monthly']
-    """
-    monthly.run(message, bot)
-
-#handles add_recurring command
-@bot.message_handler(commands=['add_recurring'])
-def command_add_recurring(message):
-    add_recurring.run(message, bot)
-
-# handles pdf command
-@bot.message_handler(commands=["pdf"])
-def command_pdf(message):
-    """
-    command_history(message): Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls pdf.py to run to execute
-    the add functionality. Commands used to run this: commands=['pdf']
-    """
-    pdf.run(message, bot)
-
-#handles updateCategory command
-@bot.message_handler(commands=["updateCategory"])
-def command_updateCategory(message):
-    """
-    command_updateCategory(message): Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls updateCategory.py to run to execute
-    the updateCategory functionality. Commands used to run this: commands=['updateCategory']
-    """
-    updateCategory.run(message, bot)
-
-# function to fetch expenditure history of the user
-@bot.message_handler(commands=["history"])
-def command_history(message):
-    """
-    command_history(message): Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls history.py to run to execute
-    the add functionality. Commands used to run this: commands=['history']
-    """
-    history.run(message, bot)
-
-# function to fetch expenditure history of the user
-@bot.message_handler(commands=["sendEmail"])
-def command_sendEmail(message):
-    """
-    command_history(message): Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls sendEmail.py to run to execute
-    the sending an email of the expense history. Commands used to run this: commands=['sendEmail']
-    """
-    sendEmail.run(message, bot)
-
-# function to edit date, category or cost of a transaction
-@bot.message_handler(commands=["edit"])
-def command_edit(message):
-    """
-    command_edit(message): Takes 1 argument message which contains the message from
-    the user along with the chat ID of the user chat. It then calls edit.py to run to execute
-    the add functionality. Commands used to run this: commands=['edit']
-    """
-    edit.run(message, bot)
-
-# function to display total expenditure
-@bot.message_handler(commands=["display"])
-def command_display(message):
-    """
-    command_display(message): Takes 1 argument message which contains the message from the user
-    along with the chat ID of the user chat. It then calls display.py to run to execute the add functionality.
-    Commands used to run this: commands=['display']
-    """
-    display.run(message, bot)
-
-# function to estimate future expenditure
-@bot.message_handler(commands=["estimate"])
-def command_estimate(message):
-    """
-    command_estimate(message): Takes 1 argument message which contains the message from the user
-    along with the chat ID of the user chat. It then calls delete.py to run to execute the add functionality.
-    Commands used to run this: commands=['estimate']
-    """
-    estimate.run(message, bot)
-
-# handles "/delete" command
-@bot.message_handler(commands=["delete"])
-def command_delete(message):
-    """
-    command_delete(message): Takes 1 argument message which contains the message from the user
-    along with the chat ID of the user chat. It then calls delete.py to run to execute the add functionality.
-    Commands used to run this: commands=['display']
-    """
-    delete.run(message, bot)
-
-# handles budget command
-@bot.message_handler(commands=["budget"])
-def command_budget(message):
-    budget.run(message, bot)
-
-# handles analytics command
-@bot.message_handler(commands=["analytics"])
-def command_analytics(message):
-    """
-    command_analytics(message): Take an argument message with content and chat ID. Calls analytics to 
-    run analytics. Commands to run this commands=["analytics"]
-    """
-    analytics.run(message, bot)
+# Feature commands and the modules that implement them. A module is imported the first time one
+# of its commands is used, so the bot does not load pandas, matplotlib, fpdf or smtplib before it
+# can answer its first message.
+lazy_commands = {
+    "add": "add",
+    "add_recurring": "add_recurring",
+    "analytics": "analytics",
+    "budget": "budget",
+    "delete": "delete",
+    "display": "display",
+    "edit": "edit",
+    "estimate": "estimate",
+    "history": "history",
+    "monthly": "monthly",
+    "pdf": "pdf",
+    "predict": "predict",
+    "sendEmail": "sendEmail",
+    "updateCategory": "updateCategory",
+    "verify": "verify",
+    "weekly": "weekly",
+}
+
+def lazy_command(module_name):
+    """
+    lazy_command(module_name): Returns a message handler that imports the feature module
+    module_name on first use and calls its run(message, bot) function.
+    """
+    def command(message):
+        importlib.import_module(module_name).run(message, bot)
+    command.__name__ = "command_" + module_name
+    return command
+
+for command_name, module_name in lazy_commands.items():
+    bot.register_message_handler(lazy_command(module_name), commands=[command_name])
+
+# Inline buttons whose callback data starts with "<prefix>:" and the modules that handle them.
+lazy_callbacks = {
+    "delete": "delete",
+    "edit": "edit",
+    "history": "history",
+}
+
+def lazy_callback(module_name):
+    """
+    lazy_callback(module_name): Returns a callback query handler that imports the feature module
+    module_name on first use and calls its callback(call, bot) function. Buttons keep working
+    after a restart, before the command that sent them has been run again.
+    """
+    def handle(call):
+        importlib.import_module(module_name).callback(call, bot)
+    handle.__name__ = "callback_" + module_name
+    return handle
+
+for prefix, module_name in lazy_callbacks.items():
+    bot.register_callback_query_handler(
+        lazy_callback(module_name), func=lambda call, prefix=prefix: (call.data or "").split(":")[0] == prefix
+    )
 
-# handles predict command
-@bot.message_handler(commands=["predict"])
-def command_predict(message):
-    """
-    command_predict(message): Take an argument message with content and chat ID. Calls predict to 
-    analyze budget and spending trends and suggest a future budget. Commands to run this commands=["predict"]
-    """
-    predict.run(message, bot)
+def serve_webhook(webhook_url):
+    """
+    serve_webhook(webhook_url): Registers webhook_url with Telegram and handles the updates POSTed
+    to it until the process is stopped. The local server listens on webhook_listen:webhook_port
+    (0.0.0.0:8443 by default) at webhook_path, by default the path of webhook_url, so a reverse
+    proxy can terminate TLS in front of it; webhook_cert and webhook_key make it serve HTTPS itself.
+    Requests without the secret token (webhook_secret, random unless configured) are rejected.
+    """
+    secret_token = config.get("webhook_secret") or secrets.token_urlsafe(32)
+    certificate = config.get("webhook_cert")
+    server = webhook.WebhookServer(
+        bot,
+        host=config.get("webhook_listen", "0.0.0.0"),
+        port=int(config.get("webhook_port", "8443")),
+        path=config.get("webhook_path") or urlsplit(webhook_url).path or "/",
+        secret_token=secret_token,
+        certificate=certificate,
+        private_key=config.get("webhook_key"),
+    )
+    try:
+        if certificate:
+            with open(certificate, "rb") as public_key:
+                bot.set_webhook(url=webhook_url, certificate=public_key, secret_token=secret_token)
+        else:
+            bot.set_webhook(url=webhook_url, secret_token=secret_token)
+        server.serve_forever()
+    finally:
+        server.shutdown()
 
 def main():
     """
     main() The entire bot's execution begins here. It ensure the bot variable begins
-    polling and actively listening for requests from telegram.
+    polling and actively listening for requests from telegram, or, when webhook_url is set in
+    user.properties, receiving them on a webhook.
     """
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     try:
-        bot.polling(none_stop=True)
+        webhook_url = config.get("webhook_url")
+        if webhook_url:
+            serve_webhook(webhook_url)
+        else:
+            # a webhook left over from an earlier run would make getUpdates fail
+            bot.remove_webhook()
+            bot.polling(none_stop=True)
     except Exception as e:
         logging.exception(str(e))
         time.sleep(3)
         print("Connection Timeout")
+    finally:
+        bot.stop_bot()
+        render.close()
+        alerts.close()
+        notify.close()
+        logging.info("Outbox: %s", outbox.get().stats())
+        outbox.close()
+        helper.closeStorage()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+File: config.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+from jproperties import Properties
+
+# settings file read from the bot's working directory
+PATH = "user.properties"
+
+_configs = None
+_lock = threading.Lock()
+
+# === Documentation of config.py ===
+
+def load(path=None):
+    """
+    load(path): Reads user.properties (or path) the first time it is called and returns the parsed
+    settings. Later calls return the same settings without touching the file again.
+    """
+    global _configs
+    with _lock:
+        if _configs is None:
+            configs = Properties()
+            with open(path or PATH, "rb") as read_prop:
+                configs.load(read_prop)
+            _configs = configs
+        return _configs
+
+
+def get(key, default=None):
+    """
+    get(key, default): Returns the value of a setting from user.properties, or default when it is
+    not set.
+    """
+    value = load().get(key)
+    return default if value is None else value.data
+
+
+def reset():
+    """
+    reset(): Forgets the loaded settings, so the next call reads the file again.
+    """
+    global _configs
+    with _lock:
+        _configs = None
@@ -28,30 +28,36 @@ SOFTWARE.
 from datetime import datetime
 import logging
 import helper
+import picker
 from telebot import types
 
 # === Documentation of delete.py ===
-# pylint: disable=W0601
 def run(message, bot):
     """
     run(message, bot): This is the main function used to implement the delete feature.
     It takes 2 arguments for processing - message which is the message from the user, and bot
-    which is the telegram bot object from the main code.py function. It calls helper to get the user
-    history i.e chat ids of all user in the application, and if the user requesting a delete has their
-    data saved in myDollarBot i.e their chat ID has been logged before, run calls the deleteHistory(chat_id):
-    to remove it. Then it ensures this removal is saved in the datastore.
+    which is the telegram bot object from the main code.py function. It reads the record of the user
+    with helper.getUserData, and if the user requesting a delete has their
+    data saved in myDollarBot i.e their chat ID has been logged before, run asks for a date or a month, or All for
+    deleteHistory(chat_id): to remove everything. The prompt also carries the
+    expense picker, so a single expense can be chosen instead, see callback(call, bot).
     """
-    global user_list
     dateFormat = helper.getDateFormat()
     chat_id = message.chat.id
     delete_history_text = ""
-    user_list = helper.read_json()
     try:
-        if str(chat_id) in user_list and helper.getUserHistory(chat_id) is not None:
+        user = helper.getUserData(chat_id)
+        if user is not None:
+            user_history = user["data"]
             curr_day = datetime.now()
             prompt = "Enter the corresponding date in the given format or Enter All to delete the entire history\n"
             prompt += f"\n\tExample day: {curr_day.strftime(dateFormat)}\n"
-            reply_message = bot.reply_to(message, prompt)
+            prompt += f"\tExample month: {curr_day.strftime(helper.getMonthFormat())}\n"
+            markup = None
+            if len(user_history) > 0:
+                prompt += "\nOr select a single expense below"
+                markup = picker.picker_markup(user_history, "delete")
+            reply_message = bot.reply_to(message, prompt, reply_markup=markup)
             bot.register_next_step_handler(reply_message, process_delete_argument, bot)
         else:
             delete_history_text = "No records there to be deleted. Start adding your expenses to keep track of your spendings!"
@@ -62,6 +68,35 @@ def run(message, bot):
         logging.error(str(ex), exc_info=True)
         bot.reply_to(message, "Processing Failed - \nError : " + str(ex))
 
+def callback(call, bot):
+    """
+    callback(call, bot): Handles the buttons of the expense picker sent by run. A navigation button
+    shows another page. Choosing an expense cancels the typed date prompt and asks for a
+    confirmation before handle_expense_confirmation deletes it.
+    """
+    try:
+        chat_id = call.message.chat.id
+        action, value = picker.parse_callback(call.data)
+        if action == "page":
+            picker.show_page(call, bot, helper.getUserHistory(chat_id) or [], "delete", value)
+        else:
+            record = helper.getUserExpense(chat_id, value)
+            if record is None:
+                bot.send_message(chat_id, "This expense no longer exists, please try /delete again")
+            else:
+                bot.clear_step_handler_by_chat_id(chat_id)
+                markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
+                markup.add("Yes")
+                markup.add("No")
+                response = bot.send_message(
+                    chat_id, "Confirm record to delete\n" + str(record) + "\n\nReply Yes or No", reply_markup=markup
+                )
+                bot.register_next_step_handler(response, handle_expense_confirmation, bot, record)
+        bot.answer_callback_query(call.id)
+    except Exception as ex:
+        logging.error(str(ex), exc_info=True)
+        bot.answer_callback_query(call.id, "Processing Failed - \nError : " + str(ex))
+
 def process_delete_argument(message, bot):
     """
     This function receives the choice that user inputs for delete and asks for a confirmation. 'handle_confirmation'
@@ -76,7 +111,7 @@ def process_delete_argument(message, bot):
 
     date = text
     if text.lower() == "all":
-        helper.write_json(deleteHistory(chat_id))
+        deleteHistory(chat_id)
         bot.send_message(chat_id, "History has been deleted!")
     else:
         if date is None:
@@ -91,7 +126,7 @@ def process_delete_argument(message, bot):
                 return
             response_str = "Confirm records to delete\n"
             for record in records_to_delete:
-                response_str += record + "\n"
+                response_str += str(record) + "\n"
 
             markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
             markup.add("Yes")
@@ -112,26 +147,33 @@ def handle_confirmation(message, bot, records_to_delete):
 
     chat_id = str(message.chat.id)
     if message.text.lower() == "yes":
-        if str(chat_id) in user_list:
-            # Get the user's data
-            user_data = user_list.get(str(chat_id), {}).get('data', [])
-            # Remove the specified records
-            user_data = [record for record in user_data if record not in records_to_delete]
-            # Update the userlist with the modified data
-            user_list[str(chat_id)]['data'] = user_data
-        helper.write_json(user_list)
+        # Remove the specified records, updating the user's spending totals as they go
+        helper.deleteUserRecords(chat_id, records_to_delete)
         bot.send_message(message.chat.id, "Successfully deleted records")
     else:
         bot.send_message(message.chat.id, "No records deleted")
 
+def handle_expense_confirmation(message, bot, record):
+    """
+    handle_expense_confirmation(message, bot, record): Deletes the expense chosen in the picker if
+    the user replies 'yes'. Only that one expense is deleted, even when the user recorded identical
+    expenses.
+    """
+    chat_id = str(message.chat.id)
+    if message.text.lower() == "yes":
+        if helper.deleteUserRecord(chat_id, record):
+            bot.send_message(message.chat.id, "Successfully deleted records")
+        else:
+            bot.send_message(message.chat.id, "This expense no longer exists, please try /delete again")
+    else:
+        bot.send_message(message.chat.id, "No records deleted")
+
 # function to delete a record
 def deleteHistory(chat_id):
     """
     deleteHistory(chat_id): It takes 1 argument for processing - chat_id which is the
-    chat_id of the user whose data is to deleted from the user list. It removes this entry from the user list.
+    chat_id of the user whose data is to deleted. It clears the user's expenses and budget
+    in the datastore, without rewriting the records of other users.
     """
-    if str(chat_id) in user_list:
-        user_list[str(chat_id)]["data"] = []
-        user_list[str(chat_id)]["budget"]["overall"] = str(0)
-        user_list[str(chat_id)]["budget"]["category"] = {}
-    return user_list
\ No newline at end of file
+    helper.saveUserHistory(chat_id, [])
+    helper.updateUserBudget(chat_id, {"overall": str(0), "category": {}})
@@ -0,0 +1,129 @@
+"""
+File: dispatcher.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+import threading
+import telebot
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# === Documentation of dispatcher.py ===
+
+def get_chat_id(update):
+    """
+    get_chat_id(update): Returns the id of the chat an update belongs to, or None for updates
+    that are not tied to a chat (inline queries, polls and the like).
+    """
+    for kind in ("message", "edited_message", "channel_post", "edited_channel_post"):
+        message = getattr(update, kind, None)
+        if message is not None:
+            return message.chat.id
+    query = getattr(update, "callback_query", None)
+    if query is not None:
+        return query.message.chat.id if query.message is not None else query.from_user.id
+    return None
+
+
+class ChatDispatcher:
+    """
+    Runs tasks on a pool of worker threads, in parallel across chats but strictly in order
+    within a chat: each chat has its own queue and at most one worker drains it at a time.
+    A worker runs one task of a chat and then requeues the chat behind the others, so a chat
+    with a long backlog cannot starve the rest.
+    """
+
+    def __init__(self, workers=32):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queues = {}
+
+    def submit(self, chat_id, task, *args):
+        """
+        submit(chat_id, task, *args): Queues task(*args) to run after every task already
+        submitted for chat_id.
+        """
+        with self._lock:
+            queue = self._queues.get(chat_id)
+            if queue is not None:
+                queue.append((task, args))
+                return
+            self._queues[chat_id] = deque([(task, args)])
+        self._executor.submit(self._drain, chat_id)
+
+    def _drain(self, chat_id):
+        with self._lock:
+            task, args = self._queues[chat_id][0]
+        try:
+            task(*args)
+        except Exception as e:
+            logging.exception(str(e))
+        with self._lock:
+            queue = self._queues[chat_id]
+            queue.popleft()
+            if not queue:
+                del self._queues[chat_id]
+                if not self._queues:
+                    self._idle.notify_all()
+                return
+        self._executor.submit(self._drain, chat_id)
+
+    def shutdown(self, wait=True):
+        """
+        shutdown(wait): Stops the workers; with wait=True it first lets every queued task finish.
+        """
+        if wait:
+            with self._idle:
+                self._idle.wait_for(lambda: not self._queues)
+        self._executor.shutdown(wait=wait)
+
+
+class DispatchingTeleBot(telebot.TeleBot):
+    """
+    TeleBot that hands the updates of every poll to a ChatDispatcher instead of handling them in
+    the polling thread. Updates of one chat are handled in the order they arrived, so the
+    register_next_step_handler conversations stay consistent, while a slow command in one chat
+    no longer holds up the others.
+    """
+
+    def __init__(self, token, workers=32, **kwargs):
+        super().__init__(token, threaded=False, **kwargs)
+        self.dispatcher = ChatDispatcher(workers)
+
+    def process_new_updates(self, updates):
+        chats = {}
+        for update in updates:
+            # acknowledge right away, the next poll must not fetch these updates again
+            if update.update_id > self.last_update_id:
+                self.last_update_id = update.update_id
+            chats.setdefault(get_chat_id(update), []).append(update)
+        for chat_id, chat_updates in chats.items():
+            self.dispatcher.submit(chat_id, super().process_new_updates, chat_updates)
+
+    def stop_bot(self):
+        super().stop_bot()
+        self.dispatcher.shutdown()
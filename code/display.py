@@ -27,8 +27,11 @@ SOFTWARE.
 
 import time
 from tabulate import tabulate
+import aggregate
 import helper
 import graphing
+import render
+import timeline
 import logging
 from telebot import types
 from datetime import datetime
@@ -41,7 +44,6 @@ def run(message, bot):
     It takes 2 arguments for processing - message which is the message from the user, and bot
     which is the telegram bot object from the main code.py function.
     """
-    helper.read_json()
     chat_id = message.chat.id
     history = helper.getUserHistory(chat_id)
     if history is None:
@@ -88,20 +90,16 @@ def display_total(message, bot):
         time.sleep(0.5)
 
         total_text = ""
+        today = datetime.now().today()
         if DayWeekMonth == "Day":
-            query = datetime.now().today().strftime(helper.getDateFormat())
             # query all that contains today's date
-            queryResult = [
-                value for index, value in enumerate(history) if str(query) in value
-            ]
+            queryResult = helper.queryUserHistory(chat_id, start=today, end=today)
         elif DayWeekMonth == "Month":
-            query = datetime.now().today().strftime(helper.getMonthFormat())
-            # query all that contains today's date
-            queryResult = [
-                value for index, value in enumerate(history) if str(query) in value
-            ]
+            # query all that falls in the current month
+            first, last = timeline.month_range(today.year, today.month)
+            queryResult = helper.queryUserHistory(chat_id, start=first, end=last)
         total_text, total_dict = calculate_spendings(queryResult)
-        monthly_budget = helper.getCategoryBudget(chat_id)
+        monthly_budget = helper.getCategoryBudget(chat_id) or {}
         print("Print Total Spending", total_text)
         print("Print monthly budget", monthly_budget)
 
@@ -117,8 +115,8 @@ def display_total(message, bot):
             spend_total_str="<pre>"+ tabulate(table, headers='firstrow')+"</pre>"
             bot.send_message(chat_id, spending_text)
             bot.send_message(chat_id, spend_total_str, parse_mode="HTML")
-            graphing.visualize(total_text, monthly_budget)
-            bot.send_photo(chat_id, photo=open("expenditure.png", "rb"))
+            chart = render.chart(graphing.visualize, total_text, monthly_budget, chat_id=chat_id)
+            bot.send_photo(chat_id, photo=chart)
     except Exception as e:
         logging.exception(str(e))
         bot.reply_to(message, str(e))
@@ -129,18 +127,8 @@ def calculate_spendings(queryResult):
     which is the query result from the display total function in the same file.
     It parses the query result and turns it into a form suitable for display on the UI by the user.
     """
-    total_dict = {}
-
-    for row in queryResult:
-        # date,cat,money
-        s = row.split(",")
-        # cat
-        cat = s[1]
-        if cat in total_dict:
-            # round up to 2 decimal
-            total_dict[cat] = round(total_dict[cat] + float(s[2]), 2)
-        else:
-            total_dict[cat] = float(s[2])
+    table = aggregate.ExpenseTable.from_history(queryResult)
+    total_dict = {category: cents / 100 for category, cents in table.sum_by_category().items()}
     total_text = ""
     for key, value in total_dict.items():
         total_text += str(key) + " $" + str(value) + "\n"
@@ -25,69 +25,87 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import alerts
 import helper
+import logging
+import picker
+import records
 from telebot import types
 from telegram_bot_calendar import DetailedTelegramCalendar, LSTEP
 from datetime import datetime
 
+fields = ["Date", "Category", "Amount"]
+
 # === Documentation of edit.py ===
 
 def run(m, bot):
     """
-    run(message, bot): This is the main function used to implement the delete feature.
+    run(message, bot): This is the main function used to implement the edit feature.
     It takes 2 arguments for processing - message which is the message from the user, and
-    bot which is the telegram bot object from the main code.py function. It gets the details
-    for the expense to be edited from here and passes control onto edit2(m, bot): for further processing.
+    bot which is the telegram bot object from the main code.py function. It shows the first page
+    of the expense picker; the choice arrives in callback(call, bot).
     """
     chat_id = m.chat.id
-    markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
-    markup.row_width = 2
     user_history = helper.getUserHistory(chat_id)
     if not user_history:
         bot.send_message(chat_id,"You have no previously recorded expenses to modify")
         return
-    for c in user_history:
-        expense_data = c.split(",")
-        str_date = "Date=" + expense_data[0]
-        str_category = ",\t\tCategory=" + expense_data[1]
-        str_amount = ",\t\tAmount=$" + expense_data[2]
-        markup.add(str_date + str_category + str_amount)
-    info = bot.reply_to(m, "Select expense to be edited:", reply_markup=markup)
-    bot.register_next_step_handler(info, select_category_to_be_updated, bot)
+    bot.reply_to(m, "Select expense to be edited:", reply_markup=picker.picker_markup(user_history, "edit"))
 
-def select_category_to_be_updated(m, bot):
+def callback(call, bot):
+    """
+    callback(call, bot): Handles the buttons of the expense picker sent by run. A navigation button
+    shows another page, an expense button passes the id of the chosen expense on to
+    select_category_to_be_updated(m, bot, expense_id).
+    """
+    try:
+        action, value = picker.parse_callback(call.data)
+        if action == "page":
+            picker.show_page(call, bot, helper.getUserHistory(call.message.chat.id) or [], "edit", value)
+        else:
+            select_category_to_be_updated(call.message, bot, value)
+        bot.answer_callback_query(call.id)
+    except Exception as e:
+        logging.exception(str(e))
+        bot.answer_callback_query(call.id, "Oops! " + str(e))
+
+def select_category_to_be_updated(m, bot, expense_id):
 
     """
-    select_category_to_be_updated(m, bot): Handles the user's selection of expense categories for updating.
+    select_category_to_be_updated(m, bot, expense_id): Handles the user's selection of an expense for updating.
 
     Parameters:
-    - m (telegram.Message): The message object received from the user.
+    - m (telegram.Message): The message the picker was attached to.
     - bot (telegram.Bot): The Telegram bot object.
+    - expense_id (str): The id of the selected expense (see records.Expense.id).
 
-    This function processes the user's selected expense categories, presents options for updating,
+    This function looks the selected expense up by its id, presents its fields as options for updating,
     and registers the next step handler for further processing.
     """
 
-    info = m.text
+    record = helper.getUserExpense(m.chat.id, expense_id)
+    if record is None:
+        bot.send_message(m.chat.id, "This expense no longer exists, please try /edit again")
+        return
     markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
     markup.row_width = 2
-    selected_data = [] if info is None else info.split(",")
-    for c in selected_data:
-        markup.add(c.strip())
-    choice = bot.reply_to(m, "What do you want to update?", reply_markup=markup)
+    markup.add("Date=" + record.date_str)
+    markup.add("Category=" + record.category)
+    markup.add("Amount=$" + record.amount_str)
+    choice = bot.send_message(m.chat.id, "What do you want to update?", reply_markup=markup)
     updated = []
-    bot.register_next_step_handler(choice, enter_updated_data, bot, selected_data, updated)
+    bot.register_next_step_handler(choice, enter_updated_data, bot, expense_id, updated)
 
-def enter_updated_data(m, bot, selected_data, updated):
+def enter_updated_data(m, bot, expense_id, updated):
 
     """
-    enter_updated_data(m, bot, selected_data, updated): Handles the user's input for updating expense information.
+    enter_updated_data(m, bot, expense_id, updated): Handles the user's input for updating expense information.
 
     Parameters:
     - m (telegram.Message): The message object received from the user.
     - bot (telegram.Bot): The Telegram bot object.
-    - selected_data (list): List of selected expense information.
-    - updated (list): List of updated categories.
+    - expense_id (str): The id of the expense being edited.
+    - updated (list): List of the fields updated so far.
 
     This function processes the user's choice for updating expense details and registers the next step handlers
     accordingly (date, category, amount).
@@ -120,148 +138,98 @@ def enter_updated_data(m, bot, selected_data, updated):
                 if (result > data):
                     bot.send_message(chat_id,"Cannot select future dates, Please try /edit command again with correct dates")
                 else:
-                    edit_date(bot, selected_data, result, c, updated)
                     bot.edit_message_text(
                         f"Date is updated: {result}",
                         c.message.chat.id,
                         c.message.message_id,
                     )
+                    edit_date(bot, expense_id, result, c, updated)
 
     if "Category" in choice1:
         new_cat = bot.reply_to(m, "Please select the new category", reply_markup=markup)
-        bot.register_next_step_handler(new_cat, edit_cat, bot, selected_data, updated)
+        bot.register_next_step_handler(new_cat, edit_cat, bot, expense_id, updated)
 
     if "Amount" in choice1:
         new_cost = bot.reply_to(
             m, "Please type the new cost\n(Enter only numerical value)"
         )
-        bot.register_next_step_handler(new_cost, edit_cost, bot, selected_data, updated)
+        bot.register_next_step_handler(new_cost, edit_cost, bot, expense_id, updated)
 
-def update_different_category(m, bot, selected_data, updated):
+def update_different_category(m, bot, expense_id, updated):
 
     """
-    update_different_category(m, bot, selected_data, updated): Handles user's choice to update another category.
+    update_different_category(m, bot, expense_id, updated): Handles user's choice to update another field.
 
     Parameters:
     - m (telegram.Message): The message object received from the user.
     - bot (telegram.Bot): The Telegram bot object.
-    - selected_data (list): List of selected expense information.
-    - updated (list): List of updated categories.
+    - expense_id (str): The id of the expense being edited.
+    - updated (list): List of the fields updated so far.
 
-    This function processes the user's choice to update another category and registers the next step handlers accordingly.
+    This function processes the user's choice to update another field and registers the next step handlers accordingly.
     """
 
     response = m.text
     if response == "Y" or response == "y":
         markup = types.ReplyKeyboardMarkup(one_time_keyboard=True)
         markup.row_width = 2
-        for c in selected_data:
-            if c not in updated:
-                markup.add(c.strip())
+        for field in fields:
+            if field not in updated:
+                markup.add(field)
         choice = bot.reply_to(m, "What do you want to update?", reply_markup=markup)
-        bot.register_next_step_handler(choice, enter_updated_data, bot, selected_data, updated)
+        bot.register_next_step_handler(choice, enter_updated_data, bot, expense_id, updated)
 
-def edit_date(bot, selected_data, result, c, updated):
+def update_record(bot, m, expense_id, updated, field, change, confirmation=None):
     """
-    def edit_date(m, bot): It takes 2 arguments for processing - message which is
-    the message from the user, and bot which is the telegram bot object from the
-    edit3(m, bot):: function in the same file. It takes care of date change and edits.
+    update_record(bot, m, expense_id, updated, field, change, confirmation): Looks the expense up
+    by its id, replaces it with change(expense), checks the user's budgets for alerts, replies
+    confirmation to m if given and asks whether another field should be updated. Returns the updated expense, or None when the
+    expense no longer exists, including when it is deleted between the lookup and the replace.
     """
-    user_list = helper.read_json()
-    new_date = datetime.strftime(result, helper.getDateFormat())
-    chat_id = c.message.chat.id
-    m = c.message
-    data_edit = helper.getUserHistory(chat_id)
-
-    for i in range(len(data_edit)):
-        user_data = data_edit[i].split(",")
-        selected_date = selected_data[0].split("=")[1]
-        selected_category = selected_data[1].split("=")[1]
-        selected_amount = selected_data[2].split("=")[1]
-        if (
-            user_data[0] == selected_date and user_data[1] == selected_category and user_data[2] == selected_amount[1:]
-        ):
-            data_edit[i] = (
-                new_date + "," + selected_category + "," + selected_amount[1:]
-            )
-            break
-
-    user_list[str(chat_id)]["data"] = data_edit
-    helper.write_json(user_list)
-    new_date_str = "Date=" + new_date
-    updated.append(new_date_str)
-    selected_data[0] = new_date_str
-    if len(updated) == 3:
-        bot.send_message(m.chat.id, "You have updated all the categories for this expense")
-        return
-    resp = bot.send_message(m.chat.id, "Do you want to update another category in this expense?(Y/N)")
-    bot.register_next_step_handler(resp, update_different_category, bot, selected_data ,updated)
+    chat_id = m.chat.id
+    record = helper.getUserExpense(chat_id, expense_id)
+    if record is None:
+        bot.send_message(chat_id, "This expense no longer exists, please try /edit again")
+        return None
+    new_record = change(record)
+    if not helper.replaceUserRecord(chat_id, record, new_record):
+        bot.send_message(chat_id, "This expense no longer exists, please try /edit again")
+        return None
+    alerts.check(chat_id, removed=[record], added=[new_record])
+    if confirmation:
+        bot.reply_to(m, confirmation)
+    updated.append(field)
+    if len(updated) == len(fields):
+        bot.send_message(chat_id, "You have updated all the categories for this expense")
+        return new_record
+    resp = bot.send_message(chat_id, "Do you want to update another category in this expense?(Y/N)")
+    bot.register_next_step_handler(resp, update_different_category, bot, new_record.id, updated)
+    return new_record
+
+def edit_date(bot, expense_id, result, c, updated):
+    """
+    def edit_date(bot, expense_id, result, c, updated): It takes care of date change and edits.
+    result is the date picked in the calendar and c the calendar's callback query.
+    """
+    update_record(bot, c.message, expense_id, updated, "Date", lambda record: record._replace(day=result.toordinal()))
 
-def edit_cat(m, bot, selected_data, updated):
+def edit_cat(m, bot, expense_id, updated):
     """
-    def edit_cat(m, bot): It takes 2 arguments for processing - message which is the message
-    from the user, and bot which is the telegram bot object from the edit3(m, bot):: function in the
-    same file. It takes care of category change and edits.
+    def edit_cat(m, bot, expense_id, updated): It takes 2 arguments for processing - message which is the message
+    from the user, and bot which is the telegram bot object. It takes care of category change and edits.
     """
-    user_list = helper.read_json()
-    chat_id = m.chat.id
-    data_edit = helper.getUserHistory(chat_id)
     new_cat = "" if m.text is None else m.text
-    for i in range(len(data_edit)):
-        user_data = data_edit[i].split(",")
-        selected_date = selected_data[0].split("=")[1]
-        selected_category = selected_data[1].split("=")[1]
-        selected_amount = selected_data[2].split("=")[1]
-        if (
-            user_data[0] == selected_date and user_data[1] == selected_category and user_data[2] == selected_amount[1:]
-        ):
-            data_edit[i] = selected_date + "," + new_cat + "," + selected_amount[1:]
-            break
-
-    user_list[str(chat_id)]["data"] = data_edit
-    helper.write_json(user_list)
-    new_cat_str = "Category=" + new_cat
-    updated.append(new_cat_str)
-    selected_data[1] = new_cat_str
-    bot.reply_to(m, "Category is updated")
-    if len(updated) == 3:
-        bot.send_message(m.chat.id, "You have updated all the categories for this expense")
-        return
-    resp = bot.send_message(m.chat.id, "Do you want to update another category in this expense?(Y/N)")
-    bot.register_next_step_handler(resp, update_different_category, bot, selected_data, updated)
+    update_record(bot, m, expense_id, updated, "Category", lambda record: record._replace(category=new_cat),
+                  "Category is updated")
 
-def edit_cost(m, bot, selected_data, updated):
+def edit_cost(m, bot, expense_id, updated):
     """
-    def edit_cost(m, bot): It takes 2 arguments for processing - message which is the
-    message from the user, and bot which is the telegram bot object from the
-    edit3(m, bot):: function in the same file. It takes care of cost change and edits.
+    def edit_cost(m, bot, expense_id, updated): It takes 2 arguments for processing - message which is the
+    message from the user, and bot which is the telegram bot object. It takes care of cost change and edits.
     """
-    user_list = helper.read_json()
     new_cost = "" if m.text is None else m.text
-    chat_id = m.chat.id
-    data_edit = helper.getUserHistory(chat_id)
-
-    if helper.validate_entered_amount(new_cost) != 0:
-        for i in range(len(data_edit)):
-            user_data = data_edit[i].split(",")
-            selected_date = selected_data[0].split("=")[1]
-            selected_category = selected_data[1].split("=")[1]
-            selected_amount = selected_data[2].split("=")[1]
-            if (
-                user_data[0] == selected_date and user_data[1] == selected_category and user_data[2] == selected_amount[1:]
-            ):
-                data_edit[i] = selected_date + "," + selected_category + "," + new_cost
-                break
-        user_list[str(chat_id)]["data"] = data_edit
-        helper.write_json(user_list)
-        bot.reply_to(m, "Expense amount is updated")
-    else:
+    if helper.validate_entered_amount(new_cost) == 0:
         bot.reply_to(m, "The cost is invalid")
-    new_cost_str = "Category=" + new_cost
-    updated.append(new_cost_str)
-    selected_data[1] = new_cost_str
-    if len(updated) == 3:
-        bot.send_message(m.chat.id, "You have updated all the categories for this expense")
         return
-    resp = bot.send_message(m.chat.id, "Do you want to update another category in this expense?(Y/N)")
-    bot.register_next_step_handler(resp, update_different_category, bot, selected_data, updated)
\ No newline at end of file
+    update_record(bot, m, expense_id, updated, "Amount", lambda record: record._replace(cents=records.to_cents(new_cost)),
+                  "Expense amount is updated")
@@ -26,6 +26,7 @@ SOFTWARE.
 """
 
 import time
+import aggregate
 import helper
 import logging
 from telebot import types
@@ -38,7 +39,6 @@ def run(message, bot):
     It takes 2 arguments for processing - message which is the message from the user, and
     bot which is the telegram bot object from the main code.py function.
     """
-    helper.read_json()
     chat_id = message.chat.id
     history = helper.getUserHistory(chat_id)
     if history is None:
@@ -90,8 +90,7 @@ def estimate_total(message, bot):
             days_to_estimate = 30
             # query all that contains today's date
         # query all that contains all history
-        queryResult = [value for index, value in enumerate(history)]
-        total_text = calculate_estimate(queryResult, days_to_estimate)
+        total_text = calculate_estimate(history, days_to_estimate)
 
         spending_text = ""
         if len(total_text) == 0:
@@ -114,26 +113,11 @@ def calculate_estimate(queryResult, days_to_estimate):
     result and turns it into a form suitable for display on the UI by the user. days_to_estimate is a
     variable that tells the function to calculate the estimate for a specified period like a day or month.
     """
-    total_dict = {}
-    days_data_available = {}
-    for row in queryResult:
-        # date,cat,money
-        s = row.split(",")
-        # cat
-        cat = s[1]
-        date_str = s[0][0:11]
-        if cat in total_dict:
-            # round up to 2 decimal
-            total_dict[cat] = round(total_dict[cat] + float(s[2]), 2)
-        else:
-            total_dict[cat] = float(s[2])
-        if date_str not in days_data_available:
-            days_data_available[date_str] = True
-
+    table = aggregate.ExpenseTable.from_history(queryResult)
+    days_data_available = table.distinct_days()
     total_text = ""
-    for key, value in total_dict.items():
-        category_count = len(days_data_available)
-        daily_avg = value / category_count
+    for key, value in table.sum_by_category().items():
+        daily_avg = value / 100 / days_data_available
         estimated_avg = round(daily_avg * days_to_estimate, 2)
         total_text += str(key) + " $" + str(estimated_avg) + "\n"
     return total_text
\ No newline at end of file
@@ -27,8 +27,8 @@ SOFTWARE.
 
 import helper
 import graphing
+import render
 from telebot import types
-import os
 
 def viewOverallBudget(chat_id, bot):
     """
@@ -57,9 +57,8 @@ def viewOverallBudget(chat_id, bot):
     if category_budget == {}:
         bot.send_message(chat_id, "You are yet to set your budget for different categories.")
     else:
-        graphing.overall_split(category_budget)
-        bot.send_photo(chat_id, photo=open("overall_split.png", 'rb'), reply_markup=types.ReplyKeyboardRemove())
-        os.remove("overall_split.png")
+        chart = render.chart(graphing.overall_split, category_budget, chat_id=chat_id)
+        bot.send_photo(chat_id, photo=chart, reply_markup=types.ReplyKeyboardRemove())
 
 def viewSpendWise(chat_id, bot):
     """
@@ -82,9 +81,8 @@ def viewSpendWise(chat_id, bot):
         bot.send_message(chat_id, "No expenditure available for this month", reply_markup=types.ReplyKeyboardRemove())
         return
 
-    graphing.spend_wise_split(category_spend)
-    bot.send_photo(chat_id, photo=open("spend_wise.png", 'rb'), reply_markup=types.ReplyKeyboardRemove())
-    os.remove("spend_wise.png")
+    chart = render.chart(graphing.spend_wise_split, category_spend, chat_id=chat_id)
+    bot.send_photo(chat_id, photo=chart, reply_markup=types.ReplyKeyboardRemove())
 
 def viewRemaining(chat_id, bot):
     """
@@ -111,9 +109,8 @@ def viewRemaining(chat_id, bot):
                 category_spend_percent[cat] = percent
     
     if category_spend_percent != {}:
-        graphing.remaining(category_spend_percent)
-        bot.send_photo(chat_id, photo=open("remaining.png", 'rb'), reply_markup=types.ReplyKeyboardRemove())
-        os.remove("remaining.png")
+        chart = render.chart(graphing.remaining, category_spend_percent, chat_id=chat_id)
+        bot.send_photo(chat_id, photo=chart, reply_markup=types.ReplyKeyboardRemove())
     else:
         bot.send_message(chat_id, "You are yet to set your budget for different categories.")
 
@@ -134,6 +131,5 @@ def viewHistory(chat_id, bot):
 
     cat_spend_dict = helper.getUserHistoryDateExpense(chat_id)
 
-    graphing.time_series(cat_spend_dict)
-    bot.send_photo(chat_id, photo=open("time_series.png", 'rb'), reply_markup=types.ReplyKeyboardRemove())
-    os.remove("time_series.png")
+    chart = render.chart(graphing.time_series, cat_spend_dict, chat_id=chat_id)
+    bot.send_photo(chat_id, photo=chart, reply_markup=types.ReplyKeyboardRemove())
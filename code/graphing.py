@@ -25,6 +25,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import io
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
@@ -33,7 +34,25 @@ matplotlib.use("Agg")
 
 # === Documentation of graphing.py ===
 
+def to_png(fig=None, **kwargs):
+    """
+    to_png(fig, **kwargs): Renders the current (or given) figure into an in-memory PNG, closes it
+    and returns the BytesIO buffer, rewound and ready to be sent with bot.send_photo. Every call
+    gets its own buffer, so charts of different users never overwrite each other.
+    """
+    buffer = io.BytesIO()
+    if fig is None:
+        fig = plt.gcf()
+    fig.savefig(buffer, format="png", **kwargs)
+    plt.close(fig)
+    buffer.seek(0)
+    return buffer
+
 def viewBudget(data):
+    """
+    viewBudget(data): Draws the category-wise budget as a pie chart and returns it as a PNG
+    buffer, or None when every category budget is zero.
+    """
 
     sorted_data = {k: v for k, v in sorted(data.items(), key=lambda item: item[1])}
     values = [float(v) for v in sorted_data.values()]  # Convert values to float
@@ -50,11 +69,9 @@ def viewBudget(data):
         plt.pie(values, labels=labels, counterclock=False, shadow=True)
         plt.title("Category Wise Budget")
         plt.legend(labels, loc="center")
-        plt.savefig("budget.png", bbox_inches="tight")
-        plt.close()
-        return True
+        return to_png(bbox_inches="tight")
     else:
-        return False
+        return None
 
 def addlabels(x, y):
     """
@@ -68,7 +85,8 @@ def visualize(total_text, monthly_budget):
     """
     visualize(total_text): This is the main function used to implement the graphing
     part of display feature. This file is called from display.py, and takes the user
-    expense as a string and creates a dictionary which in turn is fed as input matplotlib to create the graph
+    expense as a string and creates a dictionary which in turn is fed as input matplotlib to create the graph.
+    The graph is returned as a PNG buffer.
     """
     n1 = len(monthly_budget)
     r1 = np.arange(n1)
@@ -109,16 +127,13 @@ def visualize(total_text, monthly_budget):
     plt.xlabel("Categories")
     plt.xticks(r1 + width / 2, monthly_budget_categ_val.keys(), rotation=90)
     plt.legend()
-    plt.savefig("expenditure.png", bbox_inches="tight")
-    plt.close()
+    return to_png(bbox_inches="tight")
 
 def overall_split(category_budget):
     _, ax = plt.subplots()
     ax.pie(category_budget.values(), labels=category_budget.keys(), autopct='%1.1f%%')
     ax.set_title("Budget split")
-    img_name = "overall_split.png"
-    plt.savefig(img_name)
-    plt.close()
+    return to_png()
 
 def spend_wise_split(category_spend):
     """
@@ -128,14 +143,12 @@ def spend_wise_split(category_spend):
     - category_spend (dict): A dictionary containing category names as keys and corresponding spending values.
 
     This function creates a pie chart using Matplotlib to visualize the spending distribution
-    across different spending categories and saves the chart as an image file.
+    across different spending categories and returns the chart as a PNG buffer.
     """
     _, ax = plt.subplots()
     ax.pie(category_spend.values(), labels=category_spend.keys(), autopct='%1.1f%%')
     ax.set_title("Category-wise spend")
-    img_name = "spend_wise.png"
-    plt.savefig(img_name)
-    plt.close()
+    return to_png()
 
 def remaining(category_spend_percent):
     """
@@ -145,7 +158,7 @@ def remaining(category_spend_percent):
     - category_spend_percent (dict): A dictionary containing category names as keys and corresponding budget percentages.
 
     This function creates a stacked bar chart using Matplotlib to visualize the remaining budget percentages
-    for different spending categories and saves the chart as an image file.
+    for different spending categories and returns the chart as a PNG buffer.
     """
     labels = tuple(category_spend_percent.keys())
     remaining_val_list = [100 - x for x in list(category_spend_percent.values())]
@@ -167,9 +180,7 @@ def remaining(category_spend_percent):
     plt.ylabel("Percentage")
     ax.legend(loc="upper right")
 
-    img_name = "remaining.png"
-    plt.savefig(img_name)
-    plt.close()
+    return to_png()
 
 def time_series(cat_spend_dict):
     """
@@ -179,12 +190,10 @@ def time_series(cat_spend_dict):
     - cat_spend_dict (dict): A dictionary containing dates as keys and corresponding expense values.
 
     This function creates a time-series plot using Matplotlib to visualize the user's spending history
-    over time and saves the plot as an image file.
+    over time and returns the plot as a PNG buffer.
     """
     plt.plot(cat_spend_dict.keys(), cat_spend_dict.values(), marker='o')
     plt.title("Time-series of expenses")
     plt.xlabel("Time")
     plt.ylabel("Expense")
-    img_name = "time_series.png"
-    plt.savefig(img_name)
-    plt.close()
\ No newline at end of file
+    return to_png()
\ No newline at end of file
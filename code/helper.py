@@ -26,8 +26,13 @@ SOFTWARE.
 """
 
 import re
+import copy
 import json
 import os
+import records
+import render
+import storage
+import timeline
 from datetime import datetime
 
 spend_categories = []
@@ -74,6 +79,7 @@ commands = {
     "weekly": "This option is to get the weekly analysis report of the expenditure",
     "monthly": "This option is to get the monthly analysis report of the expenditure",
     "sendEmail": "Send an email with an attachment showing your history",
+    "verify": "This option checks your running spending totals against your recorded expenses and rebuilds them if they do not match",
 }
 
 dateFormat = "%d-%b-%Y"
@@ -82,33 +88,117 @@ monthFormat = "%b-%Y"
 
 # === Documentation of helper.py ===
 
+_storage = None
+
+def configureStorage(backend="json", path=None, cached=False, flush_interval=0, fsync=False):
+    """
+    configureStorage(backend, path, cached, flush_interval, fsync): Selects the storage backend
+    ("json" or "sqlite") that holds the expense records of every user. With cached=True users are
+    served from memory and written back every flush_interval seconds (0 writes through immediately).
+    It is called once from code.py at startup.
+    """
+    global _storage
+    if _storage is not None:
+        _storage.close()
+    _storage = storage.create_storage(backend, path, cached, flush_interval, fsync)
+    return _storage
+
+def closeStorage():
+    """
+    closeStorage(): Writes pending changes and releases the storage backend on shutdown.
+    """
+    global _storage
+    if _storage is not None:
+        _storage.close()
+        _storage = None
+
+def getStorage():
+    """
+    getStorage(): Returns the configured storage backend, defaulting to the expense_record.json file.
+    """
+    global _storage
+    if _storage is None:
+        _storage = storage.create_storage("json")
+    return _storage
+
 # function to load .json expense record data
 def read_json():
     """
-    read_json(): Function to load .json expense record data
+    read_json(): Function to load the expense record data of all users from the datastore
     """
-    try:
-        if not os.path.exists("expense_record.json"):
-            with open("expense_record.json", "w", encoding="utf-8") as json_file:
-                json_file.write("{}")
-            return json.dumps("{}")
-        elif os.stat("expense_record.json").st_size != 0:
-            with open("expense_record.json", encoding="utf-8") as expense_record:
-                expense_record_data = json.load(expense_record)
-            return expense_record_data
-
-    except FileNotFoundError:
-        print("---------NO RECORDS FOUND---------")
+    return getStorage().load_all()
 
 def write_json(user_list):
     """
     write_json(user_list): Stores data into the datastore of the bot.
     """
-    try:
-        with open("expense_record.json", "w", encoding="utf-8") as json_file:
-            json.dump(user_list, json_file, ensure_ascii=False, indent=4)
-    except FileNotFoundError:
-        print("Sorry, the data file could not be found.")
+    getStorage().save_all(user_list)
+    for chat_id in user_list:
+        render.invalidate(chat_id)
+
+def appendUserRecord(chat_id, record):
+    """
+    appendUserRecord(chat_id, record): Adds a single expense record to the user's history
+    without rewriting the records of other users, and returns the updated user data.
+    """
+    render.invalidate(chat_id)
+    return getStorage().append_record(chat_id, record)
+
+def saveUserHistory(chat_id, history):
+    """
+    saveUserHistory(chat_id, history): Replaces the expense records of a single user in the datastore.
+    """
+    user_data = getUserData(chat_id)
+    if user_data is None:
+        user_data = createNewUserRecord()
+    user_data["data"] = history
+    getStorage().save_user(chat_id, user_data)
+    render.invalidate(chat_id)
+
+def replaceUserRecord(chat_id, old_record, new_record):
+    """
+    replaceUserRecord(chat_id, old_record, new_record): Replaces one expense record of the user
+    with its edited version. Returns False when the record is not found.
+    """
+    render.invalidate(chat_id)
+    return getStorage().replace_record(chat_id, old_record, new_record)
+
+def deleteUserRecords(chat_id, records_to_delete):
+    """
+    deleteUserRecords(chat_id, records_to_delete): Deletes the given expense records of the user
+    and returns the deleted records.
+    """
+    render.invalidate(chat_id)
+    return getStorage().remove_records(chat_id, records_to_delete)
+
+def deleteUserRecord(chat_id, record):
+    """
+    deleteUserRecord(chat_id, record): Deletes a single expense of the user, leaving any identical
+    expense in place. Returns False when the expense is not found.
+    """
+    render.invalidate(chat_id)
+    return getStorage().remove_record(chat_id, record)
+
+def getUserTotals(chat_id):
+    """
+    getUserTotals(chat_id): Returns the running spending totals (totals.SpendingTotals) of the user.
+    """
+    return getStorage().get_totals(chat_id)
+
+def verifyUserTotals(chat_id, rebuild=False):
+    """
+    verifyUserTotals(chat_id, rebuild): Recomputes the user's spending totals from the raw expense
+    records and returns the days, months and categories whose running totals had drifted.
+    With rebuild=True the running totals are replaced by the recomputed ones.
+    """
+    return getStorage().verify_totals(chat_id, rebuild)
+
+def updateUserBudget(chat_id, budget):
+    """
+    updateUserBudget(chat_id, budget): Replaces the budget of a single user in the datastore.
+    """
+    render.invalidate(chat_id)
+    return getStorage().update_budget(chat_id, budget)
 
 def read_category_json():
     """
@@ -132,8 +222,7 @@ def write_category_json(category_list):
     write_json(category_list): Stores data into the datastore of the bot.
     """
     try:
-        with open("categories.json", "w", encoding="utf-8") as json_file:
-            json.dump(category_list, json_file, ensure_ascii=False, indent=4)
+        storage.write_json_atomic("categories.json", category_list, indent=4)
     except FileNotFoundError:
         print("Sorry, the data file could not be found.")
 
@@ -170,44 +259,64 @@ def getUserHistory(chat_id):
         return data["data"]
     return None
 
+def getUserExpense(chat_id, expense_id):
+    """
+    getUserExpense(chat_id, expense_id): Returns the user's expense with the id expense_id (see
+    records.Expense.id), or None when the id is malformed or the user has no such expense.
+    """
+    try:
+        uid = records.parse_id(expense_id)
+    except (TypeError, ValueError):
+        return None
+    return getStorage().get_expense(chat_id, uid)
+
+def queryUserHistory(chat_id, start=None, end=None, categories=None, min_amount=None, max_amount=None):
+    """
+    queryUserHistory(chat_id, start, end, categories, min_amount, max_amount): Returns an iterator
+    over the user's expenses from date start to date end (both included), in the given categories
+    and with an amount between min_amount and max_amount dollars, ordered by date. Criteria left
+    at None do not filter.
+    """
+    return getStorage().query(chat_id, start, end, categories, min_amount, max_amount)
+
 def getUserHistoryByCategory(chat_id, category):
-    data = getUserHistory(chat_id)
-    previous_expenses = []
-    for record in data:
-        if f",{category}," in record:
-            previous_expenses.append(record)
-    return previous_expenses
+    return list(queryUserHistory(chat_id, categories=[category]))
 
 def getUserHistoryByDate(chat_id, date):
-    data = getUserHistory(chat_id)
-    previous_expenses = []
-    for record in data:
-        if f"{date}," in record:
-            previous_expenses.append(record)
-    return previous_expenses
+    """
+    getUserHistoryByDate(chat_id, date): Returns the user's expenses of a day given in dateFormat
+    (28-Oct-2021) or of a month given in monthFormat (Oct-2021), or an empty list when date is in
+    neither format.
+    """
+    try:
+        start = end = records.parse_date(date)
+    except ValueError:
+        try:
+            month = datetime.strptime(date, monthFormat)
+        except ValueError:
+            return []
+        start, end = timeline.month_range(month.year, month.month)
+    return list(queryUserHistory(chat_id, start=start, end=end))
 
 def getUserHistoryDateExpense(chat_id):
-    data = getUserHistory(chat_id)
-    cat_spend_dict = {}
-    for record in data:
-        split_vals = record.split(",")
-        cat_spend_dict[split_vals[0]] = split_vals[2]
-    return cat_spend_dict
+    """
+    getUserHistoryDateExpense(chat_id): Returns the user's total spending per day, in dollars,
+    keyed by date string in date order.
+    """
+    spend_by_day = {}
+    for record in queryUserHistory(chat_id):
+        spend_by_day[record.date_str] = spend_by_day.get(record.date_str, 0) + record.cents
+    return {day: cents / 100 for day, cents in spend_by_day.items()}
 
 def getUserData(chat_id):
-    user_list = read_json()
-    if user_list is None:
-        return None
-    if str(chat_id) in user_list:
-        return user_list[str(chat_id)]
-    return None
+    return getStorage().get_user(chat_id)
 
 def throw_exception(e, message, bot, logging):
     logging.exception(str(e))
     bot.reply_to(message, "Oh no! " + str(e))
 
 def createNewUserRecord():
-    return data_format
+    return storage.new_user_record()
 
 def getOverallBudget(chatId):
     data = getUserData(chatId)
@@ -281,81 +390,84 @@ def display_remaining_overall_budget(message, bot):
         )
     bot.send_message(chat_id, msg)
 
+def getCurrentMonthSpending(chat_id, cat=None):
+    """
+    getCurrentMonthSpending(chat_id, cat): Returns the amount the user spent this month, overall
+    or on category cat, read from the user's running totals instead of rescanning the history.
+    """
+    today = datetime.now().today()
+    user_totals = getUserTotals(chat_id)
+    if cat is None:
+        return user_totals.month_total(today.year, today.month) / 100
+    return user_totals.category_total(today.year, today.month, cat) / 100
+
 def calculateRemainingOverallBudget(chat_id):
     budget = getOverallBudget(chat_id)
-    history = getUserHistory(chat_id)
-    query = datetime.now().today().strftime(getMonthFormat())
-    queryResult = [value for _, value in enumerate(history) if str(query) in value]
     if budget == None:
-        return -calculate_total_spendings(queryResult)
-    return float(budget) - calculate_total_spendings(queryResult)
+        return -getCurrentMonthSpending(chat_id)
+    return float(budget) - getCurrentMonthSpending(chat_id)
 
 def calculate_total_spendings(queryResult):
-    total = 0
-    for row in queryResult:
-        s = row.split(",")
-        total = total + float(s[2])
-    return total
+    # imported here so that loading helper at startup does not load numpy
+    import aggregate
+    return aggregate.ExpenseTable.from_history(queryResult).total() / 100
 
 
 def calculateRemainingCategoryBudget(chat_id, cat):
     budget = getCategoryBudgetByCategory(chat_id, cat)
-    history = getUserHistory(chat_id)
-    query = datetime.now().today().strftime(getMonthFormat())
-    queryResult = [value for _, value in enumerate(history) if str(query) in value]
-    return float(budget) - calculate_total_spendings_for_category(queryResult, cat)
+    return float(budget) - getCurrentMonthSpending(chat_id, cat)
 
 def calculateRemainingCategoryBudgetPercent(chat_id, cat):
     budget = getCategoryBudgetByCategory(chat_id, cat)
-    history = getUserHistory(chat_id)
-    query = datetime.now().today().strftime(getMonthFormat())
-    queryResult = [value for _, value in enumerate(history) if str(query) in value]
     if budget == '0':
         print("budget is zero")
         return None
-    return (calculate_total_spendings_for_category(queryResult, cat)/float(budget))*100
+    return (getCurrentMonthSpending(chat_id, cat)/float(budget))*100
 
 def calculate_total_spendings_for_category(queryResult, cat):
-    total = 0
-    for row in queryResult:
-        s = row.split(",")
-        if cat == s[1]:
-            total = total + float(s[2])
-    return total
+    import aggregate
+    return aggregate.ExpenseTable.from_history(queryResult).for_category(cat).total() / 100
 
 def calculate_total_spendings_for_category_chat_id(chat_id, cat):
-    history = getUserHistory(chat_id)
-    query = datetime.now().today().strftime(getMonthFormat())
-    print(query)
-    queryResult = [value for _, value in enumerate(history) if str(query) in value]
-    return calculate_total_spendings_for_category(queryResult, cat)
+    return getCurrentMonthSpending(chat_id, cat)
 
 def updateBudgetCategory(chatId, category):
-    user_list = read_json()
-    user_list[str(chatId)]["budget"]["category"][category] = str(0)
-    write_json(user_list)
+    # a copy: the cached user record may be written out by the background flush at any time
+    budget = copy.deepcopy(getUserData(chatId)["budget"])
+    budget["category"][category] = str(0)
+    updateUserBudget(chatId, budget)
 
 def deleteBudgetCategory(chatId, category):
-    user_list = read_json()
-    user_list[str(chatId)]["budget"]["category"].pop(category, None)
-    write_json(user_list)
+    budget = copy.deepcopy(getUserData(chatId)["budget"])
+    budget["category"].pop(category, None)
+    updateUserBudget(chatId, budget)
 
 def getAvailableCategories(history):
     available_categories = set()
     for record in history:
-        available_categories.add(record.split(',')[1])
+        available_categories.add(record.category)
     return available_categories
 
+def groupByCategory(history):
+    """
+    groupByCategory(history): Parses every record of history once and buckets it by its exact
+    category in a single pass. Returns {category: [expenses]} in order of first appearance.
+    """
+    grouped = {}
+    for record in map(records.parse, history or []):
+        bucket = grouped.get(record.category)
+        if bucket is None:
+            bucket = grouped[record.category] = []
+        bucket.append(record)
+    return grouped
+
 def getCategoryWiseSpendings(available_categories, history):
-    category_wise_history = {}
-    for cat in available_categories:
-        for record in history:
-            if cat in record:
-                if cat in category_wise_history.keys():
-                    category_wise_history[cat].append(record)
-                else:
-                    category_wise_history[cat] = [record]
-    return category_wise_history
+    """
+    getCategoryWiseSpendings(available_categories, history): Returns {category: [expenses]} for
+    the categories in available_categories that have expenses in history.
+    """
+    grouped = groupByCategory(history)
+    return {cat: grouped[cat] for cat in available_categories if cat in grouped}
 
 def getFormattedPredictions(category_predictions):
     category_budgets = ""
@@ -26,42 +26,95 @@ SOFTWARE.
 """
 
 import helper
+import timeline
 import logging
 from tabulate import tabulate
+from telebot import types
 from datetime import datetime
 
+# number of expenses shown on one page of /history
+PAGE_SIZE = 10
+
 # === Documentation of history.py ===
 
 def run(message, bot):
     """
-    run(message, bot): This is the main function used to implement the delete feature.
+    run(message, bot): This is the main function used to implement the history feature.
     It takes 2 arguments for processing - message which is the message from the user, and bot which
     is the telegram bot object from the main code.py function. It calls helper.py to get the user's
     historical data and based on whether there is data available, it either prints an error message or
-    displays the user's historical data.
+    displays the first page of the user's historical data, newest expenses first.
     """
     try:
-        helper.read_json()
         chat_id = message.chat.id
         user_history = helper.getUserHistory(chat_id)
-        table = [["Date", "Category", "Amount"]]
         if user_history is None:
             raise Exception("Sorry! No spending records found!")
         if len(user_history) == 0:
             raise Exception("Sorry! No spending records found!")
         else:
-            for rec in user_history:
-                values = rec.split(',')
-                # Store each value in separate variables
-                date, category, amount = values
-
-                date_time = datetime.strptime(date, '%d-%b-%Y')
-                current_date = datetime.now()
-
-                if(date_time <= current_date):
-                    table.append([date, category, "$ " + amount])
-            spend_total_str="<pre>"+ tabulate(table, headers='firstrow')+"</pre>"
-            bot.send_message(chat_id, spend_total_str, parse_mode="HTML")
+            until = datetime.now().toordinal()
+            text, markup = show_page(user_history, until, 0)
+            bot.send_message(chat_id, text, parse_mode="HTML", reply_markup=markup)
+    except Exception as e:
+        logging.exception(str(e))
+        bot.reply_to(message, "Oops! " + str(e))
+
+
+def callback(call, bot):
+    """
+    callback(call, bot): Handles the "history:<until>:<page>" callback data of the Newer/Older
+    buttons by replacing the message with the requested page. until is the last day shown when
+    /history was run, so the pages stay the same while the user browses them.
+    """
+    try:
+        chat_id = call.message.chat.id
+        _, until, page = call.data.split(":")
+        text, markup = show_page(helper.getUserHistory(chat_id) or [], int(until), int(page))
+        bot.edit_message_text(text, chat_id, call.message.message_id, parse_mode="HTML", reply_markup=markup)
+        bot.answer_callback_query(call.id)
     except Exception as e:
         logging.exception(str(e))
-        bot.reply_to(message, "Oops! " + str(e))
\ No newline at end of file
+        bot.answer_callback_query(call.id, "Oops! " + str(e))
+
+
+def count_pages(history, until):
+    """
+    count_pages(history, until): Returns the number of pages of the expenses up to day until.
+    """
+    _, high = timeline.span(history, end=until)
+    return max(1, -(-high // PAGE_SIZE))
+
+
+def show_page(history, until, page):
+    """
+    show_page(history, until, page): Returns the text and the inline keyboard of page page
+    (0 is the newest) of the expenses up to day until. Only the rows on the page are formatted.
+    """
+    pages = count_pages(history, until)
+    page = min(max(page, 0), pages - 1)
+    table = [["Date", "Category", "Amount"]]
+    rows = timeline.newest_first(history, until, page * PAGE_SIZE)
+    for _, rec in zip(range(PAGE_SIZE), rows):
+        table.append([rec.date_str, rec.category, "$ " + rec.amount_str])
+    if len(table) == 1:
+        raise Exception("Sorry! No spending records found!")
+    text = "<pre>" + tabulate(table, headers="firstrow") + "</pre>\nPage {} of {}".format(page + 1, pages)
+    return text, page_buttons(until, page, pages)
+
+
+def page_buttons(until, page, pages):
+    """
+    page_buttons(until, page, pages): Returns the Newer/Older buttons of a page, or None when
+    everything fits on one page.
+    """
+    buttons = []
+    if page > 0:
+        buttons.append(types.InlineKeyboardButton("< Newer", callback_data="history:{}:{}".format(until, page - 1)))
+    if page < pages - 1:
+        buttons.append(types.InlineKeyboardButton("Older >", callback_data="history:{}:{}".format(until, page + 1)))
+    if not buttons:
+        return None
+    markup = types.InlineKeyboardMarkup()
+    markup.row(*buttons)
+    return markup
@@ -26,6 +26,8 @@ SOFTWARE.
 """
 
 import helper
+import graphing
+import render
 import matplotlib
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -37,7 +39,6 @@ def run(message, bot):
     Displays Monthly user expenditure bar chart with and without category wise grouping.
     :return: None (Sends image to bot)
     """
-    helper.read_json()
     chat_id = message.chat.id
     user_history = helper.getUserHistory(chat_id)
     if user_history == None:
@@ -46,12 +47,11 @@ def run(message, bot):
         )
     else:
         try:
-            charts = create_chart_for_monthly_analysis(user_history, chat_id)
+            charts = render.chart(create_chart_for_monthly_analysis, user_history, chat_id, chat_id=chat_id)
             for chart in charts:
-                with open(chart, "rb") as f:
-                    bot.send_photo(chat_id, f)
+                bot.send_photo(chat_id, chart)
         except Exception as e:
-            print("Exception occurred : " + e)
+            print("Exception occurred : " + str(e))
             bot.reply_to(message, "Oops! Could not create monthly analysis chart")
 
 def create_chart_for_monthly_analysis(user_history, userid):
@@ -59,19 +59,19 @@ def create_chart_for_monthly_analysis(user_history, userid):
     Generates line charts for monthly expense analysis and category-wise analysis.
 
     Parameters:
-    - user_history (list): List of strings representing user expense history.
-    - userid (str): User identifier for creating unique filenames.
+    - user_history (list): List of records.Expense representing user expense history.
+    - userid (str): User identifier of the charts.
 
     Returns:
-    - result (list): List containing filenames of the generated charts.
+    - result (list): List containing the generated charts as in-memory PNG buffers.
 
     This function processes the user's expense history, creates line charts for total expenses over time
-    and category-wise expenses over time, and saves the charts as image files. The filenames are based on the
-    provided userid, and the function returns a list of filenames.
+    and category-wise expenses over time, and returns them as PNG buffers that can be sent to the user
+    directly, without going through the disk.
     """
     result = []
 
-    user_history_split = [item.split(',') for item in user_history]
+    user_history_split = [(item.date, item.category, item.amount) for item in user_history]
     df = pd.DataFrame(user_history_split, columns=["Date", "Category", "Cost"])
 
     # Convert 'Cost' column to numeric
@@ -95,9 +95,7 @@ def create_chart_for_monthly_analysis(user_history, userid):
     plt.ylabel('Total Cost')
     plt.title('Total Cost Over Time')
     plt.grid(True)
-    fig_name = "data/{}_monthly_analysis.png".format(userid)
-    plt.savefig(fig_name, bbox_inches="tight")
-    result.append(fig_name)
+    result.append(graphing.to_png(bbox_inches="tight"))
 
     # Group by year, month, and category, calculate the total cost for each group
     grouped_data = df.groupby(['Year', 'Month', 'Category']).agg({'Cost': 'sum'}).reset_index()
@@ -115,8 +113,6 @@ def create_chart_for_monthly_analysis(user_history, userid):
     plt.title('Total Cost Over Time by Category')
     plt.legend()
     plt.grid(True)
-    fig_name = "data/{}_monthly_analysis_by_category.png".format(userid)
-    plt.savefig(fig_name, bbox_inches="tight")
-    result.append(fig_name)
+    result.append(graphing.to_png(bbox_inches="tight"))
 
     return result
\ No newline at end of file
@@ -25,10 +25,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import functools
 import requests
-from jproperties import Properties
+from outbox import BULK
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
-configs = Properties()
+# Bot API endpoint, formatted with the token and the method name; code.py points it at api_url
+API_URL = "https://api.telegram.org/bot{0}/{1}"
 
 class TelegramNotifier:
     """
@@ -37,76 +41,106 @@ class TelegramNotifier:
     Attributes:
     - token (str): The API token for the Telegram bot.
     - parse_mode (str, optional): The parse mode for the message (e.g., "Markdown").
-    - chat_id (str): The chat ID where messages will be sent.
+    - chat_id (str): The default chat ID where messages will be sent.
 
     Methods:
-    - _get_chat_id(): Private method to retrieve the chat ID if not provided.
-    - send(msg: str): Sends a message to the specified chat ID using the Telegram Bot API.
+    - send(msg: str, chat_id: str): Sends a message using the Telegram Bot API.
+    - send_many(messages): Sends a batch of (chat_id, msg) pairs over the pooled connections.
+    - close(): Closes the pooled connections.
+
+    A notifier is meant to live as long as the bot: every message goes through one requests.Session,
+    so the TCP and TLS connections to the Bot API are kept alive and reused instead of being set up
+    for every message. Given an outbox.Outbox, the messages are queued in its bulk lane, behind the
+    bot's interactive replies and within Telegram's send limits.
     """
-    def __init__(self, token: str, parse_mode: str = None, chat_id: str = None):
+    def __init__(self, token: str, parse_mode: str = None, chat_id: str = None, pool_size: int = 4, outbox=None):
         """
         Initializes a TelegramNotifier object.
 
         Parameters:
         - token (str): The API token for the Telegram bot.
         - parse_mode (str, optional): The parse mode for the message (e.g., "Markdown").
-        - chat_id (str, optional): The chat ID where messages will be sent. If not provided, it will be retrieved.
+        - chat_id (str, optional): The chat ID used when send is not given one.
+        - pool_size (int, optional): The number of connections kept open, which is also the number
+          of messages of a batch sent at the same time.
+        - outbox (outbox.Outbox, optional): The queue the messages are sent through.
 
         This constructor sets the initial values for the TelegramNotifier object.
         """
         self._token = token
         self._parse_mode = parse_mode
-        if chat_id is None:
-            self._get_chat_id()
-        else:
-            self._chat_id = chat_id
-
-    def _get_chat_id(self):
+        self._chat_id = chat_id
+        self._pool_size = pool_size
+        self._outbox = outbox
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def send(self, msg: str, chat_id: str = None):
         """
-        Retrieves the chat ID from the latest update using the Telegram Bot API.
+        Sends a message to a chat using the Telegram Bot API.
+
+        Parameters:
+        - msg (str): The message to be sent.
+        - chat_id (str, optional): The chat to send it to, the notifier's chat_id by default.
 
-        This method sends a request to the Telegram Bot API to get the latest chat ID
-        from the updates and sets the obtained chat ID for the object.
+        Returns True when Telegram accepted the message. Failures are printed, not raised.
         """
+        chat_id = self._chat_id if chat_id is None else chat_id
+        if chat_id is None:
+            print("chat_id is none, nothing sent!")
+            return False
         try:
-            data = {"offset": 0}
-            response = requests.get(
-                f"https://api.telegram.org/bot{self._token}/getUpdates",
-                data=data,
-                timeout=10,
+            post = self._post(msg, chat_id)
+            return self._accepted(post() if self._outbox is None else self._outbox.send(chat_id, post, BULK))
+        except Exception as e:
+            print(f"Failed to send notification:\n\texception:\n\t{e}")
+            return False
+
+    def _post(self, msg, chat_id):
+        data = {"chat_id": chat_id, "text": msg}
+        if self._parse_mode:
+            data["parse_mode"] = self._parse_mode
+        return functools.partial(self._session.post, API_URL.format(self._token, "sendMessage"), data=data, timeout=10)
+
+    def _accepted(self, response):
+        if response.status_code != 200 or response.json()["ok"] is not True:
+            print(
+                f"Failed to send notification:\n\tstatus_code={response.status_code}\n\tjson:\n\t{response.json()}"
             )
-            if response.status_code == 200:
-                self._chat_id = response.json()["result"][-1]["message"]["chat"]["id"]
+            return False
+        return True
+
+    def _result(self, future):
+        try:
+            return self._accepted(future.result())
         except Exception as e:
-            self._chat_id = None
-            print("Couldn't get chat_id!\n\t", e)
+            print(f"Failed to send notification:\n\texception:\n\t{e}")
+            return False
 
-    def send(self, msg: str):
+    def send_many(self, messages):
         """
-        Sends a message to the specified chat ID using the Telegram Bot API.
+        Sends a batch of messages, up to pool_size of them at the same time, each on one of the
+        kept-alive connections. With an outbox the whole batch is queued at once and its workers
+        send it as fast as the send limits allow.
 
         Parameters:
-        - msg (str): The message to be sent.
+        - messages (iterable): (chat_id, msg) pairs.
 
-        This method sends a message to the specified chat ID using the Telegram Bot API.
-        If the chat ID is not available, it retrieves the chat ID before sending the message.
+        Returns the list of send results, in the order of messages.
         """
-        if self._chat_id is None:
-            self._get_chat_id()
-            print("chat_id is none, nothing sent!")
-            return
-        data = {"chat_id": self._chat_id, "text": msg}
-        if self._parse_mode:
-            data["parse_mode"] = self._parse_mode
-        try:
-            response = requests.get(
-                f"https://api.telegram.org/bot{self._token}/sendMessage",
-                data=data,
-                timeout=10,
-            )
-            if response.status_code != 200 or response.json()["ok"] is not True:
-                print(
-                    f"Failed to send notification:\n\tstatus_code={response.status_code}\n\tjson:\n\t{response.json()}"
-                )
-        except Exception as e:
-            print(f"Failed to send notification:\n\texception:\n\t{e}")
\ No newline at end of file
+        messages = list(messages)
+        if self._outbox is not None and all(chat_id is not None for chat_id, _ in messages):
+            futures = [self._outbox.submit(chat_id, self._post(msg, chat_id), BULK) for chat_id, msg in messages]
+            return [self._result(future) for future in futures]
+        if len(messages) <= 1 or self._pool_size <= 1:
+            return [self.send(msg, chat_id) for chat_id, msg in messages]
+        with ThreadPoolExecutor(max_workers=min(self._pool_size, len(messages)), thread_name_prefix="notify") as pool:
+            return list(pool.map(lambda message: self.send(message[1], message[0]), messages))
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+        self._session.close()
@@ -25,10 +25,40 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from jproperties import Properties
+import config
+import outbox
+import threading
 from notifier import TelegramNotifier
 
-configs = Properties()
+_notifier = None
+_lock = threading.Lock()
+
+# === Documentation of notify.py ===
+
+def get_notifier():
+    """
+    get_notifier(): Returns the notifier shared by every notification, creating it on first use
+    with the api_token from user.properties. Its connections to the Bot API are kept alive
+    between notifications, and its messages go through the bulk lane of the bot's outbox when
+    one is configured.
+    """
+    global _notifier
+    with _lock:
+        if _notifier is None:
+            _notifier = TelegramNotifier(
+                str(config.get("api_token")),
+                parse_mode="HTML",
+                pool_size=int(config.get("send_workers", "16")),
+                outbox=outbox.get(),
+            )
+        return _notifier
+
+def budget_message(cat, amount):
+    """
+    budget_message(cat, amount): Returns the text of the notification that the budget for
+    category cat was exceeded by amount dollars.
+    """
+    return "<b>Budget for " + cat + " exceeded by $" + amount + " !!!!</b>"
 
 def notify(chat_id, cat, amount):
     """
@@ -39,16 +69,25 @@ def notify(chat_id, cat, amount):
     - cat (str): The category for which the budget exceeded.
     - amount (str): The amount by which the budget exceeded.
 
-    This function reads the Telegram API token from a configuration file,
-    creates a TelegramNotifier object, and sends a notification to the specified
-    chat ID about the budget exceeding for the given category and amount.
+    The message goes through the shared notifier of get_notifier().
+    """
+    return get_notifier().send(budget_message(cat, amount), chat_id)
+
+def notify_many(notifications):
     """
+    notify_many(notifications): Sends a batch of budget notifications, given as (chat_id, cat, amount)
+    triples, over the shared notifier's pooled connections. Returns the send results in order.
+    """
+    return get_notifier().send_many(
+        (chat_id, budget_message(cat, amount)) for chat_id, cat, amount in notifications
+    )
 
-    print("inside notify")
-    with open("user.properties", "rb") as read_prop:
-        configs.load(read_prop)
-    token = str(configs.get("api_token").data)
-    print(token)
-    notifier = TelegramNotifier(token, parse_mode="HTML", chat_id=chat_id)
-    msg = "<b>Budget for " + cat + " exceeded by $" + amount + " !!!!</b>"
-    notifier.send(msg)
\ No newline at end of file
+def close():
+    """
+    close(): Closes the shared notifier's connections, if it was ever created.
+    """
+    global _notifier
+    with _lock:
+        if _notifier is not None:
+            _notifier.close()
+            _notifier = None
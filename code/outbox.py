@@ -0,0 +1,391 @@
+"""
+File: outbox.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+
+# priority lanes: a worker always takes a sendable interactive reply before any bulk message
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+# Bot API methods that put something in a chat; only these count against the send limits
+LIMITED_METHODS = frozenset({
+    "sendMessage", "sendPhoto", "sendDocument", "sendAudio", "sendVideo", "sendAnimation", "sendVoice",
+    "sendSticker", "sendMediaGroup", "sendLocation", "sendContact", "sendPoll", "forwardMessage",
+    "copyMessage", "editMessageText", "editMessageCaption", "editMessageMedia", "editMessageReplyMarkup",
+})
+
+# number of recent sends per lane the latency percentiles of stats() are computed over
+LATENCY_SAMPLES = 1024
+
+# seconds between two sweeps of the buckets of chats that went quiet
+PRUNE_INTERVAL = 60
+
+_outbox = None
+_local = threading.local()
+
+# === Documentation of outbox.py ===
+
+def retry_after(response):
+    """
+    retry_after(response): Returns the seconds Telegram asked to wait when response is a
+    429 Too Many Requests, or None for any other response.
+    """
+    if getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except (ValueError, TypeError):
+            return 1.0
+
+
+def percentiles(samples):
+    """
+    percentiles(samples): Returns the p50, p95 and maximum of a list of latencies in seconds,
+    all None when there are none.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None}
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": ordered[-1]}
+
+
+class TokenBucket:
+    """
+    Lets through rate events per second on average, and up to burst of them at once after a
+    quiet spell. A rate of 0 turns the limit off.
+    """
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = now
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def delay(self, now):
+        """
+        delay(now): Returns the seconds until an event may pass, 0 when one may pass now.
+        """
+        if self.rate <= 0:
+            return 0
+        self._refill(now)
+        return 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self, now):
+        """
+        take(now): Counts an event, which delay(now) must have let through.
+        """
+        if self.rate > 0:
+            self._refill(now)
+            self._tokens -= 1
+
+    def idle(self, now):
+        """
+        idle(now): Returns True when the bucket is full again, so it can be forgotten and
+        recreated later without changing what it lets through.
+        """
+        if self.rate <= 0:
+            return True
+        self._refill(now)
+        return self._tokens >= self.burst
+
+
+class _Message:
+    __slots__ = ("chat_id", "send", "lane", "future", "queued_at", "attempts")
+
+    def __init__(self, chat_id, send, lane):
+        self.chat_id = chat_id
+        self.send = send
+        self.lane = lane
+        self.future = Future()
+        self.queued_at = time.monotonic()
+        self.attempts = 0
+
+
+class Outbox:
+    """
+    Sends messages to Telegram from a pool of worker threads while staying within its limits:
+    a global token bucket (rate messages per second, burst at once) and one bucket per chat
+    (chat_rate and chat_burst). A message is a callable that makes the Bot API request and returns
+    its requests.Response. The messages of a chat are sent one at a time and in order, interactive
+    replies before bulk notifications. When Telegram still answers 429 Too Many Requests, the chat
+    is paused for the retry_after it asked for and the message is sent again, up to max_retries
+    times.
+    """
+
+    def __init__(self, rate=30, burst=30, chat_rate=1, chat_burst=5, workers=16, max_retries=3):
+        now = time.monotonic()
+        self._bucket = TokenBucket(rate, burst, now)
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._max_retries = max_retries
+        self._buckets = {}
+        self._paused = {}
+        self._sending = set()
+        self._lanes = {lane: deque() for lane in LANES}
+        self._counts = {lane: {"sent": 0, "retried": 0, "failed": 0} for lane in LANES}
+        self._latencies = {lane: deque(maxlen=LATENCY_SAMPLES) for lane in LANES}
+        self._pruned = now
+        self._closed = False
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, name="outbox-{}".format(i), daemon=True) for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, chat_id, send, lane=INTERACTIVE):
+        """
+        submit(chat_id, send, lane): Queues send() for chat_id in lane and returns a Future of the
+        response.
+        """
+        message = _Message(str(chat_id), send, lane)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("outbox is closed")
+            self._lanes[lane].append(message)
+            self._cond.notify()
+        return message.future
+
+    def send(self, chat_id, send, lane=INTERACTIVE):
+        """
+        send(chat_id, send, lane): Queues send() like submit and waits for its response.
+        """
+        return self.submit(chat_id, send, lane).result()
+
+    def _chat_bucket(self, chat_id, now):
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(self._chat_rate, self._chat_burst, now)
+        return bucket
+
+    def _prune(self, now):
+        self._buckets = {
+            chat_id: bucket for chat_id, bucket in self._buckets.items()
+            if chat_id in self._sending or not bucket.idle(now)
+        }
+        self._paused = {chat_id: until for chat_id, until in self._paused.items() if until > now}
+        self._pruned = now
+
+    def _next(self):
+        # returns the message to send now, or None and the seconds to wait (None: until notified)
+        now = time.monotonic()
+        if now - self._pruned > PRUNE_INTERVAL:
+            self._prune(now)
+        if not any(self._lanes.values()):
+            return None, None
+        wait = self._bucket.delay(now)
+        if wait > 0:
+            return None, wait
+        wait = None
+        blocked = set(self._sending)
+        for lane in LANES:
+            queue = self._lanes[lane]
+            for index, message in enumerate(queue):
+                chat_id = message.chat_id
+                if chat_id in blocked:
+                    continue
+                bucket = self._chat_bucket(chat_id, now)
+                delay = max(bucket.delay(now), self._paused.get(chat_id, now) - now)
+                if delay <= 0:
+                    del queue[index]
+                    self._bucket.take(now)
+                    bucket.take(now)
+                    self._sending.add(chat_id)
+                    return message, None
+                # later messages of this chat have to wait behind this one
+                blocked.add(chat_id)
+                wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    def _work(self):
+        while True:
+            with self._cond:
+                message, wait = self._next()
+                while message is None:
+                    if self._closed and not any(self._lanes.values()):
+                        return
+                    self._cond.wait(wait)
+                    message, wait = self._next()
+            self._deliver(message)
+
+    def _deliver(self, message):
+        try:
+            response = message.send()
+        except Exception as e:
+            self._finish(message, error=e)
+            return
+        delay = retry_after(response)
+        if delay is not None and message.attempts < self._max_retries:
+            message.attempts += 1
+            logging.warning("Telegram asked to wait %s seconds before sending to chat %s", delay, message.chat_id)
+            with self._cond:
+                self._paused[message.chat_id] = time.monotonic() + delay
+                self._lanes[message.lane].appendleft(message)
+                self._sending.discard(message.chat_id)
+                self._counts[message.lane]["retried"] += 1
+                self._cond.notify_all()
+            return
+        # a response that is still a 429 is handed back for the caller to report
+        self._finish(message, response=response, failed=delay is not None)
+
+    def _finish(self, message, response=None, error=None, failed=False):
+        latency = time.monotonic() - message.queued_at
+        with self._cond:
+            self._sending.discard(message.chat_id)
+            self._counts[message.lane]["failed" if failed or error is not None else "sent"] += 1
+            self._latencies[message.lane].append(latency)
+            self._cond.notify_all()
+        if error is None:
+            message.future.set_result(response)
+        else:
+            message.future.set_exception(error)
+
+    def stats(self):
+        """
+        stats(): Returns for every lane the messages queued right now, the messages sent, retried
+        after a 429 and failed so far, and the p50, p95 and maximum seconds from submit to
+        Telegram's answer over the last LATENCY_SAMPLES messages.
+        """
+        with self._cond:
+            return {
+                lane: dict(
+                    self._counts[lane],
+                    queued=len(self._lanes[lane]),
+                    latency=percentiles(self._latencies[lane]),
+                )
+                for lane in LANES
+            }
+
+    def close(self, wait=True):
+        """
+        close(wait): Stops the workers; with wait=True they first send every queued message,
+        otherwise the queued messages fail with RuntimeError.
+        """
+        with self._cond:
+            self._closed = True
+            if not wait:
+                for queue in self._lanes.values():
+                    while queue:
+                        queue.popleft().future.set_exception(RuntimeError("outbox is closed"))
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+
+def configure(rate=30, burst=30, chat_rate=1, chat_burst=5, workers=16, max_retries=3):
+    """
+    configure(rate, burst, chat_rate, chat_burst, workers, max_retries): Replaces the outbox the
+    bot's messages and the notifications go through, and returns it.
+    """
+    global _outbox
+    close()
+    _outbox = Outbox(rate, burst, chat_rate, chat_burst, workers, max_retries)
+    return _outbox
+
+
+def get():
+    """
+    get(): Returns the configured outbox, or None when messages are sent directly.
+    """
+    return _outbox
+
+
+def close():
+    """
+    close(): Sends what is still queued and stops the configured outbox, if there is one.
+    """
+    global _outbox
+    if _outbox is not None:
+        _outbox.close()
+        _outbox = None
+
+
+@contextmanager
+def lane(name):
+    """
+    lane(name): Within the with block, the messages the bot sends from this thread go to lane
+    name, for example BULK for a batch of reminders sent from a handler.
+    """
+    previous = getattr(_local, "lane", INTERACTIVE)
+    _local.lane = name
+    try:
+        yield
+    finally:
+        _local.lane = previous
+
+
+def _rewind(files):
+    # a retried upload has to read its files again from the start
+    for value in (files or {}).values():
+        if isinstance(value, tuple):
+            value = value[1]
+        if getattr(value, "seekable", lambda: False)():
+            value.seek(0)
+
+
+def request_sender(pool_size=16):
+    """
+    request_sender(pool_size): Returns a function for telebot.apihelper.CUSTOM_REQUEST_SENDER that
+    makes the bot's Bot API requests over one requests.Session keeping up to pool_size connections
+    alive. Requests of LIMITED_METHODS that name a chat go through the configured outbox, in the
+    lane chosen with lane() (interactive by default), and the calling thread waits for the answer,
+    so handlers still get the sent message back. Every other request, getUpdates included, is made
+    right away.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    def send_request(method, url, params=None, files=None, **kwargs):
+        def request():
+            _rewind(files)
+            return session.request(method, url, params=params, files=files, **kwargs)
+
+        outbox = _outbox
+        chat_id = (params or {}).get("chat_id")
+        if outbox is None or chat_id is None or url.rsplit("/", 1)[-1] not in LIMITED_METHODS:
+            return request()
+        return outbox.send(chat_id, request, getattr(_local, "lane", INTERACTIVE))
+
+    return send_request
@@ -30,7 +30,9 @@ import logging
 from matplotlib import pyplot as plt
 from fpdf import FPDF
 import graphing
+import render
 import os
+import tempfile
 
 # === Documentation of pdf.py ===
 
@@ -39,42 +41,12 @@ def run(message, bot):
     run(message, bot): This is the main function used to implement the pdf save feature.
     """
     try:
-        helper.read_json()
         chat_id = message.chat.id
         user_history = helper.getUserHistory(chat_id)
         msg = "Alright. Creating a pdf of your expense history!"
         bot.send_message(chat_id, msg)
-        fig = plt.figure()
-        ax = fig.add_subplot(1, 1, 1)
-        top = 0.8
-        if len(user_history) == 0:
-            plt.text(
-                0.1,
-                top,
-                "No record found!",
-                horizontalalignment="left",
-                verticalalignment="center",
-                transform=ax.transAxes,
-                fontsize=20,
-            )
-        for rec in user_history:
-            date, category, amount = rec.split(",")
-            print(date, category, amount)
-            rec_str = f"{amount}$ {category} expense on {date}"
-            plt.text(
-                0,
-                top,
-                rec_str,
-                horizontalalignment="left",
-                verticalalignment="center",
-                transform=ax.transAxes,
-                fontsize=14,
-                bbox=dict(facecolor="red", alpha=0.3),
-            )
-            top -= 0.15
-        plt.axis("off")
-        plt.savefig("expense_history.png")
-        plt.close()
+        charts = {}
+        charts["expense_history"] = render.chart(create_history_chart, user_history, chat_id=chat_id)
 
         if helper.isOverallBudgetAvailable(chat_id) and helper.isCategoryBudgetByCategoryNotZero(chat_id):
             if helper.isCategoryBudgetAvailable(chat_id):
@@ -83,7 +55,7 @@ def run(message, bot):
                 for cat in categories:
                     if helper.isCategoryBudgetByCategoryAvailable(chat_id, cat):
                         category_budget[cat] = helper.getCategoryBudgetByCategory(chat_id, cat)
-                graphing.overall_split(category_budget)
+                charts["overall_split"] = render.chart(graphing.overall_split, category_budget, chat_id=chat_id)
 
             category_spend = {}
             categories = helper.getSpendCategories()
@@ -92,7 +64,7 @@ def run(message, bot):
                 if spend != 0:
                     category_spend[cat] = spend
             if category_spend != {}:
-                graphing.spend_wise_split(category_spend)
+                charts["spend_wise"] = render.chart(graphing.spend_wise_split, category_spend, chat_id=chat_id)
 
             if helper.isCategoryBudgetAvailable(chat_id):
                 category_spend_percent = {}
@@ -101,30 +73,80 @@ def run(message, bot):
                     if helper.isCategoryBudgetByCategoryAvailable(chat_id, cat):
                         percent = helper.calculateRemainingCategoryBudgetPercent(chat_id, cat)
                         category_spend_percent[cat] = percent
-                graphing.remaining(category_spend_percent)
+                charts["remaining"] = render.chart(graphing.remaining, category_spend_percent, chat_id=chat_id)
 
             if helper.getUserHistory(chat_id):
                 cat_spend_dict = helper.getUserHistoryDateExpense(chat_id)
-                graphing.time_series(cat_spend_dict)
+                charts["time_series"] = render.chart(graphing.time_series, cat_spend_dict, chat_id=chat_id)
             
-            list_of_images = ["overall_split.png","remaining.png","time_series.png"]
-            pdf = FPDF()
-            pdf.add_page()
-            x_coord = 20
-            y_coord = 30
-            for image in list_of_images:
-                pdf.image(image,x=x_coord,y=y_coord,w=70,h=50)
-                x_coord += 80
-                if x_coord > 100:
-                    x_coord = 20
-                    y_coord += 60
-            pdf.output("expense_report.pdf", "F")
-            bot.send_document(chat_id, open("expense_report.pdf", "rb"))
-            for image in list_of_images:
-                os.remove(image)
+            list_of_images = ["overall_split","remaining","time_series"]
+            images = [(name, charts[name].getvalue()) for name in list_of_images if name in charts]
+            # laying out the PDF is CPU work too, so it runs in the chart workers as well
+            report = render.chart(create_report, images)
+            bot.send_document(chat_id, report, visible_file_name="expense_report.pdf")
         else:
             bot.send_message(chat_id, "Oh no! Set your corresponding category wise budgets using the /budget command to generate the expense report")
 
     except Exception as e:
         logging.exception(str(e))
         bot.reply_to(message, "Oops!" + str(e))
+
+def create_report(images):
+    """
+    create_report(images): Lays out the (name, PNG bytes) pairs in images two per row on one
+    page and returns the PDF document as bytes. It runs in a chart worker through render.chart,
+    which hands the document back as a BytesIO buffer.
+    """
+    pdf = FPDF()
+    pdf.add_page()
+    x_coord = 20
+    y_coord = 30
+    # FPDF only reads images from files, so the report is put together in a
+    # directory of its own that no other request can touch
+    with tempfile.TemporaryDirectory() as report_dir:
+        for name, png in images:
+            image = os.path.join(report_dir, name + ".png")
+            with open(image, "wb") as image_file:
+                image_file.write(png)
+            pdf.image(image,x=x_coord,y=y_coord,w=70,h=50)
+            x_coord += 80
+            if x_coord > 100:
+                x_coord = 20
+                y_coord += 60
+        report = os.path.join(report_dir, "expense_report.pdf")
+        pdf.output(report, "F")
+        with open(report, "rb") as report_file:
+            return report_file.read()
+
+def create_history_chart(user_history):
+    """
+    create_history_chart(user_history): Draws the list of the user's expenses and returns it as a PNG buffer.
+    """
+    fig = plt.figure()
+    ax = fig.add_subplot(1, 1, 1)
+    top = 0.8
+    if len(user_history) == 0:
+        plt.text(
+            0.1,
+            top,
+            "No record found!",
+            horizontalalignment="left",
+            verticalalignment="center",
+            transform=ax.transAxes,
+            fontsize=20,
+        )
+    for rec in user_history:
+        rec_str = f"{rec.amount_str}$ {rec.category} expense on {rec.date_str}"
+        plt.text(
+            0,
+            top,
+            rec_str,
+            horizontalalignment="left",
+            verticalalignment="center",
+            transform=ax.transAxes,
+            fontsize=14,
+            bbox=dict(facecolor="red", alpha=0.3),
+        )
+        top -= 0.15
+    plt.axis("off")
+    return graphing.to_png(fig)
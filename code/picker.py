@@ -0,0 +1,84 @@
+"""
+File: picker.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import timeline
+from telebot import types
+
+# number of expenses offered on one page of the picker
+PAGE_SIZE = 8
+
+# === Documentation of picker.py ===
+
+def expense_label(record):
+    """
+    expense_label(record): Returns the button text of an expense.
+    """
+    return "{}  {}  ${}".format(record.date_str, record.category, record.amount_str)
+
+
+def picker_markup(history, prefix, page=0):
+    """
+    picker_markup(history, prefix, page): Returns the inline keyboard of page page (0 is the
+    newest) of a date-ordered history, one button per expense. Pressing an expense sends the
+    callback data "<prefix>:pick:<expense id>", the navigation buttons "<prefix>:page:<page>".
+    Only the expenses on the page are visited.
+    """
+    pages = max(1, -(-len(history) // PAGE_SIZE))
+    page = min(max(page, 0), pages - 1)
+    markup = types.InlineKeyboardMarkup()
+    rows = timeline.newest_first(history, skip=page * PAGE_SIZE)
+    for _, record in zip(range(PAGE_SIZE), rows):
+        markup.row(types.InlineKeyboardButton(
+            expense_label(record), callback_data="{}:pick:{}".format(prefix, record.id)
+        ))
+    navigation = []
+    if page > 0:
+        navigation.append(types.InlineKeyboardButton("< Newer", callback_data="{}:page:{}".format(prefix, page - 1)))
+    if page < pages - 1:
+        navigation.append(types.InlineKeyboardButton("Older >", callback_data="{}:page:{}".format(prefix, page + 1)))
+    if navigation:
+        markup.row(*navigation)
+    return markup
+
+
+def parse_callback(data):
+    """
+    parse_callback(data): Splits picker callback data into its action ("pick" or "page") and
+    value (an expense id or a page number).
+    """
+    _, action, value = data.split(":", 2)
+    return action, int(value) if action == "page" else value
+
+
+def show_page(call, bot, history, prefix, page):
+    """
+    show_page(call, bot, history, prefix, page): Replaces the picker the user pressed a
+    navigation button on with page page.
+    """
+    bot.edit_message_reply_markup(
+        call.message.chat.id, call.message.message_id, reply_markup=picker_markup(history, prefix, page)
+    )
@@ -27,8 +27,8 @@ SOFTWARE.
 
 import time
 import helper
+import aggregate
 import logging
-from datetime import datetime
 
 def run(message, bot):
     """
@@ -40,7 +40,6 @@ def run(message, bot):
     minimum 2 expenses overall to predict overall budget
     factor in savings after extrapolation
     """
-    helper.read_json()
     chat_id = message.chat.id
     history = helper.getUserHistory(chat_id)
     if history is None or len(history) < 2:
@@ -62,14 +61,13 @@ def predict_total(message, bot):
     try:
         chat_id = message.chat.id
         history = helper.getUserHistory(chat_id)
-        available_categories = helper.getAvailableCategories(history)
-        category_wise_history = helper.getCategoryWiseSpendings(available_categories,history)
+        category_wise_history = helper.groupByCategory(history)
         bot.send_message(chat_id, "Hold on! Calculating...")
         # show the bot "typing" (max. 5 secs)
         bot.send_chat_action(chat_id, "typing")
         time.sleep(0.5)
         category_spendings = {}
-        for category in available_categories:
+        for category in category_wise_history:
             category_spendings[category] = predict_category_spending(category_wise_history[category])
         overall_spending = predict_overall_spending(chat_id,category_spendings)
         bot.send_message(chat_id, "Your overall budget for next month can be: ${}".format(overall_spending))
@@ -87,16 +85,10 @@ def predict_category_spending(category_history):
     """
     if len(category_history) < 2:
         return 'Not enough records to predict spendings'
-    total_spent = 0
-    recorded_days = []
-    for record in category_history:
-        total_spent += float(record.split(',')[2])
-        date = datetime.strptime(record.split(',')[0].split(' ')[0], helper.getDateFormat())
-        recorded_days.append(date)
-    first = min(recorded_days)
-    last = max(recorded_days)
-    day_difference = abs(int((last - first).days)) + 1
-    avg_per_day = total_spent/day_difference
+    table = aggregate.ExpenseTable.from_history(category_history)
+    total_spent = table.total()
+    day_difference = table.day_span()
+    avg_per_day = total_spent/100/day_difference
     predicted_spending = avg_per_day * 30
     return round(predicted_spending,2)
 
@@ -0,0 +1,182 @@
+"""
+File: records.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import sys
+from collections import namedtuple
+from datetime import date, datetime
+
+dateFormat = "%d-%b-%Y"
+
+# === Documentation of records.py ===
+
+class Expense(namedtuple("Expense", ["day", "category", "cents", "uid"], defaults=(None,))):
+    """
+    A single expense. day is the ordinal of the expense date (date.toordinal()), category is
+    the interned category name and cents is the amount in integer cents. uid is the number the
+    storage backend gave the expense when it was stored, None for an expense not stored yet.
+    Being a tuple, an expense is stored in expense_record.json as a compact
+    [day, category, cents, uid] list.
+
+    Two expenses are equal when their day, category and amount are equal: the uid is left out,
+    so an expense typed by the user matches the stored one, and identical expenses stay equal.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        # compares the fields rather than the class, which exists twice when the module is
+        # imported both as records and as code.records
+        if getattr(other, "_fields", None) == self._fields:
+            return self[:3] == other[:3]
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self[:3])
+
+    @classmethod
+    def create(cls, expense_date, category, amount):
+        """
+        create(expense_date, category, amount): Builds an expense from a date (or datetime),
+        a category name and an amount given as a string or a number of dollars.
+        """
+        return cls(expense_date.toordinal(), sys.intern(str(category)), to_cents(amount))
+
+    @property
+    def date(self):
+        return date.fromordinal(self.day)
+
+    @property
+    def date_str(self):
+        return self.date.strftime(dateFormat)
+
+    @property
+    def month(self):
+        """
+        month: The (year, month) of the expense date.
+        """
+        expense_date = self.date
+        return expense_date.year, expense_date.month
+
+    @property
+    def amount(self):
+        return self.cents / 100
+
+    @property
+    def amount_str(self):
+        return str(self.amount)
+
+    @property
+    def id(self):
+        """
+        id: The uid of the expense in hexadecimal, or None for an expense not stored yet. It stays
+        the same across restarts and edits, identical expenses have different ids, and it fits in
+        the 64 bytes of Telegram callback data whatever the category name.
+        """
+        return None if self.uid is None else "{:x}".format(self.uid)
+
+    def __str__(self):
+        return "{},{},{}".format(self.date_str, self.category, self.amount_str)
+
+
+def parse_id(expense_id):
+    """
+    parse_id(expense_id): Returns the uid in an expense id. Raises ValueError for a malformed id.
+    """
+    uid = int(expense_id, 16)
+    if uid < 0:
+        raise ValueError("Invalid expense id: " + expense_id)
+    return uid
+
+
+def next_uid(history):
+    """
+    next_uid(history): Returns the uid following the largest one in a list of expenses.
+    """
+    return max((record.uid for record in history if record.uid is not None), default=0) + 1
+
+
+def to_cents(amount):
+    """
+    to_cents(amount): Converts a dollar amount (string or number) into integer cents.
+    """
+    return int(round(float(amount) * 100))
+
+
+def parse_date(date_str):
+    """
+    parse_date(date_str): Parses a date in the bot's date format, ignoring a trailing time
+    such as "28-Oct-2021 15:27" written by older versions of the bot.
+    """
+    return datetime.strptime(date_str.split(" ")[0], dateFormat).date()
+
+
+def parse(value):
+    """
+    parse(value): Returns value as an Expense. It accepts expenses, [day, category, cents, uid]
+    lists read back from JSON or SQLite, the [day, category, cents] lists written before expenses
+    had a uid and the "date,category,amount" strings of the old record format.
+    """
+    if isinstance(value, Expense):
+        return value
+    if isinstance(value, str):
+        date_str, category, amount = value.split(",")
+        return Expense.create(parse_date(date_str), category, amount)
+    day, category, cents, *uid = value
+    return Expense(int(day), sys.intern(category), int(cents), uid[0] if uid else None)
+
+
+def parse_all(values):
+    """
+    parse_all(values): Converts a list of stored records into expenses.
+    """
+    return [parse(value) for value in values]
+
+
+def is_legacy(values):
+    """
+    is_legacy(values): Tells whether a list of stored records still uses the old string format.
+    """
+    return any(isinstance(value, str) for value in values)
+
+
+def number(history):
+    """
+    number(history): Gives a uid to the expenses of history that have none, counting on from the
+    largest uid in it, and tells whether there were any.
+    """
+    uid = next_uid(history)
+    missing = False
+    for position, record in enumerate(history):
+        if record.uid is None:
+            history[position] = record._replace(uid=uid)
+            uid += 1
+            missing = True
+    return missing
@@ -0,0 +1,283 @@
+"""
+File: render.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import io
+import logging
+import multiprocessing
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# === Documentation of render.py ===
+
+class RenderBusy(Exception):
+    """
+    Raised when the rendering queue is full.
+    """
+
+
+def _warm_up():
+    # runs once in every worker: pay for the matplotlib import and backend set-up up front
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import graphing  # noqa: F401
+
+
+def _ping():
+    return True
+
+
+def _to_bytes(result):
+    if isinstance(result, io.BytesIO):
+        return result.getvalue()
+    if isinstance(result, list):
+        return [_to_bytes(item) for item in result]
+    return result
+
+
+def _to_buffers(result):
+    if isinstance(result, bytes):
+        return io.BytesIO(result)
+    if isinstance(result, list):
+        return [_to_buffers(item) for item in result]
+    return result
+
+
+def _render(func, args):
+    return _to_bytes(func(*args))
+
+
+class ChartRenderer:
+    """
+    Renders charts in a pool of worker processes, so pyplot's global state is never shared
+    between threads and the bot's handler threads do not hold the GIL while matplotlib draws.
+    A chart function is any module-level function that takes plain data (dicts, lists,
+    records.Expense) and returns a PNG buffer, a list of PNG buffers or None; the PNG bytes
+    come back to the caller as BytesIO buffers again. At most max_pending charts are queued
+    or rendering at a time, further requests fail with RenderBusy, and a chart that takes
+    longer than timeout seconds fails with TimeoutError. With workers=0, or where processes
+    cannot be forked (Windows), the charts are rendered in the calling thread, one at a time.
+    If a worker dies and breaks the pool, the pool is shut down and the charts are rendered
+    in the calling thread from then on: by that time the bot runs many threads, and forking a
+    new pool from it could leave the workers with locks held by threads that do not exist there.
+    """
+
+    def __init__(self, workers=2, max_pending=8, timeout=30):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._inline_lock = threading.Lock()
+        self._broken_lock = threading.Lock()
+        self._executor = None
+        # workers are forked: spawned workers would re-import code.py and start a second bot
+        if workers > 0 and "fork" in multiprocessing.get_all_start_methods():
+            self._executor = self._start()
+
+    def _start(self):
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_warm_up,
+        )
+        for _ in range(self.workers):
+            executor.submit(_ping)
+        return executor
+
+    def render(self, func, *args):
+        """
+        render(func, *args): Runs func(*args) in a worker process and returns its chart(s). Bytes
+        come back as BytesIO buffers whether func ran in a worker or in the calling thread.
+        """
+        executor = self._executor
+        if executor is None:
+            with self._inline_lock:
+                return _to_buffers(func(*args))
+        if not self._slots.acquire(blocking=False):
+            raise RenderBusy("Too many charts are being drawn right now, please try again in a moment")
+        try:
+            future = executor.submit(_render, func, args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._abandon(executor)
+            raise
+        except BaseException:
+            self._slots.release()
+            raise
+        # the slot is freed when the worker is done, not when the caller stops waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return _to_buffers(future.result(timeout=self.timeout))
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError("Drawing the chart took longer than {} seconds".format(self.timeout))
+        except BrokenProcessPool:
+            self._abandon(executor)
+            raise
+
+    def _abandon(self, executor):
+        # a worker died (e.g. out of memory); only the first thread to notice shuts the pool down
+        with self._broken_lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logging.error("A chart worker died, charts are drawn in the bot process from now on")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """
+        close(): Shuts the worker processes down.
+        """
+        with self._broken_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ChartCache:
+    """
+    Least recently used cache of rendered charts, keyed by (chat_id, chart function, fingerprint
+    of the chart's input data). A chart is only drawn again once the data behind it changed, and
+    writes to a user's records drop that user's charts right away. The cache holds at most
+    max_entries charts and max_bytes of PNG data, evicting the least recently used ones first.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._charts = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def key(chat_id, func, args):
+        """
+        key(chat_id, func, args): Returns the cache key of func(*args) drawn for chat_id.
+        """
+        name = "{}.{}".format(func.__module__, func.__qualname__)
+        fingerprint = hashlib.sha1(pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+        return str(chat_id), name, fingerprint
+
+    def get(self, key):
+        """
+        get(key): Returns the cached PNG bytes (or list of PNG bytes) of key, or None.
+        """
+        with self._lock:
+            if key not in self._charts:
+                return None
+            self._charts.move_to_end(key)
+            return self._charts[key]
+
+    def put(self, key, chart):
+        """
+        put(key, chart): Stores the PNG bytes (or list of PNG bytes) of a chart.
+        """
+        size = sum(len(png) for png in chart) if isinstance(chart, list) else len(chart)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._charts[key] = chart
+            self._size += size
+            while len(self._charts) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._charts)))
+
+    def _remove(self, key):
+        chart = self._charts.pop(key, None)
+        if chart is not None:
+            self._size -= sum(len(png) for png in chart) if isinstance(chart, list) else len(chart)
+
+    def invalidate(self, chat_id):
+        """
+        invalidate(chat_id): Drops every cached chart of a user.
+        """
+        with self._lock:
+            for key in [key for key in self._charts if key[0] == str(chat_id)]:
+                self._remove(key)
+
+    def __len__(self):
+        return len(self._charts)
+
+
+_renderer = None
+_cache = ChartCache()
+
+
+def configure(workers=2, max_pending=8, timeout=30, cache_entries=256, cache_bytes=32 * 1024 * 1024):
+    """
+    configure(workers, max_pending, timeout, cache_entries, cache_bytes): Replaces the renderer
+    and the chart cache used by chart().
+    """
+    global _renderer, _cache
+    close()
+    _renderer = ChartRenderer(workers, max_pending, timeout)
+    _cache = ChartCache(cache_entries, cache_bytes)
+
+
+def close():
+    """
+    close(): Shuts the configured renderer down.
+    """
+    global _renderer
+    if _renderer is not None:
+        _renderer.close()
+        _renderer = None
+
+
+def chart(func, *args, chat_id=None):
+    """
+    chart(func, *args, chat_id): Renders func(*args) with the configured renderer, defaulting to
+    drawing in the calling thread when none has been configured. Charts drawn for a chat_id are
+    cached until the data they are drawn from changes.
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer(workers=0)
+    if chat_id is None:
+        return _renderer.render(func, *args)
+    try:
+        key = ChartCache.key(chat_id, func, args)
+    except Exception:
+        # data that cannot be fingerprinted is simply not cached
+        return _renderer.render(func, *args)
+    cached = _cache.get(key)
+    if cached is not None:
+        return _to_buffers(cached)
+    result = _to_bytes(_renderer.render(func, *args))
+    if result is not None:
+        _cache.put(key, result)
+    return _to_buffers(result)
+
+
+def invalidate(chat_id):
+    """
+    invalidate(chat_id): Drops the cached charts of a user, called whenever their records change.
+    """
+    _cache.invalidate(chat_id)
@@ -47,7 +47,6 @@ def run(message, bot):
     send an email with the csvFile - the user's historical data.
     """
     try:
-        helper.read_json()
         chat_id = message.chat.id
         user_history = helper.getUserHistory(chat_id)
         if user_history is None:
@@ -77,10 +76,7 @@ def acceptEmailId(message, bot):
 
             else:
                 for rec in user_history:
-                    values = rec.split(',')
-                    # Store each value in separate variables
-                    date, category, amount = values
-                    table.append([date, category, "$ " + amount])
+                    table.append([rec.date_str, rec.category, "$ " + rec.amount_str])
 
                 with open('history.csv', 'w', newline = '', encoding="utf-8") as file:
                     writer = csv.writer(file)
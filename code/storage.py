@@ -0,0 +1,921 @@
+"""
+File: storage.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import atexit
+import contextlib
+import copy
+import json
+import logging
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import records
+import timeline
+import totals
+
+try:
+    import fcntl
+except ImportError:
+    # no cross-process file locking on Windows, only the thread lock applies
+    fcntl = None
+
+# === Documentation of storage.py ===
+
+def new_user_record():
+    """
+    new_user_record(): Returns an empty user record with no expenses and no budget.
+    """
+    return {"data": [], "budget": {"overall": "0", "category": None}}
+
+
+def write_json_atomic(path, data, fsync=False, indent=None):
+    """
+    write_json_atomic(path, data, fsync, indent): Writes data as JSON to a temporary file next to
+    path, flushes it to disk and renames it over path. Readers, and the file left behind by a
+    crash mid-write, only ever see the complete old or the complete new document. With fsync=True
+    the directory is synced too, so the rename itself survives a power loss.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as json_file:
+            json.dump(data, json_file, ensure_ascii=False, indent=indent)
+            json_file.flush()
+            os.fsync(json_file.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def replay(user, operations):
+    """
+    replay(user, operations): Applies operations recorded by CachedStorage to a user record
+    whose history is sorted by date.
+    """
+    for name, *args in operations:
+        if name == "append":
+            timeline.insert(user["data"], args[0])
+        elif name == "budget":
+            user["budget"] = args[0]
+        elif name == "replace":
+            timeline.replace(user["data"], *args)
+        elif name == "remove":
+            to_remove = set(args[0])
+            user["data"] = [record for record in user["data"] if record not in to_remove]
+        elif name == "remove_one":
+            timeline.remove(user["data"], args[0])
+
+
+class JsonStorage:
+    """
+    Stores every user in a single JSON document. Every write rewrites the whole file,
+    so this backend is only meant for tests and small deployments. Writes are atomic, and
+    every read-modify-write runs under a thread lock and an exclusive lock on "<path>.lock",
+    so concurrent handlers and other processes using the same file cannot lose updates.
+    Behind a CachedStorage, apply_changes re-reads the file under the lock and replays the
+    cached operations on it, so changes other processes made in the meantime are kept.
+    """
+
+    def __init__(self, path="expense_record.json", fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._depth == 0 and fcntl is not None:
+                self._lock_file = open(self.path + ".lock", "a")
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def load_all(self):
+        """
+        load_all(): Returns the dictionary of all users keyed by chat id.
+        """
+        with self._locked():
+            try:
+                if not os.path.exists(self.path):
+                    write_json_atomic(self.path, {})
+                    return {}
+                if os.stat(self.path).st_size == 0:
+                    return {}
+                with open(self.path, encoding="utf-8") as expense_record:
+                    user_list = json.load(expense_record)
+            except FileNotFoundError:
+                print("---------NO RECORDS FOUND---------")
+                return {}
+            migrate = False
+            for user in user_list.values():
+                migrate = records.is_legacy(user["data"]) or migrate
+                user["data"] = timeline.order_history(user["data"])
+                migrate = records.number(user["data"]) or migrate
+            if migrate:
+                # one-time migration of "date,category,amount" strings and of expenses without a
+                # uid to [day, category, cents, uid]
+                self.save_all(user_list)
+            return user_list
+
+    def save_all(self, user_list):
+        """
+        save_all(user_list): Replaces the stored users with user_list.
+        """
+        try:
+            with self._locked():
+                write_json_atomic(self.path, user_list, self.fsync)
+        except FileNotFoundError:
+            print("Sorry, the data file could not be found.")
+
+    def apply_changes(self, user_list, changes):
+        """
+        apply_changes(user_list, changes): Persists the changes CachedStorage recorded, given as
+        the pending operations of every changed user. The file is read again under the lock and
+        the operations are replayed on what it holds now, so the changes another process wrote
+        since this one loaded the file are not overwritten. Users replaced as a whole (None
+        instead of operations) are taken from user_list.
+        """
+        with self._locked():
+            stored = self.load_all()
+            for chat_id, operations in changes.items():
+                if operations is None:
+                    stored[chat_id] = user_list[chat_id]
+                else:
+                    replay(stored.setdefault(chat_id, new_user_record()), operations)
+            self.save_all(stored)
+
+    def get_user(self, chat_id):
+        """
+        get_user(chat_id): Returns the record of a single user or None if the user is unknown.
+        """
+        return self.load_all().get(str(chat_id))
+
+    def save_user(self, chat_id, user):
+        """
+        save_user(chat_id, user): Stores the complete record of a single user.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user_list[str(chat_id)] = user
+            self.save_all(user_list)
+
+    def append_record(self, chat_id, record):
+        """
+        append_record(chat_id, record): Appends one expense record to the user's history,
+        creating the user if needed, and returns the updated user record. An expense without a
+        uid gets the one following the largest uid of the user.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user = user_list.setdefault(str(chat_id), new_user_record())
+            record = records.parse(record)
+            if record.uid is None:
+                record = record._replace(uid=records.next_uid(user["data"]))
+            timeline.insert(user["data"], record)
+            self.save_all(user_list)
+            return user
+
+    def update_budget(self, chat_id, budget):
+        """
+        update_budget(chat_id, budget): Replaces the budget of a user, creating the user if needed.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user = user_list.setdefault(str(chat_id), new_user_record())
+            user["budget"] = budget
+            self.save_all(user_list)
+            return user
+
+    def replace_record(self, chat_id, old, new):
+        """
+        replace_record(chat_id, old, new): Replaces the expense old of the user (see timeline.find)
+        with new, which keeps the uid of old. Returns False when the user has no such expense.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user = user_list.get(str(chat_id))
+            if user is None or timeline.replace(user["data"], old, new) is None:
+                return False
+            self.save_all(user_list)
+            return True
+
+    def remove_records(self, chat_id, to_remove):
+        """
+        remove_records(chat_id, to_remove): Deletes every expense of the user that is equal to
+        one of to_remove and returns the deleted expenses.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user = user_list.get(str(chat_id))
+            if user is None:
+                return []
+            to_remove = set(records.parse_all(to_remove))
+            removed = [record for record in user["data"] if record in to_remove]
+            user["data"] = [record for record in user["data"] if record not in to_remove]
+            self.save_all(user_list)
+            return removed
+
+    def remove_record(self, chat_id, record):
+        """
+        remove_record(chat_id, record): Deletes only the expense record of the user (see
+        timeline.find), so one of several identical expenses can be deleted. Returns False when
+        there is none.
+        """
+        with self._locked():
+            user_list = self.load_all()
+            user = user_list.get(str(chat_id))
+            if user is None or not timeline.remove(user["data"], records.parse(record)):
+                return False
+            self.save_all(user_list)
+            return True
+
+    def next_uid(self):
+        """
+        next_uid(): Returns a uid that no stored expense has.
+        """
+        user_list = self.load_all()
+        return max((records.next_uid(user["data"]) for user in user_list.values()), default=1)
+
+    def get_expense(self, chat_id, uid):
+        """
+        get_expense(chat_id, uid): Returns the user's expense with the given uid, or None when the
+        user has no such expense.
+        """
+        user = self.get_user(chat_id)
+        return next((record for record in ([] if user is None else user["data"]) if record.uid == uid), None)
+
+    def query(self, chat_id, start=None, end=None, categories=None, min_amount=None, max_amount=None):
+        """
+        query(chat_id, start, end, categories, min_amount, max_amount): Returns an iterator over
+        the user's expenses from start to end (dates, both included) in the given categories and
+        with an amount between min_amount and max_amount dollars, ordered by date. Criteria left
+        at None do not filter. The stored expenses are loaded in date order, so the date range is
+        found with bisect.
+        """
+        user = self.get_user(chat_id)
+        return timeline.Timeline([] if user is None else user["data"], ordered=True).query(
+            start, end, categories, min_amount, max_amount
+        )
+
+    def get_totals(self, chat_id):
+        """
+        get_totals(chat_id): Returns the spending totals of a user. They are not stored: every call
+        reads the file and rebuilds them from the user's whole history, which costs O(n) in the
+        number of expenses. The bot reads them through CachedStorage, which keeps them up to date
+        in memory.
+        """
+        user = self.get_user(chat_id)
+        return totals.SpendingTotals([] if user is None else user["data"])
+
+    def verify_totals(self, chat_id, rebuild=False):
+        """
+        verify_totals(chat_id, rebuild): The totals of this backend are rebuilt from the stored
+        expenses on every read, so they can never drift.
+        """
+        return []
+
+    def close(self):
+        """
+        close(): Nothing to release for the JSON file backend.
+        """
+
+
+class SqliteStorage:
+    """
+    Stores users and expenses in SQLite. Each user is a row in the users table and every
+    expense is a row in the expenses table, indexed by chat id, so adding an expense or
+    reading one user never touches the data of the other users. The rowid of an expense is its
+    uid, and AUTOINCREMENT keeps the rowids of deleted expenses from being handed out again.
+    """
+
+    SCHEMA_VERSION = 2
+
+    # the operations CachedStorage records, and the methods replaying them inside a transaction
+    OPERATIONS = {
+        "append": "_insert",
+        "budget": "_set_budget",
+        "replace": "_update",
+        "remove": "_delete",
+        "remove_one": "_delete_one",
+    }
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users ("
+        " chat_id TEXT PRIMARY KEY,"
+        " budget TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS expenses ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " chat_id TEXT NOT NULL REFERENCES users(chat_id),"
+        " day INTEGER NOT NULL,"
+        " category TEXT NOT NULL,"
+        " cents INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_chat_id ON expenses (chat_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_chat_day ON expenses (chat_id, day)",
+    )
+
+    def __init__(self, path="expense_record.db", fsync=False, import_path=None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous = {}".format("FULL" if fsync else "NORMAL"))
+        with self._conn:
+            self._migrate()
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._conn.execute("PRAGMA user_version = {}".format(self.SCHEMA_VERSION))
+            self._import_json(import_path)
+
+    def _import_json(self, import_path):
+        """
+        _import_json(import_path): Copies the users of the JSON file import_path into the database
+        when it has no users yet, so switching storage_backend from json to sqlite keeps the
+        recorded expenses. This runs once: afterwards the database is not empty. The JSON file
+        is left as it is. The expenses get new uids, as the JSON uids are only unique per user.
+        """
+        if import_path is None or not os.path.exists(import_path) or os.stat(import_path).st_size == 0:
+            return
+        if self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None:
+            return
+        with open(import_path, encoding="utf-8") as json_file:
+            user_list = json.load(json_file)
+        for chat_id, user in user_list.items():
+            history = [record._replace(uid=None) for record in timeline.order_history(user.get("data", []))]
+            self._write_user(chat_id, dict(user, data=history))
+        logging.info("Imported %d users from %s into %s", len(user_list), import_path, self.path)
+
+    def _migrate(self):
+        """
+        _migrate(): Converts the expenses table of version 1 databases, which kept each expense
+        as a "date,category,amount" string, into typed day/category/cents columns.
+        """
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(expenses)")]
+        if version >= self.SCHEMA_VERSION or "record" not in columns:
+            return
+        legacy = self._conn.execute("SELECT id, chat_id, record FROM expenses ORDER BY id").fetchall()
+        self._conn.execute("DROP INDEX IF EXISTS idx_expenses_chat_id")
+        self._conn.execute("DROP INDEX IF EXISTS idx_expenses_chat_day")
+        self._conn.execute("DROP TABLE expenses")
+        for statement in self.SCHEMA:
+            self._conn.execute(statement)
+        self._conn.executemany(
+            "INSERT INTO expenses (id, chat_id, day, category, cents) VALUES (?, ?, ?, ?, ?)",
+            [(row_id, chat_id) + records.parse(record)[:3] for row_id, chat_id, record in legacy],
+        )
+
+    def _ensure_user(self, chat_id):
+        self._conn.execute(
+            "INSERT OR IGNORE INTO users (chat_id, budget) VALUES (?, ?)",
+            (str(chat_id), json.dumps(new_user_record()["budget"])),
+        )
+
+    def _read_user(self, chat_id):
+        row = self._conn.execute(
+            "SELECT budget FROM users WHERE chat_id = ?", (str(chat_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        expenses = self._conn.execute(
+            "SELECT day, category, cents, id FROM expenses WHERE chat_id = ? ORDER BY day, id", (str(chat_id),)
+        ).fetchall()
+        return {"data": [records.parse(expense) for expense in expenses], "budget": json.loads(row[0])}
+
+    def _write_user(self, chat_id, user):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO users (chat_id, budget) VALUES (?, ?)",
+            (str(chat_id), json.dumps(user.get("budget", new_user_record()["budget"]))),
+        )
+        self._conn.execute("DELETE FROM expenses WHERE chat_id = ?", (str(chat_id),))
+        self._conn.executemany(
+            "INSERT INTO expenses (id, chat_id, day, category, cents) VALUES (?, ?, ?, ?, ?)",
+            [self._row(chat_id, record) for record in user.get("data", [])],
+        )
+
+    @staticmethod
+    def _row(chat_id, record):
+        # an expense without a uid is inserted with a NULL id, for which SQLite picks the next rowid
+        record = records.parse(record)
+        return (record.uid, str(chat_id)) + record[:3]
+
+    def _insert(self, chat_id, record):
+        self._ensure_user(chat_id)
+        cursor = self._conn.execute(
+            "INSERT INTO expenses (id, chat_id, day, category, cents) VALUES (?, ?, ?, ?, ?)",
+            self._row(chat_id, record),
+        )
+        return cursor.lastrowid
+
+    def _set_budget(self, chat_id, budget):
+        self._ensure_user(chat_id)
+        self._conn.execute("UPDATE users SET budget = ? WHERE chat_id = ?", (json.dumps(budget), str(chat_id)))
+
+    @staticmethod
+    def _match(chat_id, record):
+        # a stored expense is matched by its uid, any other one by the oldest row equal to it
+        record = records.parse(record)
+        if record.uid is not None:
+            return "SELECT id FROM expenses WHERE chat_id = ? AND id = ?", (str(chat_id), record.uid)
+        return (
+            "SELECT id FROM expenses WHERE chat_id = ? AND day = ? AND category = ? AND cents = ?"
+            " ORDER BY id LIMIT 1",
+            (str(chat_id),) + record[:3],
+        )
+
+    def _update(self, chat_id, old, new):
+        match, params = self._match(chat_id, old)
+        cursor = self._conn.execute(
+            "UPDATE expenses SET day = ?, category = ?, cents = ? WHERE id = (" + match + ")",
+            records.parse(new)[:3] + params,
+        )
+        return cursor.rowcount > 0
+
+    def _delete(self, chat_id, to_remove):
+        self._conn.executemany(
+            "DELETE FROM expenses WHERE chat_id = ? AND day = ? AND category = ? AND cents = ?",
+            [(str(chat_id),) + record[:3] for record in set(records.parse_all(to_remove))],
+        )
+
+    def _delete_one(self, chat_id, record):
+        match, params = self._match(chat_id, record)
+        cursor = self._conn.execute("DELETE FROM expenses WHERE id = (" + match + ")", params)
+        return cursor.rowcount > 0
+
+    def load_all(self):
+        with self._lock:
+            chat_ids = self._conn.execute("SELECT chat_id FROM users").fetchall()
+            return {chat_id: self._read_user(chat_id) for (chat_id,) in chat_ids}
+
+    def save_all(self, user_list):
+        """
+        save_all(user_list): Upserts every user in user_list in a single transaction.
+        """
+        with self._lock, self._conn:
+            for chat_id, user in user_list.items():
+                self._write_user(chat_id, user)
+
+    def apply_changes(self, user_list, changes):
+        """
+        apply_changes(user_list, changes): Replays the operations CachedStorage recorded for every
+        changed user in a single transaction, so a flush after one /add inserts one row instead of
+        rewriting the user's history. Users replaced as a whole (None instead of operations) are
+        rewritten from user_list.
+        """
+        with self._lock, self._conn:
+            for chat_id, operations in changes.items():
+                if operations is None:
+                    self._write_user(chat_id, user_list[chat_id])
+                    continue
+                for name, *args in operations:
+                    getattr(self, self.OPERATIONS[name])(chat_id, *args)
+
+    def get_user(self, chat_id):
+        with self._lock:
+            return self._read_user(chat_id)
+
+    def save_user(self, chat_id, user):
+        with self._lock, self._conn:
+            self._write_user(chat_id, user)
+
+    def append_record(self, chat_id, record):
+        with self._lock:
+            with self._conn:
+                self._insert(chat_id, record)
+            return self._read_user(chat_id)
+
+    def update_budget(self, chat_id, budget):
+        with self._lock:
+            with self._conn:
+                self._set_budget(chat_id, budget)
+            return self._read_user(chat_id)
+
+    def replace_record(self, chat_id, old, new):
+        with self._lock, self._conn:
+            return self._update(chat_id, old, new)
+
+    def remove_records(self, chat_id, to_remove):
+        with self._lock, self._conn:
+            user = self._read_user(chat_id)
+            if user is None:
+                return []
+            to_remove = set(records.parse_all(to_remove))
+            self._delete(chat_id, to_remove)
+            return [record for record in user["data"] if record in to_remove]
+
+    def remove_record(self, chat_id, record):
+        with self._lock, self._conn:
+            return self._delete_one(chat_id, record)
+
+    def next_uid(self):
+        """
+        next_uid(): Returns the rowid SQLite gives the next expense, which no expense ever had.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'expenses'").fetchone()
+        return 1 if row is None else row[0] + 1
+
+    def get_expense(self, chat_id, uid):
+        """
+        get_expense(chat_id, uid): Returns the user's expense whose rowid is uid, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT day, category, cents, id FROM expenses WHERE chat_id = ? AND id = ?", (str(chat_id), uid)
+            ).fetchone()
+        return None if row is None else records.parse(row)
+
+    def query(self, chat_id, start=None, end=None, categories=None, min_amount=None, max_amount=None):
+        """
+        query(chat_id, start, end, categories, min_amount, max_amount): Runs the query in SQL,
+        using the (chat_id, day) index for the date range.
+        """
+        sql = "SELECT day, category, cents, id FROM expenses WHERE chat_id = ?"
+        params = [str(chat_id)]
+        if start is not None:
+            sql += " AND day >= ?"
+            params.append(timeline.to_day(start))
+        if end is not None:
+            sql += " AND day <= ?"
+            params.append(timeline.to_day(end))
+        if categories is not None:
+            categories = [categories] if isinstance(categories, str) else list(categories)
+            sql += " AND category IN ({})".format(", ".join("?" * len(categories)))
+            params.extend(categories)
+        if min_amount is not None:
+            sql += " AND cents >= ?"
+            params.append(records.to_cents(min_amount))
+        if max_amount is not None:
+            sql += " AND cents <= ?"
+            params.append(records.to_cents(max_amount))
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY day, id", params).fetchall()
+        return map(records.parse, rows)
+
+    def get_totals(self, chat_id):
+        """
+        get_totals(chat_id): Returns the spending totals of a user. They are not stored: every call
+        reads all of the user's expenses and rebuilds them, which costs O(n) in the number of
+        expenses. The bot reads them through CachedStorage, which keeps them up to date in memory.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, category, cents FROM expenses WHERE chat_id = ?", (str(chat_id),)
+            ).fetchall()
+        return totals.SpendingTotals(rows)
+
+    def verify_totals(self, chat_id, rebuild=False):
+        """
+        verify_totals(chat_id, rebuild): The totals of this backend are rebuilt from the stored
+        expenses on every read, so they can never drift and there is nothing to rebuild.
+        """
+        return []
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedStorage:
+    """
+    Keeps every user in memory on top of another backend. Reads are served from RAM and
+    changed users are marked dirty and written back by flush(), which runs after every
+    write when flush_interval is 0, every flush_interval seconds otherwise, and on close().
+    The returned user records are the cached objects, so callers must write them back
+    through save_user/save_all after changing them. Each cached history is kept sorted by date,
+    and the spending totals of each user are kept next to it and updated expense by expense.
+    Every change is recorded as an operation ("append", "replace", "remove", "remove_one" or
+    "budget") and flush() hands the pending operations to the backend's apply_changes, so a
+    backend that can update single rows does not have to rewrite whole users. Replacing a user
+    (save_user, save_all) is recorded as None, which makes that user's earlier operations moot.
+    flush() only holds the cache lock while it takes the pending operations, so reads and writes
+    of other handlers go on while the backend writes. New expenses get their uid from a counter that starts after the largest stored uid, and a
+    {uid: expense} index of each user is kept next to the totals for get_expense.
+    """
+
+    def __init__(self, backend, flush_interval=0):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        # taken before self._lock, so flushes reach the backend one at a time and in order
+        self._flush_lock = threading.Lock()
+        self._users = None
+        self._totals = {}
+        self._index = {}
+        self._next_uid = 1
+        self._changes = {}
+        self._stopped = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logging.exception("Could not flush expense records")
+
+    def _loaded(self):
+        if self._users is None:
+            self._users = self.backend.load_all()
+            self._next_uid = self.backend.next_uid()
+            for user in self._users.values():
+                self._number(user["data"])
+        return self._users
+
+    def _number(self, history):
+        # uids are unique across users, as the rowids of SqliteStorage are
+        self._next_uid = max(self._next_uid, records.next_uid(history))
+        for position, record in enumerate(history):
+            if record.uid is None:
+                history[position] = record._replace(uid=self._next_uid)
+                self._next_uid += 1
+
+    def _forget(self, chat_id):
+        # the user's records were replaced as a whole, the totals and the index are rebuilt on
+        # the next read
+        self._totals.pop(chat_id, None)
+        self._index.pop(chat_id, None)
+
+    def _changed(self, chat_ids, operation=None):
+        for chat_id in chat_ids:
+            if operation is None:
+                self._changes[chat_id] = None
+            else:
+                pending = self._changes.setdefault(chat_id, [])
+                if pending is not None:
+                    pending.append(operation)
+
+    def _write_through(self):
+        # called after the cache lock is released, as flush() takes it after self._flush_lock
+        if self.flush_interval <= 0:
+            self.flush()
+
+    def flush(self):
+        """
+        flush(): Hands the changes recorded since the last flush to the backend. The pending
+        operations, and a copy of the users replaced as a whole, are taken under the cache lock,
+        and the backend writes them after it is released. When the backend fails, the operations
+        are put back ahead of the ones recorded in the meantime and written by the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._changes:
+                    return
+                changes, self._changes = self._changes, {}
+                user_list = {
+                    chat_id: copy.deepcopy(self._users[chat_id])
+                    for chat_id, operations in changes.items() if operations is None
+                }
+            try:
+                self.backend.apply_changes(user_list, changes)
+            except Exception:
+                with self._lock:
+                    for chat_id, operations in self._changes.items():
+                        if operations is None or chat_id not in changes:
+                            changes[chat_id] = operations
+                        elif changes[chat_id] is not None:
+                            changes[chat_id] = changes[chat_id] + operations
+                    self._changes = changes
+                raise
+
+    def load_all(self):
+        with self._lock:
+            return self._loaded()
+
+    def save_all(self, user_list):
+        with self._lock:
+            users = self._loaded()
+            if user_list is not users:
+                users.update(user_list)
+            for chat_id, user in user_list.items():
+                user["data"] = timeline.order_history(user["data"])
+                self._number(user["data"])
+                self._forget(chat_id)
+            self._changed(user_list.keys())
+        self._write_through()
+
+    def get_user(self, chat_id):
+        with self._lock:
+            return self._loaded().get(str(chat_id))
+
+    def save_user(self, chat_id, user):
+        with self._lock:
+            user["data"] = timeline.order_history(user["data"])
+            self._loaded()[str(chat_id)] = user
+            self._number(user["data"])
+            self._forget(str(chat_id))
+            self._changed([str(chat_id)])
+        self._write_through()
+
+    def append_record(self, chat_id, record):
+        with self._lock:
+            user = self._loaded().setdefault(str(chat_id), new_user_record())
+            record = records.parse(record)
+            if record.uid is None:
+                record = record._replace(uid=self._next_uid)
+            self._next_uid = max(self._next_uid, record.uid + 1)
+            timeline.insert(user["data"], record)
+            if str(chat_id) in self._totals:
+                self._totals[str(chat_id)].add(record)
+            if str(chat_id) in self._index:
+                self._index[str(chat_id)][record.uid] = record
+            self._changed([str(chat_id)], ("append", record))
+        self._write_through()
+        return user
+
+    def update_budget(self, chat_id, budget):
+        with self._lock:
+            user = self._loaded().setdefault(str(chat_id), new_user_record())
+            user["budget"] = budget
+            self._changed([str(chat_id)], ("budget", budget))
+        self._write_through()
+        return user
+
+    def replace_record(self, chat_id, old, new):
+        with self._lock:
+            user = self._loaded().get(str(chat_id))
+            position = None if user is None else timeline.find(user["data"], old)
+            if position is None:
+                return False
+            old = user["data"][position]
+            new = timeline.replace(user["data"], old, new)
+            if str(chat_id) in self._totals:
+                self._totals[str(chat_id)].remove(old)
+                self._totals[str(chat_id)].add(new)
+            if str(chat_id) in self._index:
+                self._index[str(chat_id)].pop(old.uid, None)
+                self._index[str(chat_id)][new.uid] = new
+            self._changed([str(chat_id)], ("replace", old, new))
+        self._write_through()
+        return True
+
+    def remove_records(self, chat_id, to_remove):
+        with self._lock:
+            user = self._loaded().get(str(chat_id))
+            if user is None:
+                return []
+            to_remove = set(records.parse_all(to_remove))
+            removed = [record for record in user["data"] if record in to_remove]
+            user["data"] = [record for record in user["data"] if record not in to_remove]
+            if str(chat_id) in self._totals:
+                for record in removed:
+                    self._totals[str(chat_id)].remove(record)
+            if str(chat_id) in self._index:
+                for record in removed:
+                    self._index[str(chat_id)].pop(record.uid, None)
+            if removed:
+                self._changed([str(chat_id)], ("remove", sorted(to_remove)))
+        self._write_through()
+        return removed
+
+    def remove_record(self, chat_id, record):
+        with self._lock:
+            user = self._loaded().get(str(chat_id))
+            position = None if user is None else timeline.find(user["data"], record)
+            if position is None:
+                return False
+            record = user["data"].pop(position)
+            if str(chat_id) in self._totals:
+                self._totals[str(chat_id)].remove(record)
+            if str(chat_id) in self._index:
+                self._index[str(chat_id)].pop(record.uid, None)
+            self._changed([str(chat_id)], ("remove_one", record))
+        self._write_through()
+        return True
+
+    def get_expense(self, chat_id, uid):
+        """
+        get_expense(chat_id, uid): Returns the user's expense with the given uid, or None, from the
+        user's {uid: expense} index, which is built on the first lookup.
+        """
+        with self._lock:
+            if str(chat_id) not in self._index:
+                user = self._loaded().get(str(chat_id))
+                history = [] if user is None else user["data"]
+                self._index[str(chat_id)] = {record.uid: record for record in history}
+            return self._index[str(chat_id)].get(uid)
+
+    def get_timeline(self, chat_id):
+        """
+        get_timeline(chat_id): Returns a date-ordered view over the user's cached expenses.
+        The view does not copy them, so it only stays valid until the user is replaced.
+        """
+        with self._lock:
+            user = self._loaded().get(str(chat_id))
+            return timeline.Timeline([] if user is None else user["data"], ordered=True)
+
+    def query(self, chat_id, start=None, end=None, categories=None, min_amount=None, max_amount=None):
+        """
+        query(chat_id, start, end, categories, min_amount, max_amount): Finds the date range in the
+        user's cached history with bisect, copies it under the lock and filters it lazily.
+        """
+        with self._lock:
+            in_range = self.get_timeline(chat_id).between(start, end)
+        return timeline.filter_expenses(in_range, categories, min_amount, max_amount)
+
+    def get_totals(self, chat_id):
+        with self._lock:
+            if str(chat_id) not in self._totals:
+                user = self._loaded().get(str(chat_id))
+                self._totals[str(chat_id)] = totals.SpendingTotals([] if user is None else user["data"])
+            return self._totals[str(chat_id)]
+
+    def verify_totals(self, chat_id, rebuild=False):
+        """
+        verify_totals(chat_id, rebuild): Recomputes the totals of a user from the cached expenses
+        and returns the keys on which the running totals drifted. With rebuild=True the running
+        totals are replaced by the recomputed ones.
+        """
+        with self._lock:
+            user = self._loaded().get(str(chat_id))
+            expected = totals.SpendingTotals([] if user is None else user["data"])
+            current = self._totals.get(str(chat_id))
+            drifted = [] if current is None else current.drift(expected)
+            if rebuild:
+                self._totals[str(chat_id)] = expected
+            return drifted
+
+    def close(self):
+        """
+        close(): Stops the background flusher, writes pending changes and closes the backend.
+        """
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self.backend.close()
+        atexit.unregister(self.close)
+
+
+backends = {"json": JsonStorage, "sqlite": SqliteStorage}
+
+
+def create_storage(backend="json", path=None, cached=False, flush_interval=0, fsync=False):
+    """
+    create_storage(backend, path, cached, flush_interval, fsync): Builds the storage backend named
+    by backend ("json" or "sqlite"), using the backend's default file when path is not given.
+    With cached=True the backend is wrapped in a CachedStorage that flushes every flush_interval
+    seconds. fsync=True makes every flush wait until the data is on disk. An empty SQLite database
+    imports the expense_record.json file next to it, if there is one.
+    """
+    if backend not in backends:
+        raise ValueError('Unknown storage backend "{}"'.format(backend))
+    options = {"fsync": fsync}
+    if backend == "sqlite":
+        # the JSON file the bot used so far, which an empty database starts from
+        options["import_path"] = os.path.join(os.path.dirname(path or ""), "expense_record.json")
+    if path is None:
+        store = backends[backend](**options)
+    else:
+        store = backends[backend](path, **options)
+    if cached:
+        return CachedStorage(store, flush_interval)
+    return store
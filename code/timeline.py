@@ -0,0 +1,227 @@
+"""
+File: timeline.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import records
+from bisect import bisect_left, bisect_right, insort_right
+from datetime import date, timedelta
+from operator import attrgetter
+
+# === Documentation of timeline.py ===
+
+DAY = attrgetter("day")
+
+
+def to_day(value):
+    """
+    to_day(value): Returns value (a date, a datetime or a date ordinal) as a date ordinal.
+    None stays None.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    return value.toordinal()
+
+
+def month_range(year, month):
+    """
+    month_range(year, month): Returns the first and the last date of a calendar month.
+    """
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return date(year, month, 1), date.fromordinal(following.toordinal() - 1)
+
+
+def week_range(day):
+    """
+    week_range(day): Returns the Monday and the Sunday of the week of day.
+    """
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def last_days(days, today=None):
+    """
+    last_days(days, today): Returns the first and the last date of the days days ending with
+    today, today included.
+    """
+    today = today or date.today()
+    return today - timedelta(days=days - 1), today
+
+
+def filter_expenses(expenses, categories=None, min_amount=None, max_amount=None):
+    """
+    filter_expenses(expenses, categories, min_amount, max_amount): Yields the expenses whose
+    category is one of categories and whose amount, in dollars, lies between min_amount and
+    max_amount (both included). A criterion left at None does not filter.
+    """
+    if isinstance(categories, str):
+        categories = [categories]
+    wanted = None if categories is None else set(categories)
+    low = None if min_amount is None else records.to_cents(min_amount)
+    high = None if max_amount is None else records.to_cents(max_amount)
+    for record in expenses:
+        if wanted is not None and record.category not in wanted:
+            continue
+        if low is not None and record.cents < low:
+            continue
+        if high is not None and record.cents > high:
+            continue
+        yield record
+
+
+def order_history(history):
+    """
+    order_history(history): Returns the stored records of history as a list of expenses sorted
+    by date. The sort is stable, so expenses of the same day keep the order they were added in,
+    and a history that is already in order is checked in a single pass.
+    """
+    history = records.parse_all(history)
+    history.sort(key=DAY)
+    return history
+
+
+def span(history, start=None, end=None):
+    """
+    span(history, start, end): Returns the slice bounds of the expenses from start to end, both
+    included, in a history sorted by date. A missing bound leaves that side of the range open.
+    """
+    first, last = to_day(start), to_day(end)
+    low = 0 if first is None else bisect_left(history, first, key=DAY)
+    high = len(history) if last is None else bisect_right(history, last, key=DAY, lo=low)
+    return low, high
+
+
+def insert(history, record):
+    """
+    insert(history, record): Inserts an expense into a history sorted by date, after the other
+    expenses of its day, and returns it.
+    """
+    record = records.parse(record)
+    insort_right(history, record, key=DAY)
+    return record
+
+
+def find(history, record):
+    """
+    find(history, record): Returns the position of the expense record in a history sorted by date,
+    or None when there is none. A stored expense is found by its uid, any other one matches the
+    first equal expense. Only the expenses of its day are compared.
+    """
+    record = records.parse(record)
+    low, high = span(history, record.day, record.day)
+    for position in range(low, high):
+        stored = history[position]
+        if (stored.uid == record.uid) if record.uid is not None else (stored == record):
+            return position
+    return None
+
+
+def newest_first(history, until=None, skip=0):
+    """
+    newest_first(history, until, skip): Yields the expenses of a history sorted by date up to the
+    date until (all of them when until is None), newest first, leaving out the skip newest ones.
+    The start is found with bisect, so only the expenses that are consumed are visited.
+    """
+    _, high = span(history, end=until)
+    for position in range(high - 1 - skip, -1, -1):
+        yield history[position]
+
+
+def remove(history, record):
+    """
+    remove(history, record): Removes the expense record (see find) from a history sorted by date.
+    Returns False when there is none.
+    """
+    position = find(history, record)
+    if position is None:
+        return False
+    del history[position]
+    return True
+
+
+def replace(history, old, new):
+    """
+    replace(history, old, new): Replaces the expense old (see find) with new in a history sorted
+    by date and returns the stored expense, which keeps the uid of old when new has none. The
+    expense keeps its place unless its date changes, in which case it moves after the other
+    expenses of the new day. Returns None when there is no such expense.
+    """
+    position = find(history, old)
+    if position is None:
+        return None
+    new = records.parse(new)
+    if new.uid is None:
+        new = new._replace(uid=history[position].uid)
+    if history[position].day == new.day:
+        history[position] = new
+    else:
+        del history[position]
+        insert(history, new)
+    return new
+
+
+class Timeline:
+    """
+    A view over the expenses of one user ordered by date, expenses of the same day in the order
+    they were added. Every storage backend keeps user histories in this order, so a timeline wraps
+    the stored list without copying it (ordered=True) and finds the expenses between two dates
+    with bisect instead of a scan of the whole history.
+    """
+
+    def __init__(self, history=(), ordered=False):
+        self.records = history if ordered else order_history(history)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def add(self, record):
+        """
+        add(record): Inserts an expense after the other expenses of its day.
+        """
+        insert(self.records, record)
+
+    def remove(self, record):
+        """
+        remove(record): Removes the expense record (see find). Returns False when there is none.
+        """
+        return remove(self.records, record)
+
+    def between(self, start=None, end=None):
+        """
+        between(start, end): Returns a list of the expenses from start to end, both included.
+        A missing bound leaves that side of the range open.
+        """
+        low, high = span(self.records, start, end)
+        return self.records[low:high]
+
+    def query(self, start=None, end=None, categories=None, min_amount=None, max_amount=None):
+        """
+        query(start, end, categories, min_amount, max_amount): Returns an iterator over the
+        expenses matching every given criterion, ordered by date. See filter_expenses.
+        """
+        return filter_expenses(self.between(start, end), categories, min_amount, max_amount)
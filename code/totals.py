@@ -0,0 +1,135 @@
+"""
+File: totals.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import records
+
+# === Documentation of totals.py ===
+
+class SpendingTotals:
+    """
+    Running spending totals of one user, kept as [cents, count] pairs per day (date ordinal),
+    per (year, month) and per (year, month, category). The totals are updated record by record
+    as expenses are added, edited or deleted, so budget checks never have to rescan the history.
+    """
+
+    def __init__(self, data=()):
+        self.days = {}
+        self.months = {}
+        self.categories = {}
+        for record in data:
+            self.add(record)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SpendingTotals)
+            and self.days == other.days
+            and self.months == other.months
+            and self.categories == other.categories
+        )
+
+    def _update(self, record, sign):
+        record = records.parse(record)
+        month = record.month
+        for table, key in (
+            (self.days, record.day),
+            (self.months, month),
+            (self.categories, month + (record.category,)),
+        ):
+            cents, count = table.get(key, (0, 0))
+            cents, count = cents + sign * record.cents, count + sign
+            if count == 0 and cents == 0:
+                table.pop(key, None)
+            else:
+                table[key] = [cents, count]
+
+    def add(self, record):
+        """
+        add(record): Adds one expense to the totals.
+        """
+        self._update(record, 1)
+
+    def remove(self, record):
+        """
+        remove(record): Takes one expense back out of the totals.
+        """
+        self._update(record, -1)
+
+    def day_total(self, day):
+        """
+        day_total(day): Returns the cents spent on the given date (or date ordinal).
+        """
+        return self.days.get(_ordinal(day), [0, 0])[0]
+
+    def day_count(self, day):
+        """
+        day_count(day): Returns the number of expenses recorded on the given date (or date ordinal).
+        """
+        return self.days.get(_ordinal(day), [0, 0])[1]
+
+    def month_total(self, year, month):
+        """
+        month_total(year, month): Returns the cents spent in the given month.
+        """
+        return self.months.get((year, month), [0, 0])[0]
+
+    def month_count(self, year, month):
+        """
+        month_count(year, month): Returns the number of expenses recorded in the given month.
+        """
+        return self.months.get((year, month), [0, 0])[1]
+
+    def category_total(self, year, month, category):
+        """
+        category_total(year, month, category): Returns the cents spent on category in the given month.
+        """
+        return self.categories.get((year, month, category), [0, 0])[0]
+
+    def category_count(self, year, month, category):
+        """
+        category_count(year, month, category): Returns the number of expenses on category in the given month.
+        """
+        return self.categories.get((year, month, category), [0, 0])[1]
+
+    def drift(self, other):
+        """
+        drift(other): Returns the keys whose totals or counts differ between these totals and other,
+        e.g. totals maintained incrementally and totals rebuilt from the raw records.
+        """
+        drifted = []
+        for mine, theirs in (
+            (self.days, other.days),
+            (self.months, other.months),
+            (self.categories, other.categories),
+        ):
+            for key in set(mine) | set(theirs):
+                if mine.get(key) != theirs.get(key):
+                    drifted.append(key)
+        return drifted
+
+
+def _ordinal(day):
+    return day if isinstance(day, int) else day.toordinal()
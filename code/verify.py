@@ -0,0 +1,55 @@
+"""
+File: verify.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import helper
+import logging
+
+# === Documentation of verify.py ===
+
+def run(message, bot):
+    """
+    run(message, bot): This is the main function used to implement the verify feature.
+    It takes 2 arguments for processing - message which is the message from the user, and bot
+    which is the telegram bot object from the main code.py function. It recomputes the user's
+    per-day, per-month and per-category spending totals from their recorded expenses using the
+    helper module's verifyUserTotals method, rebuilds the running totals if any of them drifted,
+    and tells the user what was found.
+    """
+    try:
+        chat_id = message.chat.id
+        drifted = helper.verifyUserTotals(chat_id, rebuild=True)
+        if len(drifted) == 0:
+            bot.send_message(chat_id, "Your spending totals match your recorded expenses.")
+        else:
+            bot.send_message(
+                chat_id,
+                "Found {} spending totals that did not match your recorded expenses. "
+                "They have been rebuilt from your records.".format(len(drifted)),
+            )
+    except Exception as e:
+        logging.exception(str(e))
+        bot.reply_to(message, "Oops! " + str(e))
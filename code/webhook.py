@@ -0,0 +1,143 @@
+"""
+File: webhook.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hmac
+import json
+import logging
+import ssl
+import threading
+import telebot
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# header in which Telegram repeats the secret_token given to setWebhook
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Telegram updates are small; anything much larger is not an update
+MAX_BODY_BYTES = 1024 * 1024
+
+# === Documentation of webhook.py ===
+
+class WebhookServer:
+    """
+    An HTTP server that receives the updates Telegram POSTs to the bot's webhook. Each request is
+    checked against the secret token, parsed and handed to bot.process_new_updates, then answered
+    at once: with a DispatchingTeleBot the update is only queued for the chat's worker, so Telegram
+    never waits for a handler and the next update can be delivered right away.
+    """
+
+    def __init__(self, bot, host="0.0.0.0", port=8443, path="/", secret_token=None, certificate=None, private_key=None):
+        self.bot = bot
+        self.path = "/" + path.strip("/")
+        self.secret_token = secret_token
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        if certificate:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certificate, private_key)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = None
+
+    @property
+    def port(self):
+        """
+        port: The port the server listens on, useful when it was created with port 0.
+        """
+        return self._server.server_address[1]
+
+    def accept(self, body, secret_token):
+        """
+        accept(body, secret_token): Handles the body of one webhook request and returns the HTTP
+        status to answer with: 403 for a wrong secret token, 400 for a body that is not an update
+        and 200 once the update has been handed to the bot.
+        """
+        if self.secret_token and not hmac.compare_digest((secret_token or "").encode(), self.secret_token.encode()):
+            return 403
+        try:
+            update = telebot.types.Update.de_json(json.loads(body))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return 400
+        self.bot.process_new_updates([update])
+        return 200
+
+    def serve_forever(self):
+        """
+        serve_forever(): Handles webhook requests until shutdown() is called.
+        """
+        self._server.serve_forever()
+
+    def start(self):
+        """
+        start(): Serves webhook requests on a background thread and returns the server.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """
+        shutdown(): Stops serving and closes the listening socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if self.path.split("?")[0].rstrip("/") != webhook.path.rstrip("/"):
+                    status = 404
+                elif length < 0:
+                    status = 400
+                elif length > MAX_BODY_BYTES:
+                    status = 413
+                else:
+                    try:
+                        status = webhook.accept(self.rfile.read(length), self.headers.get(SECRET_HEADER))
+                    except Exception as e:
+                        logging.exception(str(e))
+                        status = 500
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                if status in (404, 413) or length < 0:
+                    # the body was not read, so the connection cannot carry another request
+                    self.send_header("Connection", "close")
+                    self.close_connection = True
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
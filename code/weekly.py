@@ -26,6 +26,8 @@ SOFTWARE.
 """
 
 import helper
+import graphing
+import render
 import matplotlib
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -36,7 +38,6 @@ def run(message, bot):
     Displays Weekly user expenditure line chart with and without category wise grouping.
     :return: None (Sends image to bot)
     """
-    helper.read_json()
     chat_id = message.chat.id
     user_history = helper.getUserHistory(chat_id)
     if user_history == None:
@@ -45,18 +46,17 @@ def run(message, bot):
         )
     else:
         try:
-            charts = create_chart_for_weekly_analysis(user_history, chat_id)
+            charts = render.chart(create_chart_for_weekly_analysis, user_history, chat_id, chat_id=chat_id)
             for chart in charts:
-                with open(chart, "rb") as f:
-                    bot.send_photo(chat_id, f)
+                bot.send_photo(chat_id, chart)
         except Exception as e:
-            print("Exception occurred : " + e)
+            print("Exception occurred : " + str(e))
             bot.reply_to(message, "Oops! Could not create weekly analysis chart")
 
 def create_chart_for_weekly_analysis(user_history, userid):
     result = []
 
-    user_history_split = [item.split(',') for item in user_history]
+    user_history_split = [(item.date, item.category, item.amount) for item in user_history]
     df = pd.DataFrame(user_history_split, columns=["Date", "Category", "Cost"])
 
     # Convert 'Cost' column to numeric
@@ -81,9 +81,7 @@ def create_chart_for_weekly_analysis(user_history, userid):
     plt.ylabel('Total Cost')
     plt.title('Total Cost Over Time')
     plt.grid(True)
-    fig_name = "data/{}_weekly_analysis.png".format(userid)
-    plt.savefig(fig_name,bbox_inches="tight")
-    result.append(fig_name)
+    result.append(graphing.to_png(bbox_inches="tight"))
 
     # Group by year, week, and category, calculate the total cost for each group
     grouped_data = df.groupby(['Year', 'Week', 'Category']).agg({'Cost': 'sum'}).reset_index()
@@ -101,8 +99,6 @@ def create_chart_for_weekly_analysis(user_history, userid):
     plt.title('Total Cost Over Time by Category')
     plt.legend()
     plt.grid(True)
-    fig_name="data/{}_weekly_analysis_by_category.png".format(userid)
-    plt.savefig(fig_name,bbox_inches="tight")
-    result.append(fig_name)
+    result.append(graphing.to_png(bbox_inches="tight"))
 
     return result
\ No newline at end of file
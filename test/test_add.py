@@ -49,6 +49,19 @@ def test_run(mock_telebot, mocker):
     assert mc.send_message.called
 
 
+@patch("telebot.telebot")
+def test_run_calendar_selection_uses_callback_chat(mock_telebot, mocker):
+    mc = mock_telebot.return_value
+    mocker.patch.object(add, "category_selection")
+
+    add.run(create_message("hello from test run!"), mc)
+    calendar_handler = mc.callback_query_handler.return_value.call_args[0][0]
+    callback = mocker.MagicMock()
+    callback.data = "cbcal_0_s_d_{}_{}_{}".format(date.year, date.month, date.day)
+    calendar_handler(callback)
+    add.category_selection.assert_called_with(callback.message, mc, date)
+
+
 @patch("telebot.telebot")
 def test_post_category_selection_working(mock_telebot, mocker):
     mc = mock_telebot.return_value
@@ -0,0 +1,95 @@
+"""
+File: test_aggregate.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from datetime import date
+from code import aggregate, display, estimate, helper, predict, records
+
+MOCK_HISTORY = [
+    records.Expense.create(date(2024, 1, 30), "Food", "2.50"),
+    records.Expense.create(date(2024, 1, 31), "Transport", "10"),
+    records.Expense.create(date(2024, 2, 1), "Food", "1.25"),
+    "05-Feb-2024,Fast Food,4.00",
+]
+
+
+def test_from_history_keeps_first_appearance_order():
+    table = aggregate.ExpenseTable.from_history(MOCK_HISTORY)
+    assert table.categories == ["Food", "Transport", "Fast Food"]
+    assert table.sum_by_category() == {"Food": 375, "Transport": 1000, "Fast Food": 400}
+    assert table.count_by_category() == {"Food": 2, "Transport": 1, "Fast Food": 1}
+
+
+def test_from_history_returns_table_unchanged():
+    table = aggregate.ExpenseTable.from_history(MOCK_HISTORY)
+    assert aggregate.ExpenseTable.from_history(table) is table
+
+
+def test_empty_table():
+    table = aggregate.ExpenseTable.from_history([])
+    assert len(table) == 0
+    assert table.total() == 0
+    assert table.sum_by_category() == {}
+    assert table.sum_by_month() == {}
+    assert table.day_span() == 0
+    assert table.first_day() is None
+
+
+def test_filters():
+    table = aggregate.ExpenseTable.from_history(MOCK_HISTORY)
+    assert table.on_day(date(2024, 1, 31)).sum_by_category() == {"Transport": 1000}
+    assert table.in_month(2024, 2).total() == 525
+    assert table.in_month(2023, 12).total() == 0
+    assert table.between(date(2024, 1, 31), date(2024, 2, 1)).total() == 1125
+    assert table.for_category("Food").total() == 375
+    assert table.for_category("Rent").total() == 0
+
+
+def test_group_by_day_week_month():
+    table = aggregate.ExpenseTable.from_history(MOCK_HISTORY)
+    assert table.sum_by_month() == {(2024, 1): 1250, (2024, 2): 525}
+    assert table.count_by_month() == {(2024, 1): 2, (2024, 2): 2}
+    assert table.sum_by_day()[date(2024, 2, 1).toordinal()] == 125
+    # 29-Jan-2024 and 05-Feb-2024 are Mondays
+    assert table.sum_by_week() == {date(2024, 1, 29).toordinal(): 1375, date(2024, 2, 5).toordinal(): 400}
+
+
+def test_date_range():
+    table = aggregate.ExpenseTable.from_history(MOCK_HISTORY)
+    assert table.first_day() == date(2024, 1, 30).toordinal()
+    assert table.last_day() == date(2024, 2, 5).toordinal()
+    assert table.day_span() == 7
+    assert table.distinct_days() == 4
+
+
+def test_callers_agree():
+    total_text, total_dict = display.calculate_spendings(MOCK_HISTORY)
+    assert total_dict == {"Food": 3.75, "Transport": 10.0, "Fast Food": 4.0}
+    assert total_text == "Food $3.75\nTransport $10.0\nFast Food $4.0\n"
+    assert estimate.calculate_estimate(MOCK_HISTORY, 4) == "Food $3.75\nTransport $10.0\nFast Food $4.0\n"
+    assert helper.calculate_total_spendings(MOCK_HISTORY) == 17.75
+    assert helper.calculate_total_spendings_for_category(MOCK_HISTORY, "Food") == 3.75
+    assert predict.predict_category_spending(MOCK_HISTORY[:3]) == round(13.75 / 3 * 30, 2)
@@ -0,0 +1,146 @@
+"""
+File: test_alerts.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+from datetime import date, timedelta
+from code import add, alerts, edit, records, totals
+
+TODAY = date.today()
+LAST_MONTH = TODAY.replace(day=1) - timedelta(days=1)
+
+
+class User:
+    def __init__(self, overall="0", category=None):
+        self.history = []
+        self.overall = overall
+        self.category = category
+
+    def install(self, mocker):
+        mocker.patch.object(alerts.helper, "getOverallBudget", side_effect=lambda chat_id: self.overall)
+        mocker.patch.object(alerts.helper, "getCategoryBudget", side_effect=lambda chat_id: self.category)
+        mocker.patch.object(alerts.helper, "getUserTotals", side_effect=lambda chat_id: totals.SpendingTotals(self.history))
+
+    def add(self, engine, day, category, amount):
+        expense = records.Expense.create(day, category, amount)
+        self.history.append(expense)
+        return engine.evaluate(7, added=[expense], today=TODAY)
+
+
+def test_thresholds_fire_once_per_month(mocker):
+    user = User(category={"Food": "100"})
+    user.install(mocker)
+    engine = alerts.AlertEngine(dispatch=lambda batch: None)
+    assert user.add(engine, TODAY, "Food", "50") == []
+    assert user.add(engine, TODAY, "Food", "30") == [alerts.BudgetAlert(7, "Food", 80, 8000, 10000)]
+    assert user.add(engine, TODAY, "Food", "5") == []
+    assert user.add(engine, TODAY, "Food", "20") == [alerts.BudgetAlert(7, "Food", 100, 10500, 10000)]
+    assert user.add(engine, TODAY, "Food", "20") == []
+    assert user.add(engine, TODAY, "Groceries", "500") == []
+    engine.close()
+
+
+def test_overall_budget_and_highest_threshold(mocker):
+    user = User(overall="100", category={"Food": "0"})
+    user.install(mocker)
+    engine = alerts.AlertEngine(dispatch=lambda batch: None)
+    assert user.add(engine, TODAY, "Food", "150") == [alerts.BudgetAlert(7, alerts.OVERALL, 100, 15000, 10000)]
+    assert user.add(engine, TODAY, "Food", "1") == []
+    engine.close()
+
+
+def test_other_months_and_decreases_are_ignored(mocker):
+    user = User(overall="100")
+    user.install(mocker)
+    engine = alerts.AlertEngine(dispatch=lambda batch: None)
+    assert user.add(engine, LAST_MONTH, "Food", "150") == []
+    expense = records.Expense.create(TODAY, "Food", "90")
+    user.history.append(expense)
+    smaller = expense._replace(cents=1000)
+    user.history[-1] = smaller
+    assert engine.evaluate(7, removed=[expense], added=[smaller], today=TODAY) == []
+    engine.close()
+
+
+def test_edit_can_cross_a_threshold(mocker):
+    user = User(overall="100")
+    user.install(mocker)
+    engine = alerts.AlertEngine(dispatch=lambda batch: None)
+    assert user.add(engine, TODAY, "Food", "10") == []
+    bigger = user.history[0]._replace(cents=9000)
+    user.history[0] = bigger
+    assert engine.evaluate(7, removed=[bigger._replace(cents=1000)], added=[bigger], today=TODAY) == [
+        alerts.BudgetAlert(7, alerts.OVERALL, 80, 9000, 10000)
+    ]
+    engine.close()
+
+
+def test_alerts_are_dispatched_in_background(mocker):
+    user = User(overall="10")
+    user.install(mocker)
+    sent = []
+    done = threading.Event()
+    engine = alerts.AlertEngine(dispatch=lambda batch: sent.extend(batch) or done.set())
+    expense = records.Expense.create(TODAY, "Food", "12.5")
+    user.history.append(expense)
+    fired = engine.check(7, added=[expense])
+    assert done.wait(5)
+    assert sent == fired and sent[0].chat_id == 7
+    assert sent[0].message == "<b>Budget for Overall exceeded by $2.50 !!!!</b>"
+    engine.close()
+
+
+def test_message_below_budget():
+    alert = alerts.BudgetAlert(7, "Food", 80, 8000, 10000)
+    assert alert.message == "<b>You have used 80% of your Food budget</b>\n$80.00 of $100.00 spent this month."
+
+
+def test_check_logs_errors(mocker):
+    mocker.patch.object(alerts.helper, "getOverallBudget", side_effect=KeyError("budget"))
+    engine = alerts.AlertEngine(dispatch=lambda batch: None)
+    assert engine.check(7, added=[records.Expense.create(TODAY, "Food", "1")]) == []
+    engine.close()
+
+
+def test_add_and_edit_check_alerts(mocker):
+    check = mocker.patch.object(alerts, "check")
+    mocker.patch.object(add, "alerts", alerts)
+    mocker.patch.object(add, "helper")
+    expense = records.Expense.create(TODAY, "Food", "1")
+    add.add_user_record(7, expense)
+    check.assert_called_with(7, added=[expense])
+    mocker.patch.object(edit, "alerts", alerts)
+    mocker.patch.object(edit, "helper")
+    edit.helper.getUserExpense.return_value = expense
+    m = mocker.Mock()
+    m.chat.id = 7
+    edit.update_record(mocker.Mock(), m, expense.id, [], "Amount", lambda record: record._replace(cents=500))
+    check.assert_called_with(7, removed=[expense], added=[expense._replace(cents=500)])
+
+
+def test_check_without_engine():
+    alerts.close()
+    assert alerts.check(7, added=[records.Expense.create(TODAY, "Food", "1")]) == []
@@ -0,0 +1,78 @@
+"""
+File: test_code.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "code")
+
+STARTUP = """
+import json, runpy, sys, types
+bot_globals = runpy.run_path(sys.argv[1], run_name="bot")
+commands = sorted(c for h in bot_globals["bot"].message_handlers for c in h["filters"].get("commands") or [])
+callbacks = [h["function"].__name__ for h in bot_globals["bot"].callback_query_handlers]
+loaded = [m for m in sys.modules if m in bot_globals["lazy_commands"].values()]
+calls = []
+sys.modules["fake_feature"] = types.SimpleNamespace(run=lambda message, bot: calls.append(message))
+bot_globals["lazy_command"]("fake_feature")("/fake")
+print(json.dumps({"commands": commands, "callbacks": callbacks, "loaded": loaded, "calls": calls,
+                  "heavy": [m for m in ("pandas", "numpy", "matplotlib", "fpdf", "smtplib") if m in sys.modules]}))
+"""
+
+
+def start_bot(tmp_path):
+    (tmp_path / "user.properties").write_text("api_token=123456:TEST\nrender_workers=0\n")
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(CODE_DIR))
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP, os.path.abspath(os.path.join(CODE_DIR, "code.py"))],
+        cwd=tmp_path, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_startup_does_not_import_features(tmp_path):
+    result = start_bot(tmp_path)
+    assert result["loaded"] == []
+    assert result["heavy"] == []
+
+
+def test_every_command_is_registered(tmp_path):
+    result = start_bot(tmp_path)
+    for command in ("add", "history", "pdf", "weekly", "monthly", "sendEmail", "verify", "help", "start"):
+        assert command in result["commands"]
+
+
+def test_lazy_command_runs_module(tmp_path):
+    result = start_bot(tmp_path)
+    assert result["calls"] == ["/fake"]
+
+
+def test_callbacks_are_registered(tmp_path):
+    result = start_bot(tmp_path)
+    assert "callback_history" in result["callbacks"]
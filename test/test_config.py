@@ -0,0 +1,44 @@
+"""
+File: test_config.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from code import config
+
+
+def test_config_is_read_once(tmp_path, monkeypatch):
+    path = tmp_path / "user.properties"
+    path.write_text("api_token=123:TEST\nrender_workers=0\n")
+    monkeypatch.setattr(config, "PATH", str(path))
+    config.reset()
+    try:
+        assert config.get("api_token") == "123:TEST"
+        assert config.get("missing", "default") == "default"
+        path.write_text("api_token=changed\n")
+        assert config.get("api_token") == "123:TEST"
+        config.reset()
+        assert config.get("api_token") == "changed"
+    finally:
+        config.reset()
@@ -27,7 +27,7 @@ SOFTWARE.
 
 import os
 import json
-from code import delete
+from code import delete, records
 from mock import patch
 from mock import MagicMock, patch
 from telebot import types
@@ -56,14 +56,28 @@ def create_message(text):
 @patch("telebot.telebot")
 def test_delete_with_no_data(mock_telebot, mocker):
     mocker.patch.object(delete, "helper")
-    delete.helper.read_json.return_value = {}
-    delete.helper.write_json.return_value = True
+    delete.helper.getUserData.return_value = None
     MOCK_Message_data = create_message("Hello")
     mc = mock_telebot.return_value
     mc.send_message.return_value = True
     delete.run(MOCK_Message_data, mc)
-    if delete.helper.write_json.called is False:
-        assert True
+    delete.helper.getUserData.assert_called_with(MOCK_Message_data.chat.id)
+    assert not delete.helper.read_json.called
+    assert "No records there to be deleted" in mc.send_message.call_args[0][1]
+    assert not mc.register_next_step_handler.called
+
+
+@patch("telebot.telebot")
+def test_delete_with_data_offers_picker(mock_telebot, mocker):
+    mocker.patch.object(delete, "helper")
+    mocker.patch.object(delete, "picker")
+    delete.helper.getDateFormat.return_value = "%d-%b-%Y"
+    delete.helper.getMonthFormat.return_value = "%b-%Y"
+    delete.helper.getUserData.return_value = {"data": [records.parse("28-Oct-2021,Food,2.3")], "budget": {}}
+    mc = mock_telebot.return_value
+    delete.run(create_message("Hello"), mc)
+    delete.picker.picker_markup.assert_called_with(delete.helper.getUserData.return_value["data"], "delete")
+    assert mc.register_next_step_handler.call_args[0][1] == delete.process_delete_argument
 
 
 @patch("telebot.telebot")
@@ -135,16 +149,16 @@ def test_process_delete_argument_with_invalid_date(mock_telebot, mocker):
     # Assert that the bot replied with an error message
     mock_bot.reply_to.assert_called_with(MOCK_Message_data, "No transactions within invalid_date")
 
-def test_deleteHistory():
-    # Mock user_list
-    delete.user_list = {"sample_chat_id": {"data": ["record1", "record2"], "budget": {"overall": "100", "category": {"food": "50"}}}}
+def test_deleteHistory(mocker):
+    mocker.patch.object(delete, "helper")
 
     # Call deleteHistory function
-    result = delete.deleteHistory("sample_chat_id")
+    delete.deleteHistory("sample_chat_id")
 
-    # Assert that the data is cleared in the result
-    expected_result = {"sample_chat_id": {"data": [], "budget": {"overall": "0", "category": {}}}}
-    assert result == expected_result
+    # Assert that only this user's data and budget are cleared
+    delete.helper.saveUserHistory.assert_called_once_with("sample_chat_id", [])
+    delete.helper.updateUserBudget.assert_called_once_with("sample_chat_id", {"overall": "0", "category": {}})
+    assert not delete.helper.write_json.called
 
 @patch("telebot.telebot")
 def test_handle_confirmation_yes(mock_telebot, mocker):
@@ -154,36 +168,47 @@ def test_handle_confirmation_yes(mock_telebot, mocker):
     MOCK_Message_data = create_message("yes")
     MOCK_Message_data.text = "yes"  # Set the text attribute explicitly
 
-    # Mock the user_list
-    delete.user_list = {"sample_chat_id": {"data": ["record1", "record2"], "budget": {"overall": "100", "category": {"food": "50"}}}}
-
     # Mock the bot instance
     mock_bot = mock_telebot.return_value
     MOCK_Message_data.bot = mock_bot
 
-    # Use mocker.patch to replace delete.helper.write_json with a MagicMock
-    mock_write_json = mocker.patch.object(delete.helper, "write_json")
-
-        # Use mocker.patch to replace delete.helper.read_json with a MagicMock
-    mock_read_json = mocker.patch.object(delete.helper, "read_json", side_effect=lambda: expected_user_list)
-
     # Call the function being tested
     delete.handle_confirmation(MOCK_Message_data, mock_bot, ["record1", "record2"])
 
-    expected_user_list = {"sample_chat_id": {"data": [], "budget": {"overall": "100", "category": {"food": "50"}}}}
-        # Debugging: Print the values for investigation
-    print("delete.user_list:", delete.user_list)
-    print("expected_user_list:", expected_user_list)
+    # Assert that only the confirmed records of this user were deleted
+    delete.helper.deleteUserRecords.assert_called_once_with("894127939", ["record1", "record2"])
+    mock_bot.send_message.assert_called_with(MOCK_Message_data.chat.id, "Successfully deleted records")
 
-    # Assert that delete.helper.write_json was called with the correct arguments
-    mock_write_json.assert_called_with(delete.user_list)
+@patch("telebot.telebot")
+def test_callback_pick_asks_confirmation(mock_telebot, mocker):
+    mocker.patch.object(delete, "helper")
+    record = records.parse("28-Oct-2021,Food,2.3")._replace(uid=7)
+    delete.helper.getUserExpense.return_value = record
+    mock_bot = mock_telebot.return_value
+    call = mocker.Mock(data="delete:pick:" + record.id)
+    delete.callback(call, mock_bot)
+    mock_bot.clear_step_handler_by_chat_id.assert_called_with(call.message.chat.id)
+    assert mock_bot.register_next_step_handler.call_args[0][1:] == (delete.handle_expense_confirmation, mock_bot, record)
+    mock_bot.answer_callback_query.assert_called_with(call.id)
 
-    # Reload delete.user_list from the file to synchronize it with the changes made during handle_confirmation
-    delete.user_list = mock_read_json()
 
-    # Debugging: Print the values after reloading
-    print("delete.user_list (after reload):", delete.user_list)
+@patch("telebot.telebot")
+def test_callback_pick_missing_expense(mock_telebot, mocker):
+    mocker.patch.object(delete, "helper")
+    delete.helper.getUserExpense.return_value = None
+    mock_bot = mock_telebot.return_value
+    delete.callback(mocker.Mock(data="delete:pick:gone"), mock_bot)
+    assert not mock_bot.register_next_step_handler.called
+    assert "no longer exists" in mock_bot.send_message.call_args[0][1]
 
-    # Assert that delete.user_list is updated
 
-    assert delete.user_list == expected_user_list
\ No newline at end of file
+@patch("telebot.telebot")
+def test_handle_expense_confirmation_deletes_one(mock_telebot, mocker):
+    mocker.patch.object(delete, "helper")
+    record = records.parse("28-Oct-2021,Food,2.3")
+    mock_bot = mock_telebot.return_value
+    message = create_message("Yes")
+    message.text = "Yes"
+    delete.handle_expense_confirmation(message, mock_bot, record)
+    delete.helper.deleteUserRecord.assert_called_once_with("894127939", record)
+    assert not delete.helper.deleteUserRecords.called
@@ -0,0 +1,92 @@
+"""
+File: test_dispatcher.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+import time
+from mock import MagicMock, patch
+from code import dispatcher
+
+
+def create_update(update_id, chat_id):
+    update = MagicMock()
+    update.update_id = update_id
+    update.message.chat.id = chat_id
+    return update
+
+
+def test_get_chat_id():
+    assert dispatcher.get_chat_id(create_update(1, 11)) == 11
+    query = MagicMock(message=None, edited_message=None, channel_post=None, edited_channel_post=None)
+    query.callback_query.message.chat.id = 12
+    assert dispatcher.get_chat_id(query) == 12
+    other = MagicMock(message=None, edited_message=None, channel_post=None, edited_channel_post=None, callback_query=None)
+    assert dispatcher.get_chat_id(other) is None
+
+
+def test_tasks_of_one_chat_run_in_order():
+    chat_dispatcher = dispatcher.ChatDispatcher(workers=4)
+    seen = []
+
+    def task(i):
+        time.sleep(0.01 * (5 - i))
+        seen.append(i)
+
+    for i in range(5):
+        chat_dispatcher.submit(11, task, i)
+    chat_dispatcher.shutdown()
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_slow_chat_does_not_block_other_chats():
+    chat_dispatcher = dispatcher.ChatDispatcher(workers=2)
+    release = threading.Event()
+    done = threading.Event()
+    chat_dispatcher.submit(11, release.wait, 5)
+    chat_dispatcher.submit(12, done.set)
+    assert done.wait(1)
+    release.set()
+    chat_dispatcher.shutdown()
+
+
+def test_failing_task_does_not_stop_the_chat():
+    chat_dispatcher = dispatcher.ChatDispatcher(workers=1)
+    done = threading.Event()
+    chat_dispatcher.submit(11, MagicMock(side_effect=Exception("boom")))
+    chat_dispatcher.submit(11, done.set)
+    chat_dispatcher.shutdown()
+    assert done.is_set()
+
+
+@patch("telebot.TeleBot.process_new_updates")
+def test_bot_groups_updates_by_chat(mock_process):
+    bot = dispatcher.DispatchingTeleBot("123:TEST", workers=2)
+    updates = [create_update(1, 11), create_update(2, 12), create_update(3, 11)]
+    bot.process_new_updates(updates)
+    assert bot.last_update_id == 3
+    bot.dispatcher.shutdown()
+    mock_process.assert_any_call([updates[0], updates[2]])
+    mock_process.assert_any_call([updates[1]])
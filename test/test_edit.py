@@ -29,13 +29,14 @@ import datetime
 
 from mock import patch
 from telebot import types
-from code import edit
+from code import edit, timeline
 
 MOCK_CHAT_ID = 101
-MOCK_USER_DATA = {
-    str(MOCK_CHAT_ID): {"data": ["correct_mock_value"]},
-    "102": {"data": ["wrong_mock_value"]},
-}
+MOCK_HISTORY = [
+    record._replace(uid=uid)
+    for uid, record in enumerate(timeline.order_history(["28-Oct-2021,Food,2.3", "29-Oct-2021,Groceries,20.0"]), 1)
+]
+MOCK_RECORD = MOCK_HISTORY[0]
 
 DUMMY_DATE = str(datetime.datetime.now())
 
@@ -45,57 +46,64 @@ def test_run(mock_telebot, mocker):
     mc = mock_telebot.return_value
     mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
+    edit.helper.getUserHistory.return_value = MOCK_HISTORY
     message = create_message("hello from test run!")
-    edit.helper.getUserHistory(message.chat.id).return_value = MOCK_USER_DATA[
-        str(MOCK_CHAT_ID)
-    ]["data"]
     edit.run(message, mc)
-    assert mc.reply_to.called
+    markup = mc.reply_to.call_args[1]["reply_markup"]
+    assert [row[0].callback_data for row in markup.keyboard] == ["edit:pick:" + MOCK_HISTORY[1].id, "edit:pick:" + MOCK_RECORD.id]
 
 
 @patch("telebot.telebot")
-def test_select_category_to_be_updated(mock_telebot, mocker):
+def test_run_without_history(mock_telebot, mocker):
     mc = mock_telebot.return_value
-    mc.reply_to.return_value = True
-    message = create_message("hello from testing!")
-    edit.select_category_to_be_updated(message, mc)
-    assert mc.reply_to.called
+    mocker.patch.object(edit, "helper")
+    edit.helper.getUserHistory.return_value = []
+    edit.run(create_message("hello from test run!"), mc)
+    assert mc.send_message.called
+    assert not mc.reply_to.called
 
 
 @patch("telebot.telebot")
-def test_select_category_selection_no_matching_choices(mock_telebot, mocker):
+def test_callback_pick(mock_telebot, mocker):
     mc = mock_telebot.return_value
-    mc.send_message.return_value = []
-    mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
-    edit.helper.getChoices().return_value = None
-    message = create_message("hello from testing!")
-    edit.select_category_to_be_updated(message, mc)
-    assert mc.reply_to.called
+    edit.helper.getUserExpense.return_value = MOCK_RECORD
+    call = mocker.Mock(data="edit:pick:" + MOCK_RECORD.id)
+    edit.callback(call, mc)
+    edit.helper.getUserExpense.assert_called_with(call.message.chat.id, MOCK_RECORD.id)
+    assert mc.register_next_step_handler.call_args[0][3] == MOCK_RECORD.id
+    mc.answer_callback_query.assert_called_with(call.id)
 
 
 @patch("telebot.telebot")
-def test_post_category_selection_no_matching_category(mock_telebot, mocker):
+def test_callback_page(mock_telebot, mocker):
     mc = mock_telebot.return_value
-    mc.send_message.return_value = []
-    mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
-    edit.helper.getSpendCategories.return_value = None
+    edit.helper.getUserHistory.return_value = MOCK_HISTORY
+    edit.callback(mocker.Mock(data="edit:page:1"), mc)
+    assert mc.edit_message_reply_markup.called
+
+
+@patch("telebot.telebot")
+def test_select_category_to_be_updated(mock_telebot, mocker):
+    mc = mock_telebot.return_value
+    mocker.patch.object(edit, "helper")
+    edit.helper.getUserExpense.return_value = MOCK_RECORD
     message = create_message("hello from testing!")
-    edit.select_category_to_be_updated(message, mc)
-    assert mc.reply_to.called
+    edit.select_category_to_be_updated(message, mc, MOCK_RECORD.id)
+    markup = mc.send_message.call_args[1]["reply_markup"]
+    assert [row[0]["text"] for row in markup.keyboard] == ["Date=28-Oct-2021", "Category=Food", "Amount=$2.3"]
 
 
 @patch("telebot.telebot")
-def test_post_amount_input_nonworking(mock_telebot, mocker):
+def test_select_category_to_be_updated_missing_expense(mock_telebot, mocker):
     mc = mock_telebot.return_value
-    mc.send_message.return_value = True
-    mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
-    edit.helper.validate_entered_amount.return_value = 0
+    edit.helper.getUserExpense.return_value = None
     message = create_message("hello from testing!")
-    edit.select_category_to_be_updated(message, mc)
-    assert mc.reply_to.called
+    edit.select_category_to_be_updated(message, mc, "gone")
+    assert "no longer exists" in mc.send_message.call_args[0][1]
+    assert not mc.register_next_step_handler.called
 
 
 @patch("telebot.telebot")
@@ -105,26 +113,24 @@ def test_enter_updated_data(mock_telebot, mocker):
     mocker.patch.object(edit, "helper")
     edit.helper.getSpendCategories.return_value = []
     message = create_message("hello from testing!")
-    selected_data = MOCK_USER_DATA[str(MOCK_CHAT_ID)]["data"][0]
-    updated = ""
-    edit.enter_updated_data(message, mc, selected_data, updated)
+    edit.enter_updated_data(message, mc, MOCK_RECORD.id, [])
     assert not mc.reply_to.called
 
+
 @patch("telebot.telebot")
 def test_edit_category(mock_telebot, mocker):
     mc = mock_telebot.return_value
     mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
-    edit.helper.read_json().return_value = MOCK_USER_DATA
-    edit.helper.getUserHistory(MOCK_CHAT_ID).return_value = MOCK_USER_DATA[
-        str(MOCK_CHAT_ID)
-    ]["data"]
-    message = create_message("hello from testing!")
-    message.chat.id = MOCK_CHAT_ID
-    selected_data = list(MOCK_USER_DATA[str(MOCK_CHAT_ID)]["data"][0])
-    updated = ["","",""]
-    edit.edit_cat(message, mc, selected_data, updated)
+    edit.helper.getUserExpense.return_value = MOCK_RECORD
+    message = create_message("Groceries")
+    message.text = "Groceries"
+    updated = []
+    edit.edit_cat(message, mc, MOCK_RECORD.id, updated)
+    edit.helper.replaceUserRecord.assert_called_with(message.chat.id, MOCK_RECORD, MOCK_RECORD._replace(category="Groceries"))
+    assert updated == ["Category"]
     assert mc.reply_to.called
+    assert mc.register_next_step_handler.call_args[0][3] == MOCK_RECORD._replace(category="Groceries").id
 
 
 @patch("telebot.telebot")
@@ -132,19 +138,43 @@ def test_edit_cost(mock_telebot, mocker):
     mc = mock_telebot.return_value
     mc.reply_to.return_value = True
     mocker.patch.object(edit, "helper")
-    edit.helper.read_json().return_value = MOCK_USER_DATA
-    edit.helper.getUserHistory(MOCK_CHAT_ID).return_value = MOCK_USER_DATA[
-        str(MOCK_CHAT_ID)
-    ]["data"]
+    edit.helper.getUserExpense.return_value = MOCK_RECORD
+    edit.helper.validate_entered_amount.return_value = "5.5"
+    message = create_message("5.5")
+    message.text = "5.5"
+    edit.edit_cost(message, mc, MOCK_RECORD.id, ["Date", "Category"])
+    edit.helper.replaceUserRecord.assert_called_with(message.chat.id, MOCK_RECORD, MOCK_RECORD._replace(cents=550))
+    assert not mc.register_next_step_handler.called
+
+
+@patch("telebot.telebot")
+def test_edit_cost_invalid(mock_telebot, mocker):
+    mc = mock_telebot.return_value
+    mc.reply_to.return_value = True
+    mocker.patch.object(edit, "helper")
     edit.helper.validate_entered_amount.return_value = 0
     message = create_message("hello from testing!")
-    message.chat.id = MOCK_CHAT_ID
-    selected_data = list(MOCK_USER_DATA[str(MOCK_CHAT_ID)]["data"][0])
-    updated = ["","",""]
-    edit.edit_cost(message, mc, selected_data, updated)
+    edit.edit_cost(message, mc, MOCK_RECORD.id, [])
+    assert not edit.helper.replaceUserRecord.called
     assert mc.reply_to.called
 
 
+
+@patch("telebot.telebot")
+def test_update_record_deleted_before_replace(mock_telebot, mocker):
+    mc = mock_telebot.return_value
+    mocker.patch.object(edit, "helper")
+    mocker.patch.object(edit, "alerts")
+    edit.helper.getUserExpense.return_value = MOCK_RECORD
+    edit.helper.replaceUserRecord.return_value = False
+    message = create_message("5.5")
+    assert edit.update_record(mc, message, MOCK_RECORD.id, [], "Amount", lambda record: record._replace(cents=550)) is None
+    assert not edit.alerts.check.called
+    assert "no longer exists" in mc.send_message.call_args[0][1]
+    assert not mc.reply_to.called
+    assert not mc.register_next_step_handler.called
+
+
 def create_message(text):
     params = {"messagebody": text}
     chat = types.User(11, False, "test")
@@ -74,3 +74,20 @@ def test_visualize(mocker):
     graphing.visualize(dummy_total_text_data, dummy_monthly_budget)
     # graphing.plt.bar.assert_called_with(r2,
     # ANY, width=width, label='your spendings')
+
+
+def test_charts_are_png_buffers():
+    charts = [
+        graphing.visualize(dummy_total_text_data, dummy_monthly_budget),
+        graphing.viewBudget(dummy_monthly_budget),
+        graphing.overall_split(dummy_monthly_budget),
+        graphing.spend_wise_split(dummy_categ_val),
+        graphing.remaining({"Food": 40.0, "Transport": 75.0}),
+        graphing.time_series({"28-Oct-2021": 2.3, "29-Oct-2021": 20.0}),
+    ]
+    for chart in charts:
+        assert chart.getvalue().startswith(b"\x89PNG")
+
+
+def test_viewBudget_without_budget():
+    assert graphing.viewBudget({"Food": "0", "Transport": "0"}) is None
@@ -25,22 +25,24 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from code import helper
+from code import helper, records
+from datetime import date
 from code.helper import isCategoryBudgetByCategoryAvailable, throw_exception
 from mock import ANY
 from telebot import types
 from mock.mock import patch
+import json
 import logging
 import mock
 
 MOCK_CHAT_ID = 894127939
 MOCK_USER_DATA = {
     str(MOCK_CHAT_ID): {
-        "data": ["correct_mock_value"],
+        "data": ["28-Oct-2021,Food,2.3"],
         "budget": {"overall": None, "category": None},
     },
     "102": {
-        "data": ["wrong_mock_value"],
+        "data": ["29-Oct-2021,Groceries,20.0"],
         "budget": {"overall": None, "category": None},
     },
 }
@@ -165,9 +167,14 @@ def test_validate_entered_amount_mixed():
         assert True
 
 
-def test_getUserHistory_without_data(mocker):
-    mocker.patch.object(helper, "read_json")
-    helper.read_json.return_value = {}
+def use_json_storage(mocker, tmp_path, content):
+    path = tmp_path / "expense_record.json"
+    path.write_text(content)
+    mocker.patch.object(helper, "_storage", helper.storage.JsonStorage(str(path)))
+
+
+def test_getUserHistory_without_data(mocker, tmp_path):
+    use_json_storage(mocker, tmp_path, "{}")
     result = helper.getUserHistory(MOCK_CHAT_ID)
     if result is None:
         assert True
@@ -175,19 +182,17 @@ def test_getUserHistory_without_data(mocker):
         assert False, "Result is not None when user data does not exist"
 
 
-def test_getUserHistory_with_data(mocker):
-    mocker.patch.object(helper, "read_json")
-    helper.read_json.return_value = MOCK_USER_DATA
+def test_getUserHistory_with_data(mocker, tmp_path):
+    use_json_storage(mocker, tmp_path, json.dumps(MOCK_USER_DATA))
     result = helper.getUserHistory(MOCK_CHAT_ID)
-    if result == MOCK_USER_DATA[str(MOCK_CHAT_ID)]["data"]:
+    if [str(record) for record in result] == MOCK_USER_DATA[str(MOCK_CHAT_ID)]["data"]:
         assert True
     else:
         assert False, "User data is available but not found"
 
 
-def test_getUserHistory_with_none(mocker):
-    mocker.patch.object(helper, "read_json")
-    helper.read_json.return_value = None
+def test_getUserHistory_with_none(mocker, tmp_path):
+    use_json_storage(mocker, tmp_path, "")
     result = helper.getUserHistory(MOCK_CHAT_ID)
     if result is None:
         assert True
@@ -254,11 +259,11 @@ def test_getChoices():
 
 
 def test_write_json(mocker):
-    mocker.patch.object(helper, "json")
-    helper.json.dump.return_value = True
+    mocker.patch.object(helper.storage, "json")
+    helper.storage.json.dump.return_value = True
     user_list = ["hello"]
     helper.write_json(user_list)
-    helper.json.dump.assert_called_with(user_list, ANY, ensure_ascii=ANY, indent=ANY)
+    helper.storage.json.dump.assert_called_with(user_list, ANY, ensure_ascii=ANY, indent=ANY)
 
 
 @patch("telebot.telebot")
@@ -391,3 +396,56 @@ def create_message(text):
     params = {"messagebody": text}
     chat = types.User(11, False, "test")
     return types.Message(1, None, None, chat, "text", params, "")
+
+
+def test_groupByCategory_exact_categories():
+    history = [
+        "28-Oct-2021,Food,2.3",
+        "28-Oct-2021,Fast Food,4.0",
+        "29-Oct-2021,Food,1.0",
+        "29-Oct-2021,Groceries,20.0",
+    ]
+    grouped = helper.groupByCategory(history)
+    assert list(grouped) == ["Food", "Fast Food", "Groceries"]
+    assert [str(record) for record in grouped["Food"]] == ["28-Oct-2021,Food,2.3", "29-Oct-2021,Food,1.0"]
+    assert [str(record) for record in grouped["Fast Food"]] == ["28-Oct-2021,Fast Food,4.0"]
+
+
+def test_groupByCategory_empty():
+    assert helper.groupByCategory([]) == {}
+    assert helper.groupByCategory(None) == {}
+
+
+def test_getCategoryWiseSpendings_only_available():
+    history = ["28-Oct-2021,Food,2.3", "29-Oct-2021,Groceries,20.0"]
+    result = helper.getCategoryWiseSpendings({"Food", "Transport"}, history)
+    assert list(result) == ["Food"]
+    assert result["Food"][0].cents == 230
+
+
+def test_getUserHistoryDateExpense_sums_days_in_order(mocker):
+    history = ["28-Oct-2021,Food,2.3", "28-Oct-2021,Groceries,20.0", "30-Oct-2021,Food,1.7"]
+    mocker.patch.object(helper, "queryUserHistory", return_value=iter(records.parse_all(history)))
+    assert helper.getUserHistoryDateExpense(MOCK_CHAT_ID) == {"28-Oct-2021": 22.3, "30-Oct-2021": 1.7}
+
+
+def test_getUserHistoryByDate_day_and_month(mocker):
+    query = mocker.patch.object(helper, "queryUserHistory", return_value=iter([]))
+    helper.getUserHistoryByDate(MOCK_CHAT_ID, "28-Oct-2021")
+    query.assert_called_with(MOCK_CHAT_ID, start=date(2021, 10, 28), end=date(2021, 10, 28))
+    helper.getUserHistoryByDate(MOCK_CHAT_ID, "Feb-2024")
+    query.assert_called_with(MOCK_CHAT_ID, start=date(2024, 2, 1), end=date(2024, 2, 29))
+    query.reset_mock()
+    assert helper.getUserHistoryByDate(MOCK_CHAT_ID, "yesterday") == []
+    assert not query.called
+
+
+def test_budget_category_changes_do_not_touch_cached_user(mocker):
+    cached = {"data": [], "budget": {"overall": "10", "category": {"Food": "5"}}}
+    mocker.patch.object(helper, "getUserData", return_value=cached)
+    update = mocker.patch.object(helper, "updateUserBudget")
+    helper.updateBudgetCategory(MOCK_CHAT_ID, "Groceries")
+    assert update.call_args[0][1]["category"] == {"Food": "5", "Groceries": "0"}
+    helper.deleteBudgetCategory(MOCK_CHAT_ID, "Food")
+    assert update.call_args[0][1]["category"] == {}
+    assert cached["budget"] == {"overall": "10", "category": {"Food": "5"}}
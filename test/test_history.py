@@ -27,7 +27,8 @@ SOFTWARE.
 
 import os
 import json
-from code import history
+from code import history, records
+from datetime import datetime
 from mock.mock import patch
 from telebot import types
 
@@ -57,7 +58,7 @@ def create_message(text):
 def test_run_with_data(mock_telebot, mocker):
     MOCK_USER_DATA = test_read_json()
     mocker.patch.object(history, "helper")
-    history.helper.getUserHistory.return_value = MOCK_USER_DATA["2614394724848"]
+    history.helper.getUserHistory.return_value = records.parse_all(MOCK_USER_DATA["2614394724848"])
     MOCK_Message_data = create_message("Hello")
     mc = mock_telebot.return_value
     mc.send_message.return_value = True
@@ -87,3 +88,54 @@ def test_run_with_None(mock_telebot, mocker):
     mc.reply_to.return_value = True
     history.run(MOCK_Message_data, mc)
     assert mc.reply_to.called
+
+
+def make_history(count):
+    return [records.Expense(datetime(2021, 10, 1).toordinal() + day, "Food", 100 * (day + 1)) for day in range(count)]
+
+
+def test_show_page_formats_only_page_rows():
+    user_history = make_history(25)
+    until = user_history[-1].day
+    text, markup = history.show_page(user_history, until, 0)
+    assert "25.0" in text and "16.0" in text and "15.0" not in text
+    assert "Page 1 of 3" in text
+    assert [button.text for button in markup.keyboard[0]] == ["Older >"]
+    assert markup.keyboard[0][0].callback_data == "history:{}:1".format(until)
+    text, markup = history.show_page(user_history, until, 2)
+    assert "Page 3 of 3" in text and "$ 5.0" in text
+    assert [button.callback_data for button in markup.keyboard[0]] == ["history:{}:1".format(until)]
+
+
+def test_show_page_single_page_has_no_buttons():
+    user_history = make_history(3)
+    text, markup = history.show_page(user_history, user_history[-1].day, 0)
+    assert markup is None
+    assert "Page 1 of 1" in text
+
+
+@patch("telebot.telebot")
+def test_callback_edits_page(mock_telebot, mocker):
+    mocker.patch.object(history, "helper")
+    user_history = make_history(25)
+    history.helper.getUserHistory.return_value = user_history
+    call = mocker.Mock(data="history:{}:1".format(user_history[-1].day))
+    mc = mock_telebot.return_value
+    history.callback(call, mc)
+    text = mc.edit_message_text.call_args[0][0]
+    assert "Page 2 of 3" in text
+    mc.answer_callback_query.assert_called_with(call.id)
+
+
+@patch("telebot.telebot")
+def test_run_hides_future_expenses(mock_telebot, mocker):
+    mocker.patch.object(history, "helper")
+    today = datetime.now().toordinal()
+    history.helper.getUserHistory.return_value = [
+        records.Expense(today - 1, "Food", 1234), records.Expense(today + 40, "Rent", 50000)
+    ]
+    mc = mock_telebot.return_value
+    history.run(create_message("Hello"), mc)
+    text = mc.send_message.call_args[0][1]
+    assert "12.34" in text
+    assert "500.0" not in text
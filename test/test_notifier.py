@@ -0,0 +1,118 @@
+"""
+File: test_notifier.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+from code import notifier, outbox
+
+
+class BotApi(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.messages = []
+        self.connections = set()
+        super().__init__(("127.0.0.1", 0), BotApiHandler)
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        fields = dict(parse_qsl(self.rfile.read(int(self.headers["Content-Length"])).decode()))
+        self.server.messages.append((self.path.rsplit("/", 1)[-1], fields))
+        body = json.dumps({"ok": True, "result": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_api(monkeypatch):
+    api = BotApi()
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    monkeypatch.setattr(notifier, "API_URL", "http://127.0.0.1:{}/bot{{0}}/{{1}}".format(api.server_address[1]))
+    return api
+
+
+def test_send_reuses_connection(monkeypatch):
+    api = start_api(monkeypatch)
+    sender = notifier.TelegramNotifier("123:TEST", parse_mode="HTML")
+    try:
+        assert sender.send("first", 11)
+        assert sender.send("second", 12)
+        assert [(method, fields["chat_id"], fields["text"]) for method, fields in api.messages] == [
+            ("sendMessage", "11", "first"), ("sendMessage", "12", "second")
+        ]
+        assert api.messages[0][1]["parse_mode"] == "HTML"
+        assert len(api.connections) == 1
+    finally:
+        sender.close()
+        api.shutdown()
+
+
+def test_send_many(monkeypatch):
+    api = start_api(monkeypatch)
+    sender = notifier.TelegramNotifier("123:TEST", pool_size=2)
+    try:
+        assert sender.send_many([(chat_id, "alert") for chat_id in range(6)]) == [True] * 6
+        assert sorted(int(fields["chat_id"]) for _, fields in api.messages) == list(range(6))
+        assert len(api.connections) <= 2
+    finally:
+        sender.close()
+        api.shutdown()
+
+
+def test_send_without_chat_id_does_not_poll(monkeypatch):
+    api = start_api(monkeypatch)
+    try:
+        assert not notifier.TelegramNotifier("123:TEST").send("lost")
+        assert api.messages == []
+    finally:
+        api.shutdown()
+
+
+def test_send_many_through_outbox(monkeypatch):
+    api = start_api(monkeypatch)
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=2)
+    sender = notifier.TelegramNotifier("123:TEST", pool_size=2, outbox=queue)
+    try:
+        assert sender.send_many([(chat_id, "alert") for chat_id in range(6)]) == [True] * 6
+        assert sender.send("one more", 7)
+        assert sorted(int(fields["chat_id"]) for _, fields in api.messages) == [0, 1, 2, 3, 4, 5, 7]
+        assert queue.stats()[outbox.BULK]["sent"] == 7
+    finally:
+        queue.close()
+        sender.close()
+        api.shutdown()
@@ -0,0 +1,63 @@
+"""
+File: test_notify.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from code import notify
+
+SETTINGS = {"api_token": "123:TEST", "send_workers": "8"}
+
+
+def test_notify_uses_shared_notifier(mocker):
+    notify.close()
+    mocker.patch.object(notify.config, "get", side_effect=lambda key, default=None: SETTINGS.get(key, default))
+    created = mocker.patch.object(notify, "TelegramNotifier")
+    notify.notify(11, "Food", "5.0")
+    notify.notify(12, "Food", "7.5")
+    created.assert_called_once_with("123:TEST", parse_mode="HTML", pool_size=8, outbox=notify.outbox.get())
+    created.return_value.send.assert_called_with("<b>Budget for Food exceeded by $7.5 !!!!</b>", 12)
+    notify.close()
+    created.return_value.close.assert_called_once_with()
+
+
+def test_notify_many(mocker):
+    notify.close()
+    mocker.patch.object(notify.config, "get", side_effect=lambda key, default=None: SETTINGS.get(key, default))
+    created = mocker.patch.object(notify, "TelegramNotifier")
+    notify.notify_many([(11, "Food", "5.0"), (12, "Groceries", "1.0")])
+    messages = list(created.return_value.send_many.call_args[0][0])
+    assert messages == [(11, notify.budget_message("Food", "5.0")), (12, notify.budget_message("Groceries", "1.0"))]
+    notify.close()
+
+
+def test_notifier_uses_configured_outbox(mocker):
+    notify.close()
+    mocker.patch.object(notify.config, "get", side_effect=lambda key, default=None: SETTINGS.get(key, default))
+    queue = notify.outbox.configure(workers=1)
+    try:
+        assert notify.get_notifier()._outbox is queue
+    finally:
+        notify.close()
+        notify.outbox.close()
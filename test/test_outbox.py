@@ -0,0 +1,222 @@
+"""
+File: test_outbox.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import telebot
+from code import outbox
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        if self.body is None:
+            raise ValueError("no json")
+        return self.body
+
+
+def flood(seconds):
+    return FakeResponse(429, {"ok": False, "error_code": 429, "parameters": {"retry_after": seconds}})
+
+
+def test_token_bucket():
+    bucket = outbox.TokenBucket(2, 3, now=0)
+    for _ in range(3):
+        assert bucket.delay(0) == 0
+        bucket.take(0)
+    assert bucket.delay(0) == 0.5
+    assert bucket.delay(0.5) == 0
+    assert not bucket.idle(0.5)
+    assert bucket.idle(10)
+    assert outbox.TokenBucket(0, 1, now=0).delay(0) == 0
+
+
+def test_retry_after():
+    assert outbox.retry_after(FakeResponse(200, {"ok": True})) is None
+    assert outbox.retry_after(flood(7)) == 7
+    assert outbox.retry_after(FakeResponse(429, headers={"Retry-After": "3"})) == 3
+    assert outbox.retry_after(FakeResponse(429)) == 1
+
+
+def test_interactive_lane_goes_first():
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=1)
+    release = threading.Event()
+    sent = []
+    try:
+        first = queue.submit(1, lambda: release.wait(5) and sent.append("first"))
+        time.sleep(0.05)
+        bulk = queue.submit(2, lambda: sent.append("bulk"), outbox.BULK)
+        reply = queue.submit(3, lambda: sent.append("reply"))
+        assert queue.stats()[outbox.BULK]["queued"] == 1
+        release.set()
+        for future in (first, bulk, reply):
+            future.result(5)
+        assert sent == ["first", "reply", "bulk"]
+    finally:
+        queue.close()
+
+
+def test_chat_limit_keeps_order():
+    queue = outbox.Outbox(rate=0, chat_rate=20, chat_burst=1, workers=4)
+    sent = []
+    try:
+        start = time.monotonic()
+        futures = [queue.submit(1, lambda i=i: sent.append(i)) for i in range(4)]
+        other = queue.submit(2, lambda: time.monotonic())
+        assert other.result(5) - start < 0.1
+        for future in futures:
+            future.result(5)
+        assert time.monotonic() - start >= 0.14
+        assert sent == [0, 1, 2, 3]
+    finally:
+        queue.close()
+
+
+def test_global_limit():
+    queue = outbox.Outbox(rate=20, burst=1, chat_rate=0, workers=4)
+    try:
+        start = time.monotonic()
+        for future in [queue.submit(chat_id, lambda: None, outbox.BULK) for chat_id in range(4)]:
+            future.result(5)
+        assert time.monotonic() - start >= 0.14
+    finally:
+        queue.close()
+
+
+def test_flood_wait_is_retried():
+    answers = [FakeResponse(200, {"ok": True}), flood(0.1)]
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=2)
+    try:
+        start = time.monotonic()
+        assert queue.send(5, answers.pop).status_code == 200
+        assert time.monotonic() - start >= 0.1
+        stats = queue.stats()[outbox.INTERACTIVE]
+        assert (stats["sent"], stats["retried"], stats["failed"], stats["queued"]) == (1, 1, 0, 0)
+        assert stats["latency"]["max"] >= 0.1
+    finally:
+        queue.close()
+
+
+def test_retries_give_up():
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=1, max_retries=2)
+    calls = []
+    try:
+        response = queue.send(5, lambda: calls.append(1) or flood(0.01))
+        assert response.status_code == 429
+        assert len(calls) == 3
+        assert queue.stats()[outbox.INTERACTIVE]["failed"] == 1
+    finally:
+        queue.close()
+
+
+def test_errors_reach_the_caller():
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=1)
+    try:
+        future = queue.submit(5, lambda: 1 / 0)
+        try:
+            future.result(5)
+            assert False
+        except ZeroDivisionError:
+            pass
+        assert queue.stats()[outbox.INTERACTIVE]["failed"] == 1
+    finally:
+        queue.close()
+
+
+def test_close_without_wait_fails_queued():
+    queue = outbox.Outbox(rate=0, chat_rate=0, workers=1)
+    release = threading.Event()
+    first = queue.submit(1, lambda: release.wait(5))
+    time.sleep(0.05)
+    pending = queue.submit(1, lambda: None)
+    threading.Timer(0.05, release.set).start()
+    queue.close(wait=False)
+    assert first.result(5) is True
+    assert isinstance(pending.exception(5), RuntimeError)
+
+
+class BotApi(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, floods):
+        self.floods = floods
+        self.calls = []
+        super().__init__(("127.0.0.1", 0), BotApiHandler)
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        method = self.path.split("?")[0].rsplit("/", 1)[-1]
+        self.server.calls.append(method)
+        if method == "sendMessage" and self.server.floods:
+            self.server.floods -= 1
+            status, body = 429, {"ok": False, "error_code": 429, "description": "Too Many Requests",
+                                 "parameters": {"retry_after": 0.05}}
+        else:
+            status, body = 200, {"ok": True, "result": {
+                "message_id": len(self.server.calls), "date": 0, "chat": {"id": 11, "type": "private"}, "text": "hi"
+            }}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_bot_sends_go_through_outbox(monkeypatch):
+    api = BotApi(floods=1)
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    monkeypatch.setattr(telebot.apihelper, "API_URL", "http://127.0.0.1:{}/bot{{0}}/{{1}}".format(api.server_address[1]))
+    monkeypatch.setattr(telebot.apihelper, "CUSTOM_REQUEST_SENDER", outbox.request_sender())
+    queue = outbox.configure(rate=0, chat_rate=0, workers=2)
+    try:
+        bot = telebot.TeleBot("123:TEST", threaded=False)
+        with outbox.lane(outbox.BULK):
+            message = bot.send_message(11, "hi")
+        assert message.message_id == 2
+        assert api.calls == ["sendMessage", "sendMessage"]
+        stats = queue.stats()
+        assert stats[outbox.BULK]["retried"] == 1
+        assert stats[outbox.INTERACTIVE]["sent"] == 0
+        bot.answer_callback_query("1")
+        assert queue.stats()[outbox.BULK]["sent"] == 1
+    finally:
+        outbox.close()
+        api.shutdown()
@@ -0,0 +1,57 @@
+"""
+File: test_picker.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from datetime import datetime
+from code import picker, records
+
+
+def make_history(count):
+    return [records.Expense(datetime(2021, 10, 1).toordinal() + day, "Food", 100 * (day + 1), day + 1) for day in range(count)]
+
+
+def test_picker_markup_pages_newest_first():
+    history = make_history(20)
+    markup = picker.picker_markup(history, "edit")
+    assert len(markup.keyboard) == picker.PAGE_SIZE + 1
+    assert markup.keyboard[0][0].callback_data == "edit:pick:" + history[-1].id
+    assert markup.keyboard[0][0].text == "20-Oct-2021  Food  $20.0"
+    assert [button.callback_data for button in markup.keyboard[-1]] == ["edit:page:1"]
+    markup = picker.picker_markup(history, "edit", 2)
+    assert [row[0].callback_data for row in markup.keyboard[:-1]] == ["edit:pick:" + record.id for record in history[3::-1]]
+    assert [button.callback_data for button in markup.keyboard[-1]] == ["edit:page:1"]
+
+
+def test_picker_markup_single_page():
+    markup = picker.picker_markup(make_history(3), "delete", 5)
+    assert len(markup.keyboard) == 3
+
+
+def test_parse_callback():
+    record = make_history(1)[0]
+    assert picker.parse_callback("edit:pick:" + record.id) == ("pick", record.id)
+    assert picker.parse_callback("delete:page:3") == ("page", 3)
+    assert len("delete:pick:" + record._replace(category="A very long category name " * 4).id) <= 64
@@ -0,0 +1,83 @@
+"""
+File: test_records.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+from datetime import date
+from code import records
+
+
+def test_parse_legacy_string():
+    record = records.parse("28-Oct-2021 15:27,Food,2.3")
+    assert record[:3] == (date(2021, 10, 28).toordinal(), "Food", 230)
+    assert record.uid is None
+    assert record.date_str == "28-Oct-2021"
+    assert record.amount == 2.3
+
+
+def test_parse_stored_list():
+    record = records.Expense.create(date(2021, 10, 28), "Food", "2.30")
+    assert records.parse(list(record)) == record
+
+
+def test_uid_is_kept_but_not_compared():
+    record = records.Expense.create(date(2021, 10, 28), "Food", "2.30")
+    assert record.id is None
+    stored = records.parse(list(record._replace(uid=30)))
+    assert stored.uid == 30
+    assert stored.id == "1e"
+    assert records.parse_id(stored.id) == 30
+    assert stored == record and hash(stored) == hash(record)
+    assert stored != record._replace(cents=1)
+
+
+def test_parse_id_rejects_malformed_ids():
+    for expense_id in ["b432b.7d0.740a86c9", "-1", ""]:
+        with pytest.raises(ValueError):
+            records.parse_id(expense_id)
+
+
+def test_number():
+    history = records.parse_all([[738091, "Food", 230, 4], [738091, "Food", 230], "28-Oct-2021,Food,2.3"])
+    assert records.number(history)
+    assert [record.uid for record in history] == [4, 5, 6]
+    assert not records.number(history)
+
+
+def test_str_keeps_legacy_format():
+    record = records.Expense.create(date(2021, 10, 28), "Food", 2.3)
+    assert str(record) == "28-Oct-2021,Food,2.3"
+    assert record.month == (2021, 10)
+
+
+def test_to_cents_rounds():
+    assert records.to_cents("0.1") + records.to_cents("0.2") == 30
+    assert records.to_cents(19.999) == 2000
+
+
+def test_is_legacy():
+    assert records.is_legacy(["28-Oct-2021,Food,2.3"])
+    assert not records.is_legacy([[738091, "Food", 230]])
@@ -0,0 +1,135 @@
+"""
+File: test_render.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import threading
+import time
+import pytest
+from code import graphing, render
+
+MOCK_SPENDING = {"28-Oct-2021": 2.3, "29-Oct-2021": 20.0}
+
+
+def test_render_inline():
+    renderer = render.ChartRenderer(workers=0)
+    chart = renderer.render(graphing.time_series, MOCK_SPENDING)
+    assert chart.getvalue().startswith(b"\x89PNG")
+    assert [buffer.getvalue() for buffer in renderer.render(list, [b"a", b"b"])] == [b"a", b"b"]
+    assert renderer.render(bytes, 2).getvalue() == b"\x00\x00"
+
+
+def test_render_in_worker_process():
+    renderer = render.ChartRenderer(workers=1, timeout=60)
+    try:
+        chart = renderer.render(graphing.time_series, MOCK_SPENDING)
+        charts = renderer.render(render._to_buffers, [b"a", b"b"])
+    finally:
+        renderer.close()
+    assert chart.getvalue().startswith(b"\x89PNG")
+    assert [buffer.getvalue() for buffer in charts] == [b"a", b"b"]
+
+
+def test_render_queue_is_bounded():
+    renderer = render.ChartRenderer(workers=1, max_pending=1, timeout=0.1)
+    try:
+        with pytest.raises(render.TimeoutError):
+            renderer.render(time.sleep, 1)
+        with pytest.raises(render.RenderBusy):
+            renderer.render(time.sleep, 0)
+    finally:
+        renderer.close()
+
+
+def exit_later(delay):
+    # the worker dies only once every thread has submitted, none of them can run this inline
+    time.sleep(delay)
+    os._exit(1)
+
+
+def test_broken_pool_falls_back_to_inline(mocker):
+    renderer = render.ChartRenderer(workers=1, timeout=60)
+    try:
+        broken = renderer._executor
+        shutdown = mocker.spy(broken, "shutdown")
+        errors = []
+        submitting = threading.Barrier(3)
+
+        def crash():
+            submitting.wait()
+            try:
+                renderer.render(exit_later, 1)
+            except render.BrokenProcessPool as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=crash) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 3
+        assert renderer._executor is None
+        assert shutdown.call_count == 1
+        assert [buffer.getvalue() for buffer in renderer.render(render._to_buffers, [b"a"])] == [b"a"]
+    finally:
+        renderer.close()
+
+
+def test_chart_defaults_to_inline():
+    render.close()
+    assert render.chart(graphing.viewBudget, {"Food": "0"}) is None
+    assert render._renderer.workers == 0
+
+
+def test_chart_cache_hits_until_data_changes(mocker):
+    render.close()
+    mocker.patch.object(render, "_cache", render.ChartCache())
+    draw = mocker.spy(graphing, "time_series")
+    first = render.chart(graphing.time_series, MOCK_SPENDING, chat_id=11)
+    second = render.chart(graphing.time_series, MOCK_SPENDING, chat_id=11)
+    assert first.getvalue() == second.getvalue()
+    assert draw.call_count == 1
+    render.chart(graphing.time_series, dict(MOCK_SPENDING, **{"30-Oct-2021": 1.0}), chat_id=11)
+    assert draw.call_count == 2
+    render.invalidate(11)
+    render.chart(graphing.time_series, MOCK_SPENDING, chat_id=11)
+    assert draw.call_count == 3
+
+
+def test_chart_cache_evicts_least_recently_used():
+    cache = render.ChartCache(max_entries=2, max_bytes=10)
+    cache.put(("1", "a", "x"), b"1234")
+    cache.put(("1", "b", "x"), b"1234")
+    assert cache.get(("1", "a", "x")) == b"1234"
+    cache.put(("2", "c", "x"), [b"12", b"34"])
+    assert cache.get(("1", "b", "x")) is None
+    assert len(cache) == 2
+    cache.put(("2", "d", "x"), b"12345678")
+    assert cache.get(("1", "a", "x")) is None
+    cache.put(("2", "e", "x"), b"12345678901")
+    assert cache.get(("2", "e", "x")) is None
+    cache.invalidate(2)
+    assert len(cache) == 0
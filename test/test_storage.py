@@ -0,0 +1,451 @@
+"""
+File: test_storage.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import pytest
+from datetime import date
+from mock import MagicMock
+from code import records, storage
+
+MOCK_CHAT_ID = 894127939
+MOCK_RECORD = records.parse("28-Oct-2021,Food,2.3")
+
+
+def create_backends(tmp_path):
+    return [
+        storage.JsonStorage(str(tmp_path / "expense_record.json")),
+        storage.SqliteStorage(str(tmp_path / "expense_record.db")),
+    ]
+
+
+def test_get_user_unknown(tmp_path):
+    for backend in create_backends(tmp_path):
+        assert backend.get_user(MOCK_CHAT_ID) is None
+        backend.close()
+
+
+def test_append_record_creates_user(tmp_path):
+    for backend in create_backends(tmp_path):
+        user = backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        assert user["data"] == [MOCK_RECORD]
+        assert backend.get_user(MOCK_CHAT_ID) == user
+        backend.close()
+
+
+def test_append_record_keeps_other_users(tmp_path):
+    for backend in create_backends(tmp_path):
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        backend.append_record(101, "29-Oct-2021,Groceries,20.0")
+        backend.append_record(MOCK_CHAT_ID, "30-Oct-2021,Transport,7.28")
+        assert backend.get_user(MOCK_CHAT_ID)["data"] == [
+            MOCK_RECORD, records.parse("30-Oct-2021,Transport,7.28")
+        ]
+        assert backend.get_user(101)["data"] == [records.parse("29-Oct-2021,Groceries,20.0")]
+        backend.close()
+
+
+def test_update_budget(tmp_path):
+    for backend in create_backends(tmp_path):
+        budget = {"overall": "100", "category": {"Food": "50"}}
+        backend.update_budget(MOCK_CHAT_ID, budget)
+        assert backend.get_user(MOCK_CHAT_ID) == {"data": [], "budget": budget}
+        backend.close()
+
+
+def test_replace_record(tmp_path):
+    for backend in create_backends(tmp_path):
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        edited = MOCK_RECORD._replace(cents=500)
+        assert backend.replace_record(MOCK_CHAT_ID, MOCK_RECORD, edited)
+        assert backend.get_user(MOCK_CHAT_ID)["data"] == [edited]
+        assert not backend.replace_record(MOCK_CHAT_ID, MOCK_RECORD, edited)
+        backend.close()
+
+
+def test_remove_records(tmp_path):
+    other = records.parse("29-Oct-2021,Groceries,20.0")
+    for backend in create_backends(tmp_path):
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        backend.append_record(MOCK_CHAT_ID, other)
+        assert backend.remove_records(MOCK_CHAT_ID, [MOCK_RECORD]) == [MOCK_RECORD]
+        assert backend.get_user(MOCK_CHAT_ID)["data"] == [other]
+        assert backend.remove_records(101, [MOCK_RECORD]) == []
+        backend.close()
+
+
+def test_remove_record_keeps_duplicates(tmp_path):
+    backends = create_backends(tmp_path)
+    backends.append(storage.CachedStorage(storage.JsonStorage(str(tmp_path / "cached.json"))))
+    for backend in backends:
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        assert backend.remove_record(MOCK_CHAT_ID, MOCK_RECORD)
+        assert backend.get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+        assert backend.get_totals(MOCK_CHAT_ID).category_total(2021, 10, "Food") == 230
+        assert backend.remove_record(MOCK_CHAT_ID, MOCK_RECORD)
+        assert not backend.remove_record(MOCK_CHAT_ID, MOCK_RECORD)
+        assert not backend.remove_record(101, MOCK_RECORD)
+        backend.close()
+
+
+def test_expenses_get_stored_ids(tmp_path):
+    backends = create_backends(tmp_path)
+    backends.append(storage.CachedStorage(storage.JsonStorage(str(tmp_path / "cached.json"))))
+    backends.append(storage.CachedStorage(storage.SqliteStorage(str(tmp_path / "cached.db"))))
+    for backend in backends:
+        backend.append_record(101, "29-Oct-2021,Groceries,20.0")
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        first, second = backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)["data"]
+        assert first.uid is not None and first.uid != second.uid
+        assert backend.get_expense(MOCK_CHAT_ID, second.uid) == second
+        assert backend.get_expense(MOCK_CHAT_ID, second.uid).uid == second.uid
+        assert backend.get_expense(101, second.uid) is None
+        assert backend.replace_record(MOCK_CHAT_ID, second, second._replace(cents=500))
+        assert backend.get_expense(MOCK_CHAT_ID, second.uid) == second._replace(cents=500)
+        assert backend.get_expense(MOCK_CHAT_ID, first.uid) == MOCK_RECORD
+        assert backend.remove_record(MOCK_CHAT_ID, first)
+        assert backend.get_expense(MOCK_CHAT_ID, first.uid) is None
+        assert backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)["data"][-1].uid not in (first.uid, second.uid)
+        backend.close()
+
+
+def test_get_totals(tmp_path):
+    for backend in create_backends(tmp_path):
+        backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+        backend.append_record(MOCK_CHAT_ID, "29-Oct-2021,Food,1.7")
+        assert backend.get_totals(MOCK_CHAT_ID).category_total(2021, 10, "Food") == 400
+        assert backend.get_totals(101).month_total(2021, 10) == 0
+        backend.close()
+
+
+def test_query(tmp_path):
+    backends = create_backends(tmp_path)
+    backends.append(storage.CachedStorage(storage.JsonStorage(str(tmp_path / "cached.json"))))
+    for backend in backends:
+        for record in ["30-Oct-2021,Food,12.5", MOCK_RECORD, "01-Nov-2021,Fast Food,4.0", "29-Oct-2021,Groceries,20.0"]:
+            backend.append_record(MOCK_CHAT_ID, record)
+        in_october = backend.query(MOCK_CHAT_ID, start=date(2021, 10, 1), end=date(2021, 10, 31))
+        assert [str(record) for record in in_october] == [
+            "28-Oct-2021,Food,2.3", "29-Oct-2021,Groceries,20.0", "30-Oct-2021,Food,12.5"
+        ]
+        assert [record.cents for record in backend.query(MOCK_CHAT_ID, categories=["Food"])] == [230, 1250]
+        assert [record.category for record in backend.query(MOCK_CHAT_ID, categories="Fast Food")] == ["Fast Food"]
+        assert [record.cents for record in backend.query(MOCK_CHAT_ID, min_amount=4, max_amount="12.5")] == [1250, 400]
+        assert list(backend.query(MOCK_CHAT_ID, start=date(2021, 11, 2))) == []
+        assert list(backend.query(101)) == []
+        backend.close()
+
+
+def test_save_all_and_load_all(tmp_path):
+    user_list = {
+        str(MOCK_CHAT_ID): {"data": [MOCK_RECORD], "budget": {"overall": "0", "category": None}},
+        "101": {"data": [], "budget": {"overall": "10", "category": {}}},
+    }
+    for backend in create_backends(tmp_path):
+        backend.save_all(user_list)
+        assert backend.load_all() == user_list
+        backend.close()
+
+
+def test_sqlite_persists_between_connections(tmp_path):
+    path = str(tmp_path / "expense_record.db")
+    backend = storage.SqliteStorage(path)
+    backend.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    backend.close()
+    assert storage.SqliteStorage(path).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    path = str(tmp_path / "expense_record.json")
+    storage.write_json_atomic(path, {"a": 1})
+    storage.write_json_atomic(path, {"b": 2}, fsync=True)
+    with open(path) as json_file:
+        assert json.load(json_file) == {"b": 2}
+    assert os.listdir(str(tmp_path)) == ["expense_record.json"]
+
+
+def test_write_json_atomic_keeps_old_file_on_failure(tmp_path):
+    path = str(tmp_path / "expense_record.json")
+    storage.write_json_atomic(path, {"a": 1})
+    with pytest.raises(TypeError):
+        storage.write_json_atomic(path, {"b": object()})
+    with open(path) as json_file:
+        assert json.load(json_file) == {"a": 1}
+    assert os.listdir(str(tmp_path)) == ["expense_record.json"]
+
+
+def test_json_concurrent_appends_are_not_lost(tmp_path):
+    backend = storage.JsonStorage(str(tmp_path / "expense_record.json"))
+
+    def add_expenses(chat_id):
+        for _ in range(10):
+            backend.append_record(chat_id, MOCK_RECORD)
+
+    threads = [threading.Thread(target=add_expenses, args=(chat_id,)) for chat_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [len(backend.get_user(chat_id)["data"]) for chat_id in range(4)] == [10, 10, 10, 10]
+
+
+def test_json_migrates_legacy_records(tmp_path):
+    path = tmp_path / "expense_record.json"
+    user = {"data": ["28-Oct-2021 15:27,Food,2.3"], "budget": {"overall": "0", "category": None}}
+    path.write_text(json.dumps({str(MOCK_CHAT_ID): user}))
+    assert storage.JsonStorage(str(path)).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+    assert json.loads(path.read_text())[str(MOCK_CHAT_ID)]["data"] == [list(MOCK_RECORD._replace(uid=1))]
+
+
+def test_sqlite_migrates_version_1(tmp_path):
+    path = str(tmp_path / "expense_record.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (chat_id TEXT PRIMARY KEY, budget TEXT NOT NULL)")
+    conn.execute("CREATE TABLE expenses (id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT, record TEXT)")
+    conn.execute("INSERT INTO users VALUES (?, ?)", (str(MOCK_CHAT_ID), json.dumps({"overall": "0"})))
+    conn.execute("INSERT INTO expenses (chat_id, record) VALUES (?, ?)", (str(MOCK_CHAT_ID), "28-Oct-2021,Food,2.3"))
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    assert storage.SqliteStorage(path).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+
+
+def test_cached_storage_reads_from_memory():
+    backend = MagicMock()
+    backend.next_uid.return_value = 1
+    backend.load_all.return_value = {str(MOCK_CHAT_ID): {"data": [MOCK_RECORD], "budget": {}}}
+    cache = storage.CachedStorage(backend)
+    for _ in range(3):
+        assert cache.get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+    assert backend.load_all.call_count == 1
+    cache.close()
+
+
+def test_cached_storage_write_through(tmp_path):
+    path = str(tmp_path / "expense_record.json")
+    cache = storage.CachedStorage(storage.JsonStorage(path))
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    assert storage.JsonStorage(path).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+    cache.close()
+
+
+def test_cached_storage_write_behind(tmp_path):
+    path = str(tmp_path / "expense_record.json")
+    cache = storage.CachedStorage(storage.JsonStorage(path), flush_interval=3600)
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    assert cache.get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+    assert storage.JsonStorage(path).get_user(MOCK_CHAT_ID) is None
+    cache.close()
+    assert storage.JsonStorage(path).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+
+
+def test_cached_storage_flushes_only_dirty_users():
+    backend = MagicMock()
+    backend.next_uid.return_value = 1
+    backend.load_all.return_value = {
+        str(MOCK_CHAT_ID): {"data": [], "budget": {}},
+        "101": {"data": [], "budget": {}},
+    }
+    cache = storage.CachedStorage(backend, flush_interval=3600)
+    cache.update_budget(101, {"overall": "10", "category": {}})
+    cache.flush()
+    backend.apply_changes.assert_called_once_with({}, {"101": [("budget", {"overall": "10", "category": {}})]})
+    cache.flush()
+    assert backend.apply_changes.call_count == 1
+    cache.save_user(101, {"data": [], "budget": {}})
+    cache.append_record(101, MOCK_RECORD)
+    cache.flush()
+    assert backend.apply_changes.call_args[0][1] == {"101": None}
+    cache.close()
+
+
+def test_cached_storage_keeps_operations_of_failed_flush():
+    backend = MagicMock()
+    backend.next_uid.return_value = 1
+    backend.load_all.return_value = {"101": {"data": [], "budget": {}}}
+    backend.apply_changes.side_effect = [OSError("disk full"), None]
+    cache = storage.CachedStorage(backend, flush_interval=3600)
+    cache.update_budget(101, {"overall": "10"})
+    with pytest.raises(OSError):
+        cache.flush()
+    cache.update_budget(101, {"overall": "20"})
+    cache.save_user(102, {"data": [MOCK_RECORD], "budget": {}})
+    cache.flush()
+    user_list, changes = backend.apply_changes.call_args[0]
+    assert changes == {"101": [("budget", {"overall": "10"}), ("budget", {"overall": "20"})], "102": None}
+    assert user_list == {"102": {"data": [MOCK_RECORD], "budget": {}}}
+    assert user_list["102"] is not cache.get_user(102)
+    cache.close()
+
+
+def test_cached_storage_serves_reads_during_flush():
+    backend = MagicMock()
+    backend.next_uid.return_value = 1
+    backend.load_all.return_value = {}
+    cache = storage.CachedStorage(backend, flush_interval=3600)
+    reads = []
+
+    def read_from_other_thread(user_list, changes):
+        reader = threading.Thread(target=lambda: reads.append(cache.get_user(MOCK_CHAT_ID)))
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+
+    backend.apply_changes.side_effect = read_from_other_thread
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    cache.flush()
+    assert reads[0]["data"] == [MOCK_RECORD]
+    cache.close()
+
+
+def test_cached_sqlite_flush_replays_operations(tmp_path):
+    path = str(tmp_path / "expense_record.db")
+    cache = storage.CachedStorage(storage.SqliteStorage(path), flush_interval=3600)
+    other = records.parse("29-Oct-2021,Groceries,20.0")
+    for record in [MOCK_RECORD, MOCK_RECORD, other]:
+        cache.append_record(MOCK_CHAT_ID, record)
+    cache.append_record(101, other)
+    cache.flush()
+    conn = sqlite3.connect(path)
+    ids = conn.execute("SELECT id FROM expenses ORDER BY id").fetchall()
+    cache.append_record(MOCK_CHAT_ID, "30-Oct-2021,Food,1.0")
+    cache.remove_record(MOCK_CHAT_ID, MOCK_RECORD)
+    cache.replace_record(MOCK_CHAT_ID, other, other._replace(cents=100))
+    cache.remove_records(MOCK_CHAT_ID, ["30-Oct-2021,Food,1.0"])
+    cache.update_budget(MOCK_CHAT_ID, {"overall": "5", "category": {}})
+    cache.flush()
+    # rows of unchanged expenses and of other users are not rewritten
+    assert conn.execute("SELECT id FROM expenses WHERE chat_id = '101'").fetchall() == [ids[3]]
+    assert ids[1] in conn.execute("SELECT id FROM expenses").fetchall()
+    conn.close()
+    assert storage.SqliteStorage(path).get_user(MOCK_CHAT_ID) == cache.get_user(MOCK_CHAT_ID)
+    cache.close()
+
+
+def test_cached_storage_updates_totals_incrementally(tmp_path):
+    cache = storage.CachedStorage(storage.JsonStorage(str(tmp_path / "expense_record.json")))
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    spending = cache.get_totals(MOCK_CHAT_ID)
+    assert spending.month_total(2021, 10) == 230
+    cache.append_record(MOCK_CHAT_ID, "29-Oct-2021,Food,1.7")
+    cache.replace_record(MOCK_CHAT_ID, MOCK_RECORD, MOCK_RECORD._replace(category="Groceries"))
+    assert cache.get_totals(MOCK_CHAT_ID) is spending
+    assert spending.category_total(2021, 10, "Food") == 170
+    assert spending.category_total(2021, 10, "Groceries") == 230
+    cache.remove_records(MOCK_CHAT_ID, ["29-Oct-2021,Food,1.7"])
+    assert spending.month_total(2021, 10) == 230
+    cache.save_user(MOCK_CHAT_ID, {"data": [], "budget": {}})
+    assert cache.get_totals(MOCK_CHAT_ID).month_total(2021, 10) == 0
+    cache.close()
+
+
+def test_cached_storage_keeps_history_ordered(tmp_path):
+    cache = storage.CachedStorage(storage.JsonStorage(str(tmp_path / "expense_record.json")))
+    cache.append_record(MOCK_CHAT_ID, "30-Oct-2021,Food,1.7")
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    events = cache.get_timeline(MOCK_CHAT_ID)
+    assert [str(record) for record in events] == ["28-Oct-2021,Food,2.3", "30-Oct-2021,Food,1.7"]
+    cache.replace_record(MOCK_CHAT_ID, MOCK_RECORD, MOCK_RECORD._replace(day=MOCK_RECORD.day + 5))
+    assert events.records is cache.get_user(MOCK_CHAT_ID)["data"]
+    assert [str(record) for record in events] == ["30-Oct-2021,Food,1.7", "02-Nov-2021,Food,2.3"]
+    cache.remove_records(MOCK_CHAT_ID, ["30-Oct-2021,Food,1.7"])
+    assert len(cache.get_timeline(MOCK_CHAT_ID)) == 1
+    cache.save_user(MOCK_CHAT_ID, {"data": ["01-Nov-2021,Food,1.0", "28-Oct-2021,Food,2.0"], "budget": {}})
+    assert [record.cents for record in cache.get_timeline(MOCK_CHAT_ID)] == [200, 100]
+    cache.close()
+
+
+def test_backends_return_history_ordered_by_date(tmp_path):
+    for backend in create_backends(tmp_path):
+        for record in ["30-Oct-2021,Food,12.5", MOCK_RECORD, "29-Oct-2021,Groceries,20.0"]:
+            backend.append_record(MOCK_CHAT_ID, record)
+        backend.replace_record(MOCK_CHAT_ID, MOCK_RECORD, "31-Oct-2021,Food,2.3")
+        assert [str(record) for record in backend.get_user(MOCK_CHAT_ID)["data"]] == [
+            "29-Oct-2021,Groceries,20.0", "30-Oct-2021,Food,12.5", "31-Oct-2021,Food,2.3"
+        ]
+        backend.close()
+
+
+def test_cached_storage_verify_totals(tmp_path):
+    cache = storage.CachedStorage(storage.JsonStorage(str(tmp_path / "expense_record.json")))
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    assert cache.verify_totals(MOCK_CHAT_ID) == []
+    cache.get_totals(MOCK_CHAT_ID).add("29-Oct-2021,Food,1.7")
+    assert len(cache.verify_totals(MOCK_CHAT_ID, rebuild=True)) == 3
+    assert cache.verify_totals(MOCK_CHAT_ID) == []
+    assert cache.get_totals(MOCK_CHAT_ID).month_total(2021, 10) == 230
+    cache.close()
+
+
+def test_create_storage_cached_sqlite(tmp_path):
+    path = str(tmp_path / "expense_record.db")
+    cache = storage.create_storage("sqlite", path, cached=True, fsync=True)
+    cache.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    cache.close()
+    assert storage.SqliteStorage(path).get_user(MOCK_CHAT_ID)["data"] == [MOCK_RECORD]
+
+
+def test_create_storage_sqlite_imports_json_once(tmp_path):
+    users = {
+        str(MOCK_CHAT_ID): {"data": [list(MOCK_RECORD._replace(uid=1))], "budget": {"overall": "100", "category": {}}},
+        "101": {"data": ["29-Oct-2021,Groceries,20.0"], "budget": {"overall": "0", "category": None}},
+    }
+    (tmp_path / "expense_record.json").write_text(json.dumps(users))
+    path = str(tmp_path / "expense_record.db")
+    backend = storage.create_storage("sqlite", path)
+    assert backend.get_user(MOCK_CHAT_ID) == {"data": [MOCK_RECORD], "budget": {"overall": "100", "category": {}}}
+    assert backend.get_user(101)["data"] == [records.parse("29-Oct-2021,Groceries,20.0")]
+    uids = [record.uid for chat_id in users for record in backend.get_user(chat_id)["data"]]
+    assert len(set(uids)) == 2
+    backend.remove_records(MOCK_CHAT_ID, [MOCK_RECORD])
+    backend.close()
+    assert storage.create_storage("sqlite", path).get_user(MOCK_CHAT_ID)["data"] == []
+
+
+def test_create_storage_unknown_backend():
+    with pytest.raises(ValueError):
+        storage.create_storage("csv")
+
+
+def test_cached_json_flush_keeps_changes_of_other_processes(tmp_path):
+    path = str(tmp_path / "expense_record.json")
+    first = storage.CachedStorage(storage.JsonStorage(path), flush_interval=3600)
+    second = storage.CachedStorage(storage.JsonStorage(path), flush_interval=3600)
+    first.append_record(MOCK_CHAT_ID, MOCK_RECORD)
+    second.load_all()
+    first.flush()
+    second.append_record(MOCK_CHAT_ID, "30-Oct-2021,Food,1.0")
+    second.update_budget(101, {"overall": "10", "category": {}})
+    second.flush()
+    stored = storage.JsonStorage(path).load_all()
+    assert [str(record) for record in stored[str(MOCK_CHAT_ID)]["data"]] == ["28-Oct-2021,Food,2.3", "30-Oct-2021,Food,1.0"]
+    assert stored["101"]["budget"]["overall"] == "10"
+    first.close()
+    second.close()
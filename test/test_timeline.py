@@ -0,0 +1,127 @@
+"""
+File: test_timeline.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from datetime import date, datetime
+from code import records, timeline
+
+MOCK_HISTORY = [
+    "30-Oct-2021,Food,12.5",
+    "28-Oct-2021,Food,2.3",
+    "01-Nov-2021,Fast Food,4.0",
+    "28-Oct-2021,Groceries,20.0",
+]
+
+
+def test_timeline_orders_by_date_then_insertion():
+    events = timeline.Timeline(MOCK_HISTORY)
+    assert [str(record) for record in events] == [
+        "28-Oct-2021,Food,2.3", "28-Oct-2021,Groceries,20.0", "30-Oct-2021,Food,12.5", "01-Nov-2021,Fast Food,4.0"
+    ]
+    events.add("28-Oct-2021,Transport,1.0")
+    assert str(events.records[2]) == "28-Oct-2021,Transport,1.0"
+    assert events.records == sorted(events.records, key=timeline.DAY)
+
+
+def test_timeline_wraps_ordered_history_without_copy():
+    history = timeline.order_history(MOCK_HISTORY)
+    events = timeline.Timeline(history, ordered=True)
+    events.add("29-Oct-2021,Food,1.0")
+    assert events.records is history
+    assert str(history[2]) == "29-Oct-2021,Food,1.0"
+
+
+def test_timeline_remove():
+    events = timeline.Timeline(MOCK_HISTORY + ["28-Oct-2021,Food,2.3"])
+    assert events.remove("28-Oct-2021,Food,2.3")
+    assert len(events) == 4
+    assert events.remove("28-Oct-2021,Food,2.3")
+    assert not events.remove("28-Oct-2021,Food,2.3")
+    assert len(events) == 3
+
+
+def test_replace_keeps_place_unless_date_changes():
+    history = timeline.order_history(MOCK_HISTORY)
+    assert timeline.replace(history, "28-Oct-2021,Food,2.3", "28-Oct-2021,Food,3.0")
+    assert str(history[0]) == "28-Oct-2021,Food,3.0"
+    assert timeline.replace(history, "28-Oct-2021,Food,3.0", "31-Oct-2021,Food,3.0")
+    assert [str(record) for record in history] == [
+        "28-Oct-2021,Groceries,20.0", "30-Oct-2021,Food,12.5", "31-Oct-2021,Food,3.0", "01-Nov-2021,Fast Food,4.0"
+    ]
+    assert not timeline.replace(history, "28-Oct-2021,Food,3.0", "28-Oct-2021,Food,4.0")
+
+
+def test_timeline_between():
+    events = timeline.Timeline(MOCK_HISTORY)
+    assert len(events.between(date(2021, 10, 28), date(2021, 10, 28))) == 2
+    assert len(events.between(start=datetime(2021, 10, 29, 15, 0))) == 2
+    assert len(events.between(end=date(2021, 10, 30).toordinal())) == 3
+    assert events.between(date(2021, 11, 2)) == []
+
+
+def test_timeline_query():
+    events = timeline.Timeline(MOCK_HISTORY)
+    result = events.query(start=date(2021, 10, 1), end=date(2021, 10, 31), categories=["Food"], min_amount=5)
+    assert not isinstance(result, list)
+    assert [str(record) for record in result] == ["30-Oct-2021,Food,12.5"]
+
+
+def test_month_range():
+    assert timeline.month_range(2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert timeline.month_range(2021, 12) == (date(2021, 12, 1), date(2021, 12, 31))
+
+
+def test_week_range_and_last_days():
+    assert timeline.week_range(date(2021, 10, 28)) == (date(2021, 10, 25), date(2021, 10, 31))
+    assert timeline.week_range(date(2021, 10, 25)) == (date(2021, 10, 25), date(2021, 10, 31))
+    assert timeline.last_days(7, date(2021, 11, 1)) == (date(2021, 10, 26), date(2021, 11, 1))
+    events = timeline.Timeline(MOCK_HISTORY)
+    assert len(events.between(*timeline.last_days(3, date(2021, 11, 1)))) == 2
+
+
+def test_filter_expenses_exact_category():
+    history = records.parse_all(MOCK_HISTORY)
+    assert [record.category for record in timeline.filter_expenses(history, "Food")] == ["Food", "Food"]
+
+
+def test_newest_first():
+    history = timeline.order_history(MOCK_HISTORY)
+    until = date(2021, 10, 30)
+    assert [record.cents for record in timeline.newest_first(history, until)] == [1250, 2000, 230]
+    assert [record.cents for record in timeline.newest_first(history, skip=3)] == [230]
+    assert list(timeline.newest_first(history, date(2021, 10, 1))) == []
+
+
+def test_find_by_uid():
+    history = timeline.order_history(["28-Oct-2021,Food,2.3", "28-Oct-2021,Food,2.3"])
+    records.number(history)
+    assert timeline.find(history, records.parse("28-Oct-2021,Food,2.3")) == 0
+    assert timeline.find(history, history[1]) == 1
+    assert timeline.find(history, history[1]._replace(uid=3)) is None
+    stored = timeline.replace(history, history[1], "30-Oct-2021,Food,5.0")
+    assert stored.uid == 2
+    assert history == records.parse_all(["28-Oct-2021,Food,2.3", "30-Oct-2021,Food,5.0"])
+    assert timeline.replace(history, stored._replace(uid=3), "30-Oct-2021,Food,6.0") is None
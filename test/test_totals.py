@@ -0,0 +1,61 @@
+"""
+File: test_totals.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from code import records, totals
+
+MOCK_DATA = ["28-Oct-2021,Food,2.3", "29-Oct-2021,Groceries,20.0", "01-Nov-2021,Food,7.28"]
+
+
+def test_build_from_history():
+    spending = totals.SpendingTotals(MOCK_DATA)
+    assert spending.month_total(2021, 10) == 2230
+    assert spending.month_total(2021, 11) == 728
+    assert spending.category_total(2021, 10, "Food") == 230
+    assert spending.category_total(2021, 12, "Food") == 0
+    assert spending.day_total(records.parse(MOCK_DATA[1]).date) == 2000
+    assert spending.month_count(2021, 10) == 2
+
+
+def test_add_and_remove():
+    spending = totals.SpendingTotals(MOCK_DATA)
+    spending.add(records.parse("30-Oct-2021,Food,1.7"))
+    assert spending.category_total(2021, 10, "Food") == 400
+    spending.remove(records.parse("28-Oct-2021,Food,2.3"))
+    assert spending.category_total(2021, 10, "Food") == 170
+    assert spending.month_total(2021, 10) == 2170
+
+
+def test_remove_last_expense_drops_key():
+    spending = totals.SpendingTotals(MOCK_DATA[:1])
+    spending.remove(MOCK_DATA[0])
+    assert spending == totals.SpendingTotals()
+
+
+def test_drift():
+    spending = totals.SpendingTotals(MOCK_DATA)
+    spending.months[(2021, 10)][0] += 1
+    assert spending.drift(totals.SpendingTotals(MOCK_DATA)) == [(2021, 10)]
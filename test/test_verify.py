@@ -0,0 +1,67 @@
+"""
+File: test_verify.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from code import verify
+from mock.mock import patch
+from telebot import types
+
+
+def create_message(text):
+    params = {"messagebody": text}
+    chat = types.User("2614394724848", False, "test")
+    return types.Message(1, None, None, chat, "text", params, "")
+
+
+@patch("telebot.telebot")
+def test_run_without_drift(mock_telebot, mocker):
+    mocker.patch.object(verify, "helper")
+    verify.helper.verifyUserTotals.return_value = []
+    MOCK_Message_data = create_message("Hello")
+    mc = mock_telebot.return_value
+    verify.run(MOCK_Message_data, mc)
+    verify.helper.verifyUserTotals.assert_called_with(MOCK_Message_data.chat.id, rebuild=True)
+    mc.send_message.assert_called_with(MOCK_Message_data.chat.id, "Your spending totals match your recorded expenses.")
+
+
+@patch("telebot.telebot")
+def test_run_with_drift(mock_telebot, mocker):
+    mocker.patch.object(verify, "helper")
+    verify.helper.verifyUserTotals.return_value = [(2021, 10), (2021, 10, "Food")]
+    MOCK_Message_data = create_message("Hello")
+    mc = mock_telebot.return_value
+    verify.run(MOCK_Message_data, mc)
+    assert "Found 2 spending totals" in mc.send_message.call_args[0][1]
+
+
+@patch("telebot.telebot")
+def test_run_with_error(mock_telebot, mocker):
+    mocker.patch.object(verify, "helper")
+    verify.helper.verifyUserTotals.side_effect = Exception("storage unavailable")
+    MOCK_Message_data = create_message("Hello")
+    mc = mock_telebot.return_value
+    verify.run(MOCK_Message_data, mc)
+    assert mc.reply_to.called
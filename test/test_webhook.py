@@ -0,0 +1,128 @@
+"""
+File: test_webhook.py
+Author: Vyshnavi Adusumelli, Tejaswini Panati, Harshavardhan Bandaru
+Date: October 01, 2023
+Description: File contains Telegram bot message handlers and their associated functions.
+
+Copyright (c) 2023
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS," WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from code import dispatcher, webhook
+
+SECRET = "s3cret"
+UPDATE = {
+    "update_id": 7,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 11, "type": "private"},
+        "from": {"id": 11, "is_bot": False, "first_name": "test"},
+        "text": "/start",
+        "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+    },
+}
+
+
+class RecordingBot:
+    def __init__(self):
+        self.updates = []
+
+    def process_new_updates(self, updates):
+        self.updates.extend(updates)
+
+
+def post(server, body, secret=SECRET, path="/hook"):
+    request = urllib.request.Request(
+        "http://127.0.0.1:{}{}".format(server.port, path), data=body, method="POST",
+        headers={"Content-Type": "application/json", webhook.SECRET_HEADER: secret},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def start_server(bot):
+    return webhook.WebhookServer(bot, host="127.0.0.1", port=0, path="hook", secret_token=SECRET).start()
+
+
+def test_webhook_accepts_update():
+    bot = RecordingBot()
+    server = start_server(bot)
+    try:
+        assert post(server, json.dumps(UPDATE).encode()) == 200
+        assert [update.update_id for update in bot.updates] == [7]
+        assert bot.updates[0].message.text == "/start"
+    finally:
+        server.shutdown()
+
+
+def test_webhook_rejects_bad_requests():
+    bot = RecordingBot()
+    server = start_server(bot)
+    try:
+        assert post(server, json.dumps(UPDATE).encode(), secret="wrong") == 403
+        assert post(server, b"not json") == 400
+        assert post(server, json.dumps({"message": {}}).encode()) == 400
+        assert post(server, json.dumps(UPDATE).encode(), path="/other") == 404
+        assert bot.updates == []
+    finally:
+        server.shutdown()
+
+
+def test_webhook_rejects_malformed_content_length():
+    bot = RecordingBot()
+    server = start_server(bot)
+    try:
+        for length in ["abc", "-5"]:
+            connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+            connection.putrequest("POST", "/hook")
+            connection.putheader("Content-Length", length)
+            connection.putheader(webhook.SECRET_HEADER, SECRET)
+            connection.endheaders()
+            assert connection.getresponse().status == 400
+            connection.close()
+        assert post(server, json.dumps(UPDATE).encode()) == 200
+    finally:
+        server.shutdown()
+
+
+def test_webhook_hands_updates_to_dispatcher():
+    bot = dispatcher.DispatchingTeleBot("123456:TEST", workers=2)
+    handled = threading.Event()
+    release = threading.Event()
+    bot.register_message_handler(lambda message: (release.wait(5), handled.set()), commands=["start"])
+    server = start_server(bot)
+    try:
+        # acknowledged while the handler is still blocked
+        assert post(server, json.dumps(UPDATE).encode()) == 200
+        assert not handled.is_set()
+        release.set()
+        assert handled.wait(5)
+    finally:
+        server.shutdown()
+        bot.stop_bot()